@@ -7,15 +7,22 @@ Measures end-to-end performance
 import sys
 import os
 import grpc
-import csv
+import itertools
 import json
 import time
 from datetime import datetime
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'generated'))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+# Appended so server modules never shadow the standard library (e.g. statistics)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../server')))
 
 import student_service_pb2
 import student_service_pb2_grpc
+from channel_pool import channel_options
+from services.columnar_dataset import pack_columns, unpack_columns
+from services.csv_loader import cohort_info, iter_batches, iter_proto_batches, load_batch
+from services.student_batch import StudentBatch
 
 
 class MicroservicesClient:
@@ -23,41 +30,90 @@ class MicroservicesClient:
     
     def __init__(self):
         self.mapreduce_address = os.getenv('MAPREDUCE_ADDRESS', 'localhost:50051')
-        self.students = []
+        self.top_k = int(os.getenv('TOP_K', '10'))  # 0 = return the full ranking
+        self.chain_mode = os.getenv('CHAIN_MODE', 'unary')  # unary, stream (ProcessChainStream) or pipeline (ProcessChainPipeline)
+        self.stream_batch = int(os.getenv('CHAIN_STREAM_BATCH', '10000'))  # Students per streamed batch
+        self.wire_format = os.getenv('WIRE_FORMAT', 'students')  # students (repeated Student) or columns (StudentColumns)
+        self.students = []  # Student messages, or a StudentBatch for the columnar wire format
+        self.batches = None  # Batches still to be parsed from the CSV, in the streaming chain modes
         self.metrics = {
             'timestamp': datetime.now().isoformat(),
             'architecture': 'microservices_chained',
+            'wire_format': self.wire_format,
             'workflow': 'Client → MapReduce → MergeSort → Statistics → Client'
         }
     
     def load_students(self, csv_path):
-        """Load student data"""
+        """
+        Load student data
+        
+        In the stream and pipeline chain modes only the first batch is parsed
+        here; the rest is parsed batch by batch while earlier batches are
+        being sent (see chain_batches), so the whole cohort is never held.
+        
+        Returns:
+            Loaded students (the first batch in the streaming modes), [] on error
+        """
         print(f"[Client] Initialized with MapReduce Service URL: {self.mapreduce_address}", flush=True)
         print(f"[Client] Connected to MapReduce Service at {self.mapreduce_address}", flush=True)
         print(f"[Client] Loading students from {csv_path}", flush=True)
         
+        # Row count is filled in once the students are loaded (or streamed)
+        self.metrics['dataset'] = cohort_info(csv_path)
         students = []
         try:
-            with open(csv_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    student = student_service_pb2.Student(
-                        student_id=row['student_id'],
-                        name=row['name'],
-                        faculty=row['faculty'],
-                        cgpa=float(row['cgpa']),
-                        grade=row['grade']
-                    )
-                    students.append(student)
+            if self.chain_mode in ('stream', 'pipeline'):
+                if self.wire_format == 'columns':
+                    batches = iter_batches(csv_path, self.stream_batch)
+                else:
+                    batches = iter_proto_batches(csv_path, student_service_pb2.Student, self.stream_batch)
+                students = next(batches, [])
+                self.students = students
+                self.batches = itertools.chain([students], batches)
+                print(f"[Client] Parsing students in batches of {self.stream_batch} while they are sent", flush=True)
+                print(f"[Client] ✓ Loaded first batch of {len(students)} students\n", flush=True)
+                return students
+            
+            if self.wire_format == 'columns':
+                students = load_batch(csv_path)
+            else:
+                for chunk in iter_proto_batches(csv_path, student_service_pb2.Student):
+                    students.extend(chunk)
             
             self.students = students
+            self.metrics['dataset']['rows'] = len(students)
             print(f"[Client] Loaded {len(students)} students", flush=True)
+            if self.wire_format == 'columns':
+                print(f"[Client] Sending students as packed columns (StudentColumns)", flush=True)
             print(f"[Client] ✓ Loaded {len(students)} students\n", flush=True)
             return students
         except Exception as e:
             print(f"[Client] ✗ Error loading CSV: {e}", flush=True)
             return []
     
+    def chain_request(self, students, **kwargs):
+        """ChainRequest carrying students in the configured wire format"""
+        if isinstance(students, StudentBatch):
+            return student_service_pb2.ChainRequest(
+                columns=pack_columns(students, student_service_pb2.StudentColumns()), **kwargs)
+        return student_service_pb2.ChainRequest(students=students, **kwargs)
+    
+    @staticmethod
+    def top_students(messages, columns, count=10):
+        """First rows of a sorted result (repeated Student or packed columns)"""
+        if columns.cgpa:
+            return list(unpack_columns(columns)[:count])
+        return messages[:count]
+    
+    def chain_batches(self):
+        """Yield ChainRequest batches for the streaming chain RPCs, parsing each as the previous one is sent"""
+        sent = 0
+        for batch in self.batches:
+            sent += len(batch)
+            yield self.chain_request(batch, top_k=self.top_k)
+        self.metrics['dataset']['rows'] = sent
+        print(f"[Client] Streamed {sent} students", flush=True)
+    
     def initiate_workflow(self):
         """Initiate the microservices workflow"""
         print("="*70, flush=True)
@@ -73,18 +129,34 @@ class MicroservicesClient:
         print(f"[Client] Calling MapReduce Service...", flush=True)
         
         try:
-            # Connect to MapReduce Service (entry point)
-            channel = grpc.insecure_channel(self.mapreduce_address)
+            # Connect to MapReduce Service (entry point); same message limits as the chain
+            channel = grpc.insecure_channel(self.mapreduce_address, options=channel_options())
             stub = student_service_pb2_grpc.StudentAnalysisServiceStub(channel)
             
-            # Send chain request to MapReduce Service
-            request = student_service_pb2.ChainRequest(
-                students=self.students,
-                partial_results=student_service_pb2.CombinedResponse()  # Empty initial results
-            )
-            
             workflow_start = time.time()
-            combined_response = stub.ProcessChain(request, timeout=120)
+            if self.chain_mode == 'pipeline':
+                # Stages stream batches to each other; each returns its own result fragment
+                print(f"[Client] Pipelining students in batches of {self.stream_batch}", flush=True)
+                combined_response = student_service_pb2.CombinedResponse()
+                for fragment in stub.ProcessChainPipeline(self.chain_batches(), timeout=120):
+                    combined_response.MergeFrom(fragment)
+                combined_response.total_workflow_time = (
+                    combined_response.mapreduce_time +
+                    combined_response.mergesort_time +
+                    combined_response.statistics_time
+                )
+            elif self.chain_mode == 'stream':
+                # Stream the cohort in batches; MapReduce maps each batch as it arrives
+                print(f"[Client] Streaming students in batches of {self.stream_batch}", flush=True)
+                combined_response = stub.ProcessChainStream(self.chain_batches(), timeout=120)
+            else:
+                # Send chain request to MapReduce Service
+                request = self.chain_request(
+                    self.students,
+                    partial_results=student_service_pb2.CombinedResponse(),  # Empty initial results
+                    top_k=self.top_k
+                )
+                combined_response = stub.ProcessChain(request, timeout=120)
             workflow_end = time.time()
             
             total_workflow_time = workflow_end - workflow_start
@@ -95,6 +167,9 @@ class MicroservicesClient:
             print(f"[Client] Workflow completed in {total_workflow_time:.4f}s", flush=True)
             print(flush=True)
             
+            top_by_cgpa = self.top_students(combined_response.sorted_by_cgpa, combined_response.sorted_by_cgpa_columns)
+            top_by_grade = self.top_students(combined_response.sorted_by_grade, combined_response.sorted_by_grade_columns)
+            
             # Display ALL results from ALL services
             print("="*70, flush=True)
             print("WORKFLOW COMPLETED - ALL RESULTS", flush=True)
@@ -107,14 +182,23 @@ class MicroservicesClient:
             print(f"  CGPA Classification:", flush=True)
             for cgpa_range in combined_response.cgpa_ranges:
                 print(f"    {cgpa_range.range}: {cgpa_range.count} students", flush=True)
+            print(f"  Grade Counts:", flush=True)
+            for grade_count in combined_response.grade_counts:
+                print(f"    {grade_count.grade}: {grade_count.count} students", flush=True)
+            print(f"  Faculty Counts:", flush=True)
+            for faculty_count in combined_response.faculty_counts:
+                print(f"    {faculty_count.faculty}: {faculty_count.count} students", flush=True)
             print(flush=True)
             
             # MergeSort Service Results
             print(f"[MergeSort Service] Sort by CGPA (Time: {combined_response.mergesort_time:.4f}s)", flush=True)
             print("-" * 70, flush=True)
             print(f"  Top 10 students by CGPA:", flush=True)
-            for i, student in enumerate(combined_response.sorted_by_cgpa[:10], 1):
+            for i, student in enumerate(top_by_cgpa, 1):
                 print(f"    {i}. {student.name} - CGPA: {student.cgpa:.2f} ({student.grade})", flush=True)
+            print(f"  Top 10 students by Grade:", flush=True)
+            for i, student in enumerate(top_by_grade, 1):
+                print(f"    {i}. {student.name} - Grade: {student.grade} (CGPA: {student.cgpa:.2f})", flush=True)
             print(flush=True)
             
             # Statistics Service Results
@@ -130,6 +214,14 @@ class MicroservicesClient:
             print(f"  Grade Distribution:", flush=True)
             for grade_dist in combined_response.grade_distribution:
                 print(f"    Grade {grade_dist.grade}: {grade_dist.count} students ({grade_dist.percentage:.1f}%)", flush=True)
+            print(flush=True)
+            mode = "exact" if combined_response.percentiles_exact else "sketch"
+            print(f"  CGPA Percentiles ({mode}):", flush=True)
+            rows = [('All students', combined_response.overall_percentiles)]
+            rows += sorted((p.faculty, p) for p in combined_response.faculty_percentiles)
+            for name, p in rows:
+                print(f"    {name}: p10 {p.p10:.2f}  p25 {p.p25:.2f}  p50 {p.p50:.2f}  "
+                      f"p75 {p.p75:.2f}  p90 {p.p90:.2f}  p99 {p.p99:.2f}", flush=True)
             
             # Performance Summary
             print(f"\n{'='*70}", flush=True)
@@ -168,14 +260,21 @@ class MicroservicesClient:
             for cgpa_range in combined_response.cgpa_ranges:
                 cgpa_classification[cgpa_range.range] = cgpa_range.count
             
+            faculty_grade_counts = {}
+            for cell in combined_response.faculty_grade_counts:
+                faculty_grade_counts.setdefault(cell.faculty, {})[cell.grade] = cell.count
+            
             self.metrics['detailed_results']['mapreduce'] = {
                 'cgpa_classification': cgpa_classification,
+                'grade_counts': {g.grade: g.count for g in combined_response.grade_counts},
+                'faculty_counts': {f.faculty: f.count for f in combined_response.faculty_counts},
+                'faculty_grade_counts': faculty_grade_counts,
                 'processing_time': combined_response.mapreduce_time
             }
             
             # MergeSort results
             top_10_students = []
-            for student in combined_response.sorted_by_cgpa[:10]:
+            for student in top_by_cgpa:
                 top_10_students.append({
                     'student_id': student.student_id,
                     'name': student.name,
@@ -184,9 +283,21 @@ class MicroservicesClient:
                     'grade': student.grade
                 })
             
+            top_10_by_grade = [
+                {
+                    'student_id': student.student_id,
+                    'name': student.name,
+                    'faculty': student.faculty,
+                    'cgpa': student.cgpa,
+                    'grade': student.grade
+                }
+                for student in top_by_grade
+            ]
+            
             self.metrics['detailed_results']['mergesort'] = {
-                'sorted_count': len(combined_response.sorted_by_cgpa),
+                'sorted_count': combined_response.sorted_count,
                 'top_10': top_10_students,
+                'top_10_by_grade': top_10_by_grade,
                 'processing_time': combined_response.mergesort_time
             }
             
@@ -205,13 +316,24 @@ class MicroservicesClient:
                     'percentage': grade_dist.percentage
                 }
             
+            percentile_fields = ('p10', 'p25', 'p50', 'p75', 'p90', 'p99')
+            percentiles = {
+                'overall': {name: getattr(combined_response.overall_percentiles, name) for name in percentile_fields},
+                'by_faculty': {
+                    p.faculty: {name: getattr(p, name) for name in percentile_fields}
+                    for p in combined_response.faculty_percentiles
+                },
+                'exact': combined_response.percentiles_exact
+            }
+            
             self.metrics['detailed_results']['statistics'] = {
                 'operation': 'statistical_analysis',
                 'result': {
                     'mean_cgpa': combined_response.mean_cgpa,
                     'pass_rate': combined_response.pass_rate,
                     'faculty_statistics': faculty_stats,
-                    'grade_distribution': grade_distribution
+                    'grade_distribution': grade_distribution,
+                    'percentiles': percentiles
                 },
                 'processing_time': combined_response.statistics_time
             }
@@ -257,7 +379,7 @@ def main():
     current_dir = os.path.dirname(os.path.abspath(__file__))
     grpc_impl_dir = os.path.dirname(current_dir)
     project_root = os.path.dirname(grpc_impl_dir)
-    csv_path = os.path.join(project_root, 'data', 'students.csv')
+    csv_path = os.getenv('CSV_PATH', os.path.join(project_root, 'data', 'students.csv'))  # CSV or columnar dataset
     
     client.load_students(csv_path)
     
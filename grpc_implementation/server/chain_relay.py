@@ -0,0 +1,85 @@
+"""
+Chain Relay
+Forwards a streamed chain downstream while the current stage is still consuming it
+"""
+
+import os
+import queue
+
+import grpc
+
+
+class ChainRelay:
+    """
+    Bidirectional ProcessChainPipeline call to the next service
+
+    The handler send()s every upstream batch as it arrives; a gRPC thread
+    drains the queue into the downstream call, so the next stage starts
+    working before this one has seen the whole cohort. The queue is bounded,
+    so a slow next stage blocks send() and the backpressure reaches the
+    upstream stream instead of batches piling up in memory. responses() then
+    relays the downstream stages' CombinedResponse fragments. If the next
+    service fails, the rest of the stream is dropped and the failure is kept
+    in `failure` so the handler can end its own call with that status after
+    yielding its results.
+    """
+
+    # Marks the end of the forwarded stream
+    _END = object()
+
+    # Seconds between checks that the downstream call is still running while the queue is full
+    _POLL_INTERVAL = 0.5
+
+    def __init__(self, stub, service, next_service, timeout=None):
+        """
+        Args:
+            stub: Stub of the next service (from its ChannelPool)
+            service: Name of this service (log prefix)
+            next_service: Name of the next service (log messages)
+            timeout: Deadline of the downstream call in seconds, normally the
+                     upstream call's context.time_remaining() (default: CHAIN_STREAM_TIMEOUT, 60)
+        """
+        self.service = service
+        self.next_service = next_service
+        self.failure = None  # (grpc.StatusCode, details) once the downstream call failed
+        if timeout is None:
+            timeout = float(os.getenv('CHAIN_STREAM_TIMEOUT', '60'))
+        self.queue = queue.Queue(maxsize=int(os.getenv('CHAIN_RELAY_QUEUE', '4')))  # Batches in flight
+        self.call = stub.ProcessChainPipeline(iter(self.queue.get, self._END), timeout=timeout)
+
+    def send(self, request):
+        """Forward one ChainRequest batch downstream (blocks while the queue is full)"""
+        self._put(request)
+
+    def close(self):
+        """End the downstream request stream"""
+        self._put(self._END)
+
+    def _put(self, item):
+        """Queue an item for the downstream call; once the call has ended the item is dropped and the failure recorded"""
+        while not self.call.done():
+            try:
+                self.queue.put(item, timeout=self._POLL_INTERVAL)
+                return
+            except queue.Full:
+                pass
+        if self.call.code() != grpc.StatusCode.OK:
+            self._failed(self.call.code(), self.call.details())
+
+    def _failed(self, code, details):
+        """Record (and log once) why the downstream call failed"""
+        if self.failure is None:
+            self.failure = (code, f"{self.next_service}: {details}")
+            print(f"[{self.service}] ✗ Failed to forward to {self.next_service}: {code} {details}", flush=True)
+
+    def cancel(self):
+        """Abort the downstream call (this stage failed)"""
+        self.call.cancel()
+
+    def responses(self):
+        """Yield the downstream fragments"""
+        try:
+            for fragment in self.call:
+                yield fragment
+        except grpc.RpcError as e:
+            self._failed(e.code(), e.details())
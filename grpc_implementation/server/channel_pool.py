@@ -0,0 +1,111 @@
+"""
+Channel Pool
+Long-lived, pre-warmed gRPC channels to the next service in the chain
+"""
+
+import itertools
+import os
+import threading
+import time
+
+import grpc
+
+import student_service_pb2_grpc
+
+
+def channel_options():
+    """
+    gRPC channel / server arguments shared by the chain
+
+    GRPC_MAX_MESSAGE_MB: Max send / receive message size (default: 256)
+    GRPC_KEEPALIVE_TIME_MS: Keepalive ping interval (default: 30000)
+    GRPC_KEEPALIVE_TIMEOUT_MS: Keepalive ack timeout (default: 10000)
+    GRPC_STREAM_WINDOW_BYTES: HTTP/2 stream flow-control window (default: 0 = gRPC's
+                              adaptive window; BDP probing stays enabled)
+    """
+    max_message = int(os.getenv('GRPC_MAX_MESSAGE_MB', '256')) << 20
+    options = [
+        ('grpc.max_send_message_length', max_message),
+        ('grpc.max_receive_message_length', max_message),
+        ('grpc.keepalive_time_ms', int(os.getenv('GRPC_KEEPALIVE_TIME_MS', '30000'))),
+        ('grpc.keepalive_timeout_ms', int(os.getenv('GRPC_KEEPALIVE_TIMEOUT_MS', '10000'))),
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.http2.max_pings_without_data', 0),
+        ('grpc.http2.bdp_probe', 1),
+    ]
+    window = int(os.getenv('GRPC_STREAM_WINDOW_BYTES', '0'))
+    if window:
+        options.append(('grpc.http2.lookahead_bytes', window))
+    return options
+
+
+def server_options():
+    """Server arguments matching channel_options() (accepts the pool's keepalive pings)"""
+    return channel_options() + [
+        ('grpc.http2.min_ping_interval_without_data_ms', int(os.getenv('GRPC_KEEPALIVE_TIME_MS', '30000')) // 2),
+    ]
+
+
+class ChannelPool:
+    """
+    Fixed set of persistent channels to one downstream address
+
+    Channels are created with the service and kept open for its lifetime,
+    so a chained request never pays for a TCP / HTTP/2 handshake; stubs
+    are handed out round-robin to spread concurrent requests over several
+    connections. warm() connects every channel up front.
+    """
+
+    def __init__(self, address, size=None, options=None):
+        """
+        Args:
+            address: host:port of the next service
+            size: Number of channels (GRPC_CHANNEL_POOL_SIZE, default: 4)
+            options: gRPC channel arguments (default: channel_options())
+        """
+        self.address = address
+        self.size = size or int(os.getenv('GRPC_CHANNEL_POOL_SIZE', '4'))
+        options = channel_options() if options is None else options
+        # A local subchannel pool gives every channel its own connection
+        self.channels = [
+            grpc.insecure_channel(address, options=options + [('grpc.use_local_subchannel_pool', 1)])
+            for _ in range(self.size)
+        ]
+        self.stubs = [student_service_pb2_grpc.StudentAnalysisServiceStub(channel) for channel in self.channels]
+        self._next = itertools.cycle(range(self.size))
+        self._lock = threading.Lock()
+
+    def warm(self, timeout=None):
+        """
+        Connect every channel before the first request
+
+        Args:
+            timeout: Seconds to wait for the whole pool (GRPC_WARMUP_TIMEOUT, default: 5)
+
+        Returns:
+            Number of channels that became ready; the others keep
+            connecting in the background
+        """
+        timeout = float(os.getenv('GRPC_WARMUP_TIMEOUT', '5')) if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        # All channels connect concurrently
+        pending = [grpc.channel_ready_future(channel) for channel in self.channels]
+        ready = 0
+        for future in pending:
+            try:
+                future.result(timeout=max(0.0, deadline - time.monotonic()))
+                ready += 1
+            except grpc.FutureTimeoutError:
+                pass
+        return ready
+
+    def stub(self):
+        """Next stub in round-robin order"""
+        with self._lock:
+            index = next(self._next)
+        return self.stubs[index]
+
+    def close(self):
+        """Close every channel"""
+        for channel in self.channels:
+            channel.close()
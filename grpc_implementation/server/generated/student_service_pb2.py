@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x15student_service.proto\x12\x0fstudent_service\"Y\n\x07Student\x12\x12\n\nstudent_id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0f\n\x07\x66\x61\x63ulty\x18\x03 \x01(\t\x12\x0c\n\x04\x63gpa\x18\x04 \x01(\x01\x12\r\n\x05grade\x18\x05 \x01(\t\"Q\n\x10MapReduceRequest\x12*\n\x08students\x18\x01 \x03(\x0b\x32\x18.student_service.Student\x12\x11\n\toperation\x18\x02 \x01(\t\")\n\tCGPARange\x12\r\n\x05range\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\"*\n\nGradeCount\x12\r\n\x05grade\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\"\x90\x01\n\x11MapReduceResponse\x12/\n\x0b\x63gpa_ranges\x18\x01 \x03(\x0b\x32\x1a.student_service.CGPARange\x12\x31\n\x0cgrade_counts\x18\x02 \x03(\x0b\x32\x1b.student_service.GradeCount\x12\x17\n\x0fprocessing_time\x18\x03 \x01(\x01\"O\n\x10MergeSortRequest\x12*\n\x08students\x18\x01 \x03(\x0b\x32\x18.student_service.Student\x12\x0f\n\x07sort_by\x18\x02 \x01(\t\"_\n\x11MergeSortResponse\x12\x31\n\x0fsorted_students\x18\x01 \x03(\x0b\x32\x18.student_service.Student\x12\x17\n\x0fprocessing_time\x18\x02 \x01(\x01\"Q\n\x0cStatsRequest\x12*\n\x08students\x18\x01 \x03(\x0b\x32\x18.student_service.Student\x12\x15\n\ranalysis_type\x18\x02 \x01(\t\"L\n\x0c\x46\x61\x63ultyStats\x12\x0f\n\x07\x66\x61\x63ulty\x18\x01 \x01(\t\x12\x14\n\x0c\x61verage_cgpa\x18\x02 \x01(\x01\x12\x15\n\rstudent_count\x18\x03 \x01(\x05\"E\n\x11GradeDistribution\x12\r\n\x05grade\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\x12\x12\n\npercentage\x18\x03 \x01(\x01\"\xb1\x01\n\rStatsResponse\x12\x34\n\rfaculty_stats\x18\x01 \x03(\x0b\x32\x1d.student_service.FacultyStats\x12>\n\x12grade_distribution\x18\x02 \x03(\x0b\x32\".student_service.GradeDistribution\x12\x11\n\tpass_rate\x18\x03 \x01(\x01\x12\x17\n\x0fprocessing_time\x18\x04 \x01(\x01\"\xdd\x03\n\x10\x43ombinedResponse\x12/\n\x0b\x63gpa_ranges\x18\x01 \x03(\x0b\x32\x1a.student_service.CGPARange\x12\x31\n\x0cgrade_counts\x18\x03 \x03(\x0b\x32\x1b.student_service.GradeCount\x12\x16\n\x0emapreduce_time\x18\x02 \x01(\x01\x12\x30\n\x0esorted_by_cgpa\x18\x05 \x03(\x0b\x32\x18.student_service.Student\x12\x31\n\x0fsorted_by_grade\x18\x07 \x03(\x0b\x32\x18.student_service.Student\x12\x16\n\x0emergesort_time\x18\x06 \x01(\x01\x12\x34\n\rfaculty_stats\x18\t \x03(\x0b\x32\x1d.student_service.FacultyStats\x12>\n\x12grade_distribution\x18\n \x03(\x0b\x32\".student_service.GradeDistribution\x12\x11\n\tpass_rate\x18\x0b \x01(\x01\x12\x11\n\tmean_cgpa\x18\x0e \x01(\x01\x12\x17\n\x0fstatistics_time\x18\x0c \x01(\x01\x12\x1b\n\x13total_workflow_time\x18\r \x01(\x01\"v\n\x0c\x43hainRequest\x12*\n\x08students\x18\x01 \x03(\x0b\x32\x18.student_service.Student\x12:\n\x0fpartial_results\x18\x02 \x01(\x0b\x32!.student_service.CombinedResponse2\xfd\x02\n\x16StudentAnalysisService\x12Y\n\x10PerformMapReduce\x12!.student_service.MapReduceRequest\x1a\".student_service.MapReduceResponse\x12Y\n\x10PerformMergeSort\x12!.student_service.MergeSortRequest\x1a\".student_service.MergeSortResponse\x12[\n\x1aPerformStatisticalAnalysis\x12\x1d.student_service.StatsRequest\x1a\x1e.student_service.StatsResponse\x12P\n\x0cProcessChain\x12\x1d.student_service.ChainRequest\x1a!.student_service.CombinedResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x15student_service.proto\x12\x0fstudent_service\"Y\n\x07Student\x12\x12\n\nstudent_id\x18\x01 \x01(\t\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x0f\n\x07\x66\x61\x63ulty\x18\x03 \x01(\t\x12\x0c\n\x04\x63gpa\x18\x04 \x01(\x01\x12\r\n\x05grade\x18\x05 \x01(\t\"\xd4\x01\n\x0eStudentColumns\x12\x0c\n\x04\x63gpa\x18\x01 \x01(\x0c\x12\x15\n\rfaculty_codes\x18\x02 \x01(\x0c\x12\x15\n\rfaculty_table\x18\x03 \x03(\t\x12\x13\n\x0bgrade_codes\x18\x04 \x01(\x0c\x12\x13\n\x0bgrade_table\x18\x05 \x03(\t\x12\x1a\n\x12student_id_offsets\x18\x06 \x01(\x0c\x12\x17\n\x0fstudent_id_data\x18\x07 \x01(\x0c\x12\x14\n\x0cname_offsets\x18\x08 \x01(\x0c\x12\x11\n\tname_data\x18\t \x01(\x0c\"\x83\x01\n\x10MapReduceRequest\x12*\n\x08students\x18\x01 \x03(\x0b\x32\x18.student_service.Student\x12\x11\n\toperation\x18\x02 \x01(\t\x12\x30\n\x07\x63olumns\x18\x03 \x01(\x0b\x32\x1f.student_service.StudentColumns\")\n\tCGPARange\x12\r\n\x05range\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\"*\n\nGradeCount\x12\r\n\x05grade\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\".\n\x0c\x46\x61\x63ultyCount\x12\x0f\n\x07\x66\x61\x63ulty\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\"B\n\x11\x46\x61\x63ultyGradeCount\x12\x0f\n\x07\x66\x61\x63ulty\x18\x01 \x01(\t\x12\r\n\x05grade\x18\x02 \x01(\t\x12\r\n\x05\x63ount\x18\x03 \x01(\x05\"\x9e\x02\n\x11MapReduceResponse\x12/\n\x0b\x63gpa_ranges\x18\x01 \x03(\x0b\x32\x1a.student_service.CGPARange\x12\x31\n\x0cgrade_counts\x18\x02 \x03(\x0b\x32\x1b.student_service.GradeCount\x12\x17\n\x0fprocessing_time\x18\x03 \x01(\x01\x12\x35\n\x0e\x66\x61\x63ulty_counts\x18\x04 \x03(\x0b\x32\x1d.student_service.FacultyCount\x12@\n\x14\x66\x61\x63ulty_grade_counts\x18\x05 \x03(\x0b\x32\".student_service.FacultyGradeCount\x12\x13\n\x0btotal_count\x18\x06 \x01(\x05\"\x90\x01\n\x10MergeSortRequest\x12*\n\x08students\x18\x01 \x03(\x0b\x32\x18.student_service.Student\x12\x0f\n\x07sort_by\x18\x02 \x01(\t\x12\r\n\x05top_k\x18\x03 \x01(\x05\x12\x30\n\x07\x63olumns\x18\x04 \x01(\x0b\x32\x1f.student_service.StudentColumns\"\xad\x01\n\x11MergeSortResponse\x12\x31\n\x0fsorted_students\x18\x01 \x03(\x0b\x32\x18.student_service.Student\x12\x17\n\x0fprocessing_time\x18\x02 \x01(\x01\x12\x13\n\x0btotal_count\x18\x03 \x01(\x05\x12\x37\n\x0esorted_columns\x18\x04 \x01(\x0b\x32\x1f.student_service.StudentColumns\"\x83\x01\n\x0cStatsRequest\x12*\n\x08students\x18\x01 \x03(\x0b\x32\x18.student_service.Student\x12\x15\n\ranalysis_type\x18\x02 \x01(\t\x12\x30\n\x07\x63olumns\x18\x03 \x01(\x0b\x32\x1f.student_service.StudentColumns\"L\n\x0c\x46\x61\x63ultyStats\x12\x0f\n\x07\x66\x61\x63ulty\x18\x01 \x01(\t\x12\x14\n\x0c\x61verage_cgpa\x18\x02 \x01(\x01\x12\x15\n\rstudent_count\x18\x03 \x01(\x05\"E\n\x11GradeDistribution\x12\r\n\x05grade\x18\x01 \x01(\t\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\x12\x12\n\npercentage\x18\x03 \x01(\x01\"l\n\x0bPercentiles\x12\x0f\n\x07\x66\x61\x63ulty\x18\x01 \x01(\t\x12\x0b\n\x03p10\x18\x02 \x01(\x01\x12\x0b\n\x03p25\x18\x03 \x01(\x01\x12\x0b\n\x03p50\x18\x04 \x01(\x01\x12\x0b\n\x03p75\x18\x05 \x01(\x01\x12\x0b\n\x03p90\x18\x06 \x01(\x01\x12\x0b\n\x03p99\x18\x07 \x01(\x01\"\x84\x03\n\rStatsResponse\x12\x34\n\rfaculty_stats\x18\x01 \x03(\x0b\x32\x1d.student_service.FacultyStats\x12>\n\x12grade_distribution\x18\x02 \x03(\x0b\x32\".student_service.GradeDistribution\x12\x11\n\tpass_rate\x18\x03 \x01(\x01\x12\x17\n\x0fprocessing_time\x18\x04 \x01(\x01\x12\x39\n\x13overall_percentiles\x18\x05 \x01(\x0b\x32\x1c.student_service.Percentiles\x12\x39\n\x13\x66\x61\x63ulty_percentiles\x18\x06 \x03(\x0b\x32\x1c.student_service.Percentiles\x12\x11\n\tmean_cgpa\x18\x07 \x01(\x01\x12\x0f\n\x07std_dev\x18\x08 \x01(\x01\x12\x10\n\x08min_cgpa\x18\t \x01(\x01\x12\x10\n\x08max_cgpa\x18\n \x01(\x01\x12\x13\n\x0btotal_count\x18\x0b \x01(\x05\"\x80\x07\n\x10\x43ombinedResponse\x12/\n\x0b\x63gpa_ranges\x18\x01 \x03(\x0b\x32\x1a.student_service.CGPARange\x12\x31\n\x0cgrade_counts\x18\x03 \x03(\x0b\x32\x1b.student_service.GradeCount\x12\x35\n\x0e\x66\x61\x63ulty_counts\x18\x0f \x03(\x0b\x32\x1d.student_service.FacultyCount\x12@\n\x14\x66\x61\x63ulty_grade_counts\x18\x10 \x03(\x0b\x32\".student_service.FacultyGradeCount\x12\x16\n\x0emapreduce_time\x18\x02 \x01(\x01\x12\x30\n\x0esorted_by_cgpa\x18\x05 \x03(\x0b\x32\x18.student_service.Student\x12\x31\n\x0fsorted_by_grade\x18\x07 \x03(\x0b\x32\x18.student_service.Student\x12\x14\n\x0csorted_count\x18\x11 \x01(\x05\x12?\n\x16sorted_by_cgpa_columns\x18\x15 \x01(\x0b\x32\x1f.student_service.StudentColumns\x12@\n\x17sorted_by_grade_columns\x18\x16 \x01(\x0b\x32\x1f.student_service.StudentColumns\x12\x16\n\x0emergesort_time\x18\x06 \x01(\x01\x12\x34\n\rfaculty_stats\x18\t \x03(\x0b\x32\x1d.student_service.FacultyStats\x12>\n\x12grade_distribution\x18\n \x03(\x0b\x32\".student_service.GradeDistribution\x12\x11\n\tpass_rate\x18\x0b \x01(\x01\x12\x11\n\tmean_cgpa\x18\x0e \x01(\x01\x12\x39\n\x13overall_percentiles\x18\x12 \x01(\x0b\x32\x1c.student_service.Percentiles\x12\x39\n\x13\x66\x61\x63ulty_percentiles\x18\x13 \x03(\x0b\x32\x1c.student_service.Percentiles\x12\x19\n\x11percentiles_exact\x18\x14 \x01(\x08\x12\x17\n\x0fstatistics_time\x18\x0c \x01(\x01\x12\x1b\n\x13total_workflow_time\x18\r \x01(\x01\"\xb7\x01\n\x0c\x43hainRequest\x12*\n\x08students\x18\x01 \x03(\x0b\x32\x18.student_service.Student\x12:\n\x0fpartial_results\x18\x02 \x01(\x0b\x32!.student_service.CombinedResponse\x12\r\n\x05top_k\x18\x03 \x01(\x05\x12\x30\n\x07\x63olumns\x18\x04 \x01(\x0b\x32\x1f.student_service.StudentColumns\"L\n\x0cStudentDelta\x12\x11\n\toperation\x18\x01 \x01(\t\x12)\n\x07student\x18\x02 \x01(\x0b\x32\x18.student_service.Student\"[\n\x0c\x44\x65ltaRequest\x12-\n\x06\x64\x65ltas\x18\x01 \x03(\x0b\x32\x1d.student_service.StudentDelta\x12\r\n\x05reset\x18\x02 \x01(\x08\x12\r\n\x05top_k\x18\x03 \x01(\x05\"\"\n\x0bRankRequest\x12\x13\n\x0bstudent_ids\x18\x01 \x03(\t\"=\n\x0bStudentRank\x12\x12\n\nstudent_id\x18\x01 \x01(\t\x12\x0c\n\x04rank\x18\x02 \x01(\x05\x12\x0c\n\x04\x63gpa\x18\x03 \x01(\x01\"P\n\x0cRankResponse\x12+\n\x05ranks\x18\x01 \x03(\x0b\x32\x1c.student_service.StudentRank\x12\x13\n\x0btotal_count\x18\x02 \x01(\x05\x32\x8c\x07\n\x16StudentAnalysisService\x12Y\n\x10PerformMapReduce\x12!.student_service.MapReduceRequest\x1a\".student_service.MapReduceResponse\x12Y\n\x10PerformMergeSort\x12!.student_service.MergeSortRequest\x1a\".student_service.MergeSortResponse\x12[\n\x1aPerformStatisticalAnalysis\x12\x1d.student_service.StatsRequest\x1a\x1e.student_service.StatsResponse\x12P\n\x0cProcessChain\x12\x1d.student_service.ChainRequest\x1a!.student_service.CombinedResponse\x12X\n\x12ProcessChainStream\x12\x1d.student_service.ChainRequest\x1a!.student_service.CombinedResponse(\x01\x12\\\n\x14ProcessChainPipeline\x12\x1d.student_service.ChainRequest\x1a!.student_service.CombinedResponse(\x01\x30\x01\x12Y\n\x14\x41pplyMapReduceDeltas\x12\x1d.student_service.DeltaRequest\x1a\".student_service.MapReduceResponse\x12V\n\x15\x41pplyStatisticsDeltas\x12\x1d.student_service.DeltaRequest\x1a\x1e.student_service.StatsResponse\x12Y\n\x14\x41pplyMergeSortDeltas\x12\x1d.student_service.DeltaRequest\x1a\".student_service.MergeSortResponse\x12G\n\x08GetRanks\x12\x1c.student_service.RankRequest\x1a\x1d.student_service.RankResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -33,30 +33,48 @@ if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
   _globals['_STUDENT']._serialized_start=42
   _globals['_STUDENT']._serialized_end=131
-  _globals['_MAPREDUCEREQUEST']._serialized_start=133
-  _globals['_MAPREDUCEREQUEST']._serialized_end=214
-  _globals['_CGPARANGE']._serialized_start=216
-  _globals['_CGPARANGE']._serialized_end=257
-  _globals['_GRADECOUNT']._serialized_start=259
-  _globals['_GRADECOUNT']._serialized_end=301
-  _globals['_MAPREDUCERESPONSE']._serialized_start=304
-  _globals['_MAPREDUCERESPONSE']._serialized_end=448
-  _globals['_MERGESORTREQUEST']._serialized_start=450
-  _globals['_MERGESORTREQUEST']._serialized_end=529
-  _globals['_MERGESORTRESPONSE']._serialized_start=531
-  _globals['_MERGESORTRESPONSE']._serialized_end=626
-  _globals['_STATSREQUEST']._serialized_start=628
-  _globals['_STATSREQUEST']._serialized_end=709
-  _globals['_FACULTYSTATS']._serialized_start=711
-  _globals['_FACULTYSTATS']._serialized_end=787
-  _globals['_GRADEDISTRIBUTION']._serialized_start=789
-  _globals['_GRADEDISTRIBUTION']._serialized_end=858
-  _globals['_STATSRESPONSE']._serialized_start=861
-  _globals['_STATSRESPONSE']._serialized_end=1038
-  _globals['_COMBINEDRESPONSE']._serialized_start=1041
-  _globals['_COMBINEDRESPONSE']._serialized_end=1518
-  _globals['_CHAINREQUEST']._serialized_start=1520
-  _globals['_CHAINREQUEST']._serialized_end=1638
-  _globals['_STUDENTANALYSISSERVICE']._serialized_start=1641
-  _globals['_STUDENTANALYSISSERVICE']._serialized_end=2022
+  _globals['_STUDENTCOLUMNS']._serialized_start=134
+  _globals['_STUDENTCOLUMNS']._serialized_end=346
+  _globals['_MAPREDUCEREQUEST']._serialized_start=349
+  _globals['_MAPREDUCEREQUEST']._serialized_end=480
+  _globals['_CGPARANGE']._serialized_start=482
+  _globals['_CGPARANGE']._serialized_end=523
+  _globals['_GRADECOUNT']._serialized_start=525
+  _globals['_GRADECOUNT']._serialized_end=567
+  _globals['_FACULTYCOUNT']._serialized_start=569
+  _globals['_FACULTYCOUNT']._serialized_end=615
+  _globals['_FACULTYGRADECOUNT']._serialized_start=617
+  _globals['_FACULTYGRADECOUNT']._serialized_end=683
+  _globals['_MAPREDUCERESPONSE']._serialized_start=686
+  _globals['_MAPREDUCERESPONSE']._serialized_end=972
+  _globals['_MERGESORTREQUEST']._serialized_start=975
+  _globals['_MERGESORTREQUEST']._serialized_end=1119
+  _globals['_MERGESORTRESPONSE']._serialized_start=1122
+  _globals['_MERGESORTRESPONSE']._serialized_end=1295
+  _globals['_STATSREQUEST']._serialized_start=1298
+  _globals['_STATSREQUEST']._serialized_end=1429
+  _globals['_FACULTYSTATS']._serialized_start=1431
+  _globals['_FACULTYSTATS']._serialized_end=1507
+  _globals['_GRADEDISTRIBUTION']._serialized_start=1509
+  _globals['_GRADEDISTRIBUTION']._serialized_end=1578
+  _globals['_PERCENTILES']._serialized_start=1580
+  _globals['_PERCENTILES']._serialized_end=1688
+  _globals['_STATSRESPONSE']._serialized_start=1691
+  _globals['_STATSRESPONSE']._serialized_end=2079
+  _globals['_COMBINEDRESPONSE']._serialized_start=2082
+  _globals['_COMBINEDRESPONSE']._serialized_end=2978
+  _globals['_CHAINREQUEST']._serialized_start=2981
+  _globals['_CHAINREQUEST']._serialized_end=3164
+  _globals['_STUDENTDELTA']._serialized_start=3166
+  _globals['_STUDENTDELTA']._serialized_end=3242
+  _globals['_DELTAREQUEST']._serialized_start=3244
+  _globals['_DELTAREQUEST']._serialized_end=3335
+  _globals['_RANKREQUEST']._serialized_start=3337
+  _globals['_RANKREQUEST']._serialized_end=3371
+  _globals['_STUDENTRANK']._serialized_start=3373
+  _globals['_STUDENTRANK']._serialized_end=3434
+  _globals['_RANKRESPONSE']._serialized_start=3436
+  _globals['_RANKRESPONSE']._serialized_end=3516
+  _globals['_STUDENTANALYSISSERVICE']._serialized_start=3519
+  _globals['_STUDENTANALYSISSERVICE']._serialized_end=4427
 # @@protoc_insertion_point(module_scope)
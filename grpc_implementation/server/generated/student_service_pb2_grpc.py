@@ -55,6 +55,36 @@ class StudentAnalysisServiceStub(object):
                 request_serializer=student__service__pb2.ChainRequest.SerializeToString,
                 response_deserializer=student__service__pb2.CombinedResponse.FromString,
                 _registered_method=True)
+        self.ProcessChainStream = channel.stream_unary(
+                '/student_service.StudentAnalysisService/ProcessChainStream',
+                request_serializer=student__service__pb2.ChainRequest.SerializeToString,
+                response_deserializer=student__service__pb2.CombinedResponse.FromString,
+                _registered_method=True)
+        self.ProcessChainPipeline = channel.stream_stream(
+                '/student_service.StudentAnalysisService/ProcessChainPipeline',
+                request_serializer=student__service__pb2.ChainRequest.SerializeToString,
+                response_deserializer=student__service__pb2.CombinedResponse.FromString,
+                _registered_method=True)
+        self.ApplyMapReduceDeltas = channel.unary_unary(
+                '/student_service.StudentAnalysisService/ApplyMapReduceDeltas',
+                request_serializer=student__service__pb2.DeltaRequest.SerializeToString,
+                response_deserializer=student__service__pb2.MapReduceResponse.FromString,
+                _registered_method=True)
+        self.ApplyStatisticsDeltas = channel.unary_unary(
+                '/student_service.StudentAnalysisService/ApplyStatisticsDeltas',
+                request_serializer=student__service__pb2.DeltaRequest.SerializeToString,
+                response_deserializer=student__service__pb2.StatsResponse.FromString,
+                _registered_method=True)
+        self.ApplyMergeSortDeltas = channel.unary_unary(
+                '/student_service.StudentAnalysisService/ApplyMergeSortDeltas',
+                request_serializer=student__service__pb2.DeltaRequest.SerializeToString,
+                response_deserializer=student__service__pb2.MergeSortResponse.FromString,
+                _registered_method=True)
+        self.GetRanks = channel.unary_unary(
+                '/student_service.StudentAnalysisService/GetRanks',
+                request_serializer=student__service__pb2.RankRequest.SerializeToString,
+                response_deserializer=student__service__pb2.RankResponse.FromString,
+                _registered_method=True)
 
 
 class StudentAnalysisServiceServicer(object):
@@ -86,6 +116,48 @@ class StudentAnalysisServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ProcessChainStream(self, request_iterator, context):
+        """Chain with the cohort uploaded in batches
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ProcessChainPipeline(self, request_iterator, context):
+        """Streaming stages; one result fragment per stage
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ApplyMapReduceDeltas(self, request, context):
+        """Incremental MapReduce counts
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ApplyStatisticsDeltas(self, request, context):
+        """Incremental statistics
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ApplyMergeSortDeltas(self, request, context):
+        """Incremental ranking index
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetRanks(self, request, context):
+        """Rank lookups in the ranking index
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_StudentAnalysisServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -109,6 +181,36 @@ def add_StudentAnalysisServiceServicer_to_server(servicer, server):
                     request_deserializer=student__service__pb2.ChainRequest.FromString,
                     response_serializer=student__service__pb2.CombinedResponse.SerializeToString,
             ),
+            'ProcessChainStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.ProcessChainStream,
+                    request_deserializer=student__service__pb2.ChainRequest.FromString,
+                    response_serializer=student__service__pb2.CombinedResponse.SerializeToString,
+            ),
+            'ProcessChainPipeline': grpc.stream_stream_rpc_method_handler(
+                    servicer.ProcessChainPipeline,
+                    request_deserializer=student__service__pb2.ChainRequest.FromString,
+                    response_serializer=student__service__pb2.CombinedResponse.SerializeToString,
+            ),
+            'ApplyMapReduceDeltas': grpc.unary_unary_rpc_method_handler(
+                    servicer.ApplyMapReduceDeltas,
+                    request_deserializer=student__service__pb2.DeltaRequest.FromString,
+                    response_serializer=student__service__pb2.MapReduceResponse.SerializeToString,
+            ),
+            'ApplyStatisticsDeltas': grpc.unary_unary_rpc_method_handler(
+                    servicer.ApplyStatisticsDeltas,
+                    request_deserializer=student__service__pb2.DeltaRequest.FromString,
+                    response_serializer=student__service__pb2.StatsResponse.SerializeToString,
+            ),
+            'ApplyMergeSortDeltas': grpc.unary_unary_rpc_method_handler(
+                    servicer.ApplyMergeSortDeltas,
+                    request_deserializer=student__service__pb2.DeltaRequest.FromString,
+                    response_serializer=student__service__pb2.MergeSortResponse.SerializeToString,
+            ),
+            'GetRanks': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetRanks,
+                    request_deserializer=student__service__pb2.RankRequest.FromString,
+                    response_serializer=student__service__pb2.RankResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'student_service.StudentAnalysisService', rpc_method_handlers)
@@ -228,3 +330,165 @@ class StudentAnalysisService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ProcessChainStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/student_service.StudentAnalysisService/ProcessChainStream',
+            student__service__pb2.ChainRequest.SerializeToString,
+            student__service__pb2.CombinedResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ProcessChainPipeline(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/student_service.StudentAnalysisService/ProcessChainPipeline',
+            student__service__pb2.ChainRequest.SerializeToString,
+            student__service__pb2.CombinedResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ApplyMapReduceDeltas(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/student_service.StudentAnalysisService/ApplyMapReduceDeltas',
+            student__service__pb2.DeltaRequest.SerializeToString,
+            student__service__pb2.MapReduceResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ApplyStatisticsDeltas(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/student_service.StudentAnalysisService/ApplyStatisticsDeltas',
+            student__service__pb2.DeltaRequest.SerializeToString,
+            student__service__pb2.StatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ApplyMergeSortDeltas(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/student_service.StudentAnalysisService/ApplyMergeSortDeltas',
+            student__service__pb2.DeltaRequest.SerializeToString,
+            student__service__pb2.MergeSortResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetRanks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/student_service.StudentAnalysisService/GetRanks',
+            student__service__pb2.RankRequest.SerializeToString,
+            student__service__pb2.RankResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -19,78 +19,233 @@ sys.path.insert(0, os.path.join(current_dir, 'generated'))
 
 import student_service_pb2
 import student_service_pb2_grpc
-from services.mapreduce_service import MapReduceService
+from chain_relay import ChainRelay
+from channel_pool import ChannelPool, server_options
+from services.incremental_aggregates import IncrementalMapReduce
+from services.mapreduce_service import MapReduceService, MapReduceStream
+from services.mergesort_service import MergeSortService
+from services.result_cache import ResultCache
+from wire_format import forward_request, request_batch, request_size
 
 
 class MapReduceServiceHandler(student_service_pb2_grpc.StudentAnalysisServiceServicer):
     """MapReduce Service: Performs CGPA classification, forwards to MergeSort Service"""
     
+    # Jobs computed together in one scan for the chain
+    CHAIN_OPERATIONS = ("cgpa_count", "grade_count", "faculty_count", "faculty_grade_count")
+    
     def __init__(self):
         self.next_service = os.getenv('MERGESORT_ADDRESS', 'localhost:50053')
+        self.cache = ResultCache()
+        self.pool = ChannelPool(self.next_service)  # Persistent channels, warmed in serve()
+        self.live = IncrementalMapReduce()
         print(f"[MapReduce Service] Initialized. Next service: {self.next_service}", flush=True)
     
+    @staticmethod
+    def add_results(response, result):
+        """Copy MapReduce job outputs into a MapReduceResponse or CombinedResponse"""
+        for grade_key, count in result.get('cgpa_classification', {}).items():
+            cgpa_range = response.cgpa_ranges.add()
+            cgpa_range.range = grade_key
+            cgpa_range.count = count
+        
+        for grade, count in result.get('grade_counts', {}).items():
+            grade_count = response.grade_counts.add()
+            grade_count.grade = grade
+            grade_count.count = count
+        
+        for faculty, count in result.get('faculty_counts', {}).items():
+            faculty_count = response.faculty_counts.add()
+            faculty_count.faculty = faculty
+            faculty_count.count = count
+        
+        for faculty, grades in result.get('faculty_grade_counts', {}).items():
+            for grade, count in grades.items():
+                cell = response.faculty_grade_counts.add()
+                cell.faculty = faculty
+                cell.grade = grade
+                cell.count = count
+    
+    def PerformMapReduce(self, request, context):
+        """Run the requested MapReduce operations (comma-separated) in one scan"""
+        start_time = time.time()
+        key = ResultCache.message_digest(request, 'PerformMapReduce')
+        cached = self.cache.get(key)
+        if cached is not None:
+            response = student_service_pb2.MapReduceResponse()
+            response.CopyFrom(cached)
+            response.processing_time = time.time() - start_time
+            return response
+        
+        operations = [op.strip() for op in request.operation.split(',') if op.strip()] or ["cgpa_count"]
+        try:
+            students = request_batch(request)
+            result = MapReduceService.perform_mapreduce(students, operations=operations)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return student_service_pb2.MapReduceResponse()
+        
+        response = student_service_pb2.MapReduceResponse(processing_time=result['processing_time'])
+        self.add_results(response, result)
+        self.cache.put(key, response)
+        return response
+    
+    def ApplyMapReduceDeltas(self, request, context):
+        """Apply insert/update/delete deltas to the live cohort and return its counts"""
+        start_time = time.time()
+        if request.reset:
+            self.live.reset()
+        try:
+            applied = self.live.apply_deltas((delta.operation, delta.student) for delta in request.deltas)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return student_service_pb2.MapReduceResponse()
+        
+        result = self.live.results()
+        response = student_service_pb2.MapReduceResponse(total_count=result['total_count'])
+        self.add_results(response, result)
+        response.processing_time = time.time() - start_time
+        print(f"[MapReduce] Applied {applied} deltas ({result['total_count']} students live)", flush=True)
+        return response
+    
+    def chain_results(self, request):
+        """Compute this stage's chain results as a CombinedResponse fragment"""
+        students = request_batch(request)
+        cgpa_result = MapReduceService.perform_mapreduce(students, operations=self.CHAIN_OPERATIONS)
+        
+        print(f"[MapReduce] Results: {cgpa_result['cgpa_classification']}", flush=True)
+        print(f"[MapReduce] Grade counts: {cgpa_result['grade_counts']}", flush=True)
+        
+        # Add CGPA classification, grade and faculty count results
+        fragment = student_service_pb2.CombinedResponse()
+        self.add_results(fragment, cgpa_result)
+        return fragment
+    
+    def forward(self, request, combined):
+        """Forward the request's students and accumulated results to MergeSort Service"""
+        try:
+            stub = self.pool.stub()
+            
+            next_request = forward_request(request, combined, request.top_k)
+            
+            # Wait for and receive combined results from MergeSort Service (which includes Statistics)
+            final_response = stub.ProcessChain(next_request, timeout=60)
+            
+            return final_response
+            
+        except Exception as e:
+            print(f"[MapReduce Service] ✗ Failed to forward to MergeSort Service: {e}", flush=True)
+            # Return only MapReduce Service results if forwarding fails
+            return combined
+    
     def ProcessChain(self, request, context):
         """Process CGPA classification, forward chain to MergeSort Service"""
-        print(f"[MapReduce Service] Processing {len(request.students)} students...", flush=True)
+        print(f"[MapReduce Service] Processing {request_size(request)} students...", flush=True)
         
         try:
             # Process MapReduce CGPA Classification
             print(f"[MapReduce] CGPA Classification", flush=True)
+            # Reject a bad top_k before any stage runs
+            MergeSortService.validate_top_k(request.top_k)
             start_time = time.time()
-            cgpa_result = MapReduceService.perform_mapreduce(list(request.students))
+            # Repeat payloads are served from the content-addressed cache
+            key = ResultCache.message_digest(request, 'ProcessChain', exclude=('partial_results', 'top_k'))
+            fragment, hit = self.cache.get_or_compute(key, lambda: self.chain_results(request))
             processing_time = time.time() - start_time
             
-            print(f"[MapReduce] Processed {len(request.students)} students", flush=True)
-            print(f"[MapReduce] Results: {cgpa_result['cgpa_classification']}", flush=True)
+            if hit:
+                print(f"[MapReduce] Cache hit {self.cache.stats()}", flush=True)
+            print(f"[MapReduce] Processed {request_size(request)} students", flush=True)
             print(f"[MapReduce] Processing time: {processing_time:.4f} seconds", flush=True)
             
             # Create combined response with MapReduce Service results
             combined = student_service_pb2.CombinedResponse()
-            
-            # Add CGPA classification results
-            for grade_key, count in cgpa_result['cgpa_classification'].items():
-                cgpa_range = combined.cgpa_ranges.add()
-                cgpa_range.range = grade_key
-                cgpa_range.count = count
-            
+            combined.CopyFrom(fragment)
             combined.mapreduce_time = processing_time
             
             print(f"[MapReduce Service] ✓ CGPA Classification completed in {processing_time:.4f}s", flush=True)
             print(f"[MapReduce Service] Forwarding to MergeSort Service...", flush=True)
             
             # Forward to MergeSort Service with accumulated results
-            try:
-                channel = grpc.insecure_channel(self.next_service)
-                stub = student_service_pb2_grpc.StudentAnalysisServiceStub(channel)
-                
-                next_request = student_service_pb2.ChainRequest(
-                    students=request.students,
-                    partial_results=combined
-                )
-                
-                # Wait for and receive combined results from MergeSort Service (which includes Statistics)
-                final_response = stub.ProcessChain(next_request, timeout=60)
-                channel.close()
-                
-                return final_response
-                
-            except Exception as e:
-                print(f"[MapReduce Service] ✗ Failed to forward to MergeSort Service: {e}", flush=True)
-                # Return only MapReduce Service results if forwarding fails
-                return combined
+            return self.forward(request, combined)
             
+        except ValueError as e:
+            print(f"[MapReduce Service] ✗ Invalid request: {e}", flush=True)
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return student_service_pb2.CombinedResponse()
         except Exception as e:
             print(f"[MapReduce Service] ✗ Error: {e}", flush=True)
             context.set_code(grpc.StatusCode.INTERNAL)
             return student_service_pb2.CombinedResponse()
-
+    
+    def ProcessChainPipeline(self, request_iterator, context):
+        """Map student batches as they stream in while forwarding them to MergeSort Service"""
+        print(f"[MapReduce Service] Receiving student stream (pipeline)...", flush=True)
+        relay = ChainRelay(self.pool.stub(), 'MapReduce Service', 'MergeSort Service', context.time_remaining())
+        
+        try:
+            start_time = time.time()
+            stream = MapReduceStream(self.CHAIN_OPERATIONS)
+            batches = 0
+            for chunk in request_iterator:
+                if not batches:
+                    MergeSortService.validate_top_k(chunk.top_k)
+                relay.send(chunk)
+                stream.add(request_batch(chunk))
+                batches += 1
+        except ValueError as e:
+            print(f"[MapReduce Service] ✗ Invalid request: {e}", flush=True)
+            relay.cancel()
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return
+        except Exception as e:
+            print(f"[MapReduce Service] ✗ Error: {e}", flush=True)
+            relay.cancel()
+            context.set_code(grpc.StatusCode.INTERNAL)
+            return
+        relay.close()
+        
+        cgpa_result = stream.results()
+        receive_time = time.time() - start_time
+        print(f"[MapReduce] Results: {cgpa_result['cgpa_classification']}", flush=True)
+        print(f"[MapReduce] Grade counts: {cgpa_result['grade_counts']}", flush=True)
+        print(f"[MapReduce] Processed {stream.count} students in {batches} batches", flush=True)
+        print(f"[MapReduce] Processing time: {cgpa_result['processing_time']:.4f} seconds "
+              f"(stream received in {receive_time:.4f}s)", flush=True)
+        
+        # This stage's fragment goes out first, downstream fragments follow as they complete
+        fragment = student_service_pb2.CombinedResponse()
+        self.add_results(fragment, cgpa_result)
+        fragment.mapreduce_time = cgpa_result['processing_time']
+        print(f"[MapReduce Service] ✓ CGPA Classification completed in {fragment.mapreduce_time:.4f}s", flush=True)
+        yield fragment
+        yield from relay.responses()
+        if relay.failure:
+            # The results above are incomplete; say why instead of ending the call as OK
+            context.set_code(relay.failure[0])
+            context.set_details(relay.failure[1])
+    
+    def ProcessChainStream(self, request_iterator, context):
+        """Pipeline the streamed upload through the chain and return the combined results"""
+        combined = student_service_pb2.CombinedResponse()
+        for fragment in self.ProcessChainPipeline(request_iterator, context):
+            combined.MergeFrom(fragment)
+        combined.total_workflow_time = combined.mapreduce_time + combined.mergesort_time + combined.statistics_time
+        return combined
 
 def serve():
     """Start MapReduce Service"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    student_service_pb2_grpc.add_StudentAnalysisServiceServicer_to_server(
-        MapReduceServiceHandler(), server
-    )
+    handler = MapReduceServiceHandler()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=server_options())
+    student_service_pb2_grpc.add_StudentAnalysisServiceServicer_to_server(handler, server)
+    
+    # Connect to the next service before accepting requests
+    ready = handler.pool.warm()
+    print(f"[MapReduce Service] {ready}/{handler.pool.size} channels to MergeSort Service ready", flush=True)
     
     port = os.getenv('MAPREDUCE_PORT', '50051')
     mergesort_addr = os.getenv('MERGESORT_ADDRESS', 'localhost:50053')
@@ -18,7 +18,13 @@ sys.path.insert(0, os.path.join(current_dir, 'generated'))
 
 import student_service_pb2
 import student_service_pb2_grpc
+from chain_relay import ChainRelay
+from channel_pool import ChannelPool, server_options
 from services.mergesort_service import MergeSortService
+from services.ranking_index import RankingIndex
+from services.result_cache import ResultCache
+from services.student_batch import StudentBatch
+from wire_format import add_sorted, forward_request, is_columnar, request_batch, request_size
 
 
 class MergeSortServiceHandler(student_service_pb2_grpc.StudentAnalysisServiceServicer):
@@ -26,35 +32,131 @@ class MergeSortServiceHandler(student_service_pb2_grpc.StudentAnalysisServiceSer
     
     def __init__(self):
         self.next_service = os.getenv('STATISTICS_ADDRESS', 'localhost:50055')
+        self.cache = ResultCache()
+        self.pool = ChannelPool(self.next_service)  # Persistent channels, warmed in serve()
+        self.index = RankingIndex()
         print(f"[MergeSort Service] Initialized. Next service: {self.next_service}", flush=True)
     
+    def PerformMergeSort(self, request, context):
+        """Sort students by CGPA or grade, optionally returning only the top K"""
+        start_time = time.time()
+        key = ResultCache.message_digest(request, 'PerformMergeSort')
+        cached = self.cache.get(key)
+        if cached is not None:
+            response = student_service_pb2.MergeSortResponse()
+            response.CopyFrom(cached)
+            response.processing_time = time.time() - start_time
+            return response
+        
+        try:
+            students = request_batch(request)
+            result = MergeSortService.perform_sort(
+                students, top_k=request.top_k or None, sort_by=request.sort_by or "cgpa"
+            )
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return student_service_pb2.MergeSortResponse()
+        
+        response = student_service_pb2.MergeSortResponse(
+            processing_time=result['processing_time'],
+            total_count=result['total_count']
+        )
+        add_sorted(response.sorted_students, response.sorted_columns, students, result['order'],
+                   None if is_columnar(request) else request.students)
+        self.cache.put(key, response)
+        return response
+    
+    # Number of top students returned by ApplyMergeSortDeltas when top_k is 0
+    DEFAULT_TOP_K = 10
+    
+    def ApplyMergeSortDeltas(self, request, context):
+        """Apply insert/update/delete deltas to the ranking index and return the top K"""
+        start_time = time.time()
+        try:
+            top_k = MergeSortService.validate_top_k(request.top_k) or self.DEFAULT_TOP_K
+            if request.reset:
+                self.index.reset()
+            applied = self.index.apply_deltas((delta.operation, delta.student) for delta in request.deltas)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return student_service_pb2.MergeSortResponse()
+        
+        result = self.index.results(top_k)
+        response = student_service_pb2.MergeSortResponse(total_count=result['total_count'])
+        for record in result['top_students']:
+            response.sorted_students.add(**record._asdict())
+        response.processing_time = time.time() - start_time
+        print(f"[MergeSort] Applied {applied} deltas ({result['total_count']} students ranked)", flush=True)
+        return response
+    
+    def GetRanks(self, request, context):
+        """Look up the current CGPA rank of students in the ranking index"""
+        response = student_service_pb2.RankResponse(total_count=len(self.index))
+        try:
+            for student_id in request.student_ids:
+                rank, cgpa = self.index.lookup(student_id)
+                response.ranks.add(student_id=student_id, rank=rank, cgpa=cgpa)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(str(e))
+            return student_service_pb2.RankResponse()
+        return response
+    
+    def chain_results(self, batch, top_k=0, students=None):
+        """
+        Compute this stage's chain results as a CombinedResponse fragment
+        
+        Args:
+            batch: StudentBatch to sort
+            top_k: Number of top students to return (0 = full sort)
+            students: Student messages of the batch (sorted results reference them);
+                      None for a columnar chain, which returns packed columns
+        """
+        cgpa_result = MergeSortService.perform_multi_sort(batch, top_k=top_k or None)
+        
+        sorted_students = cgpa_result['sorted_by_cgpa']
+        print(f"[MergeSort] Sorted {cgpa_result['total_count']} students", flush=True)
+        if top_k:
+            print(f"[MergeSort] Returning top {len(sorted_students)} students", flush=True)
+        if sorted_students:
+            top_student = sorted_students[0]
+            print(f"[MergeSort] Top student: {top_student.name} (CGPA: {top_student.cgpa:.2f})", flush=True)
+        
+        # MergeSort Service results (CGPA and Grade sort)
+        fragment = student_service_pb2.CombinedResponse()
+        add_sorted(fragment.sorted_by_cgpa, fragment.sorted_by_cgpa_columns, batch, cgpa_result['cgpa_order'], students)
+        add_sorted(fragment.sorted_by_grade, fragment.sorted_by_grade_columns, batch, cgpa_result['grade_order'], students)
+        fragment.sorted_count = cgpa_result['total_count']
+        return fragment
+    
     def ProcessChain(self, request, context):
-        """Process CGPA sort, forward chain to Statistics Service"""
+        """Process CGPA and grade sort, forward chain to Statistics Service"""
         print(f"[MergeSort Service] Received from MapReduce Service", flush=True)
-        print(f"[MergeSort Service] Processing {len(request.students)} students...", flush=True)
-        print(f"[MergeSort Service] Performing MergeSort by CGPA...", flush=True)
+        print(f"[MergeSort Service] Processing {request_size(request)} students...", flush=True)
+        print(f"[MergeSort Service] Performing MergeSort by CGPA and Grade...", flush=True)
         
         try:
-            # Sort by CGPA
-            print(f"[MergeSort] Sort by CGPA", flush=True)
+            # Sort by CGPA and by Grade from one set of extracted keys
+            print(f"[MergeSort] Sort by CGPA + Grade", flush=True)
             start_time = time.time()
-            cgpa_result = MergeSortService.perform_sort(list(request.students))
+            # Repeat payloads are served from the content-addressed cache
+            key = ResultCache.message_digest(request, 'ProcessChain', exclude=('partial_results',))
+            fragment, hit = self.cache.get_or_compute(key, lambda: self.chain_results(
+                request_batch(request), request.top_k, None if is_columnar(request) else request.students))
             processing_time = time.time() - start_time
             
-            sorted_students = cgpa_result['sorted_students']
-            print(f"[MergeSort] Sorted {len(sorted_students)} students", flush=True)
-            if sorted_students:
-                top_student = sorted_students[0]
-                print(f"[MergeSort] Top student: {top_student.name} (CGPA: {top_student.cgpa:.2f})", flush=True)
+            if hit:
+                print(f"[MergeSort] Cache hit {self.cache.stats()}", flush=True)
             print(f"[MergeSort] Processing time: {processing_time:.4f} seconds", flush=True)
             
             # Get accumulated results from MapReduce Service
             combined = student_service_pb2.CombinedResponse()
             combined.CopyFrom(request.partial_results)
             
-            # Add MergeSort Service results (CGPA sort only)
-            for student in sorted_students:
-                combined.sorted_by_cgpa.append(student)
+            # Add MergeSort Service results (CGPA and Grade sort)
+            combined.MergeFrom(fragment)
             
             combined.mergesort_time = processing_time
             
@@ -63,17 +165,12 @@ class MergeSortServiceHandler(student_service_pb2_grpc.StudentAnalysisServiceSer
             
             # Forward to Statistics Service
             try:
-                channel = grpc.insecure_channel(self.next_service)
-                stub = student_service_pb2_grpc.StudentAnalysisServiceStub(channel)
+                stub = self.pool.stub()
                 
-                next_request = student_service_pb2.ChainRequest(
-                    students=request.students,
-                    partial_results=combined
-                )
+                next_request = forward_request(request, combined)
                 
                 # Wait for combined results from Statistics Service
                 final_response = stub.ProcessChain(next_request, timeout=60)
-                channel.close()
                 
                 return final_response
                 
@@ -81,18 +178,75 @@ class MergeSortServiceHandler(student_service_pb2_grpc.StudentAnalysisServiceSer
                 print(f"[MergeSort Service] ✗ Failed to forward to Statistics Service: {e}", flush=True)
                 return combined
             
+        except ValueError as e:
+            print(f"[MergeSort Service] ✗ Invalid request: {e}", flush=True)
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return student_service_pb2.CombinedResponse()
         except Exception as e:
             print(f"[MergeSort Service] ✗ Error: {e}", flush=True)
             context.set_code(grpc.StatusCode.INTERNAL)
             return student_service_pb2.CombinedResponse()
 
+    
+    def ProcessChainPipeline(self, request_iterator, context):
+        """Forward student batches to Statistics Service as they arrive, buffering them for the sort"""
+        print(f"[MergeSort Service] Receiving student stream from MapReduce Service...", flush=True)
+        relay = ChainRelay(self.pool.stub(), 'MergeSort Service', 'Statistics Service', context.time_remaining())
+        
+        try:
+            start_time = time.time()
+            students = []
+            batches = []
+            top_k = None
+            columnar = False
+            for chunk in request_iterator:
+                relay.send(chunk)
+                if top_k is None:
+                    top_k = chunk.top_k
+                    columnar = is_columnar(chunk)
+                if not columnar:
+                    students.extend(chunk.students)
+                batches.append(request_batch(chunk))
+            relay.close()
+            
+            # Sorting needs the whole cohort; Statistics is already working on the forwarded stream
+            batch = StudentBatch.concat(batches)
+            print(f"[MergeSort] Sort by CGPA + Grade ({len(batch)} students, {len(batches)} batches)", flush=True)
+            sort_start = time.time()
+            fragment = self.chain_results(batch, top_k or 0, None if columnar else students)
+            fragment.mergesort_time = time.time() - sort_start
+        except ValueError as e:
+            print(f"[MergeSort Service] ✗ Invalid request: {e}", flush=True)
+            relay.cancel()
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return
+        except Exception as e:
+            print(f"[MergeSort Service] ✗ Error: {e}", flush=True)
+            relay.cancel()
+            context.set_code(grpc.StatusCode.INTERNAL)
+            return
+        
+        print(f"[MergeSort] Processing time: {fragment.mergesort_time:.4f} seconds "
+              f"(stream received in {sort_start - start_time:.4f}s)", flush=True)
+        print(f"[MergeSort Service] Sort completed in {fragment.mergesort_time:.4f}s", flush=True)
+        yield fragment
+        yield from relay.responses()
+        if relay.failure:
+            # The results above are incomplete; say why instead of ending the call as OK
+            context.set_code(relay.failure[0])
+            context.set_details(relay.failure[1])
 
 def serve():
     """Start MergeSort Service"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    student_service_pb2_grpc.add_StudentAnalysisServiceServicer_to_server(
-        MergeSortServiceHandler(), server
-    )
+    handler = MergeSortServiceHandler()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=server_options())
+    student_service_pb2_grpc.add_StudentAnalysisServiceServicer_to_server(handler, server)
+    
+    # Connect to the next service before accepting requests
+    ready = handler.pool.warm()
+    print(f"[MergeSort Service] {ready}/{handler.pool.size} channels to Statistics Service ready", flush=True)
     
     port = os.getenv('MERGESORT_PORT', '50053')
     statistics_addr = os.getenv('STATISTICS_ADDRESS', 'localhost:50055')
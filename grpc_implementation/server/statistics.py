@@ -18,31 +18,141 @@ sys.path.insert(0, os.path.join(current_dir, 'generated'))
 
 import student_service_pb2
 import student_service_pb2_grpc
-from services.stats_service import StatsService
+from channel_pool import server_options
+from services.incremental_aggregates import IncrementalStats
+from services.result_cache import ResultCache
+from services.stats_service import StatsService, StatsStream
+from wire_format import request_batch, request_size
 
 
 class StatisticsServiceHandler(student_service_pb2_grpc.StudentAnalysisServiceServicer):
     """Statistics Service: Performs statistical analysis (FINAL SERVICE)"""
     
     def __init__(self):
+        self.cache = ResultCache()
+        self.live = IncrementalStats()
         print(f"[Statistics Service] Initialized (Terminal Service)", flush=True)
     
+    @staticmethod
+    def fill_percentiles(message, faculty, values):
+        """Copy a {'p10': ..., 'p99': ...} dict into a Percentiles message"""
+        message.faculty = faculty
+        for name, value in values.items():
+            setattr(message, name, value)
+    
+    @staticmethod
+    def stats_response(result):
+        """Build a StatsResponse from a perform_analysis / IncrementalStats result"""
+        response = student_service_pb2.StatsResponse(
+            pass_rate=result['pass_rate'],
+            mean_cgpa=result['mean_cgpa'],
+            std_dev=result['std_dev'],
+            min_cgpa=result['min'],
+            max_cgpa=result['max'],
+            total_count=result['total_count']
+        )
+        for faculty_stat in result['faculty_stats']:
+            response.faculty_stats.add(**faculty_stat)
+        for grade_dist in result['grade_distribution']:
+            response.grade_distribution.add(**grade_dist)
+        percentiles = result.get('percentiles')
+        if percentiles:
+            StatisticsServiceHandler.fill_percentiles(response.overall_percentiles, '', percentiles['overall'])
+            for faculty, values in percentiles['by_faculty'].items():
+                StatisticsServiceHandler.fill_percentiles(response.faculty_percentiles.add(), faculty, values)
+        return response
+    
+    def PerformStatisticalAnalysis(self, request, context):
+        """Run the requested analysis ("all" when empty), including CGPA percentiles"""
+        start_time = time.time()
+        key = ResultCache.message_digest(request, 'PerformStatisticalAnalysis')
+        cached = self.cache.get(key)
+        if cached is not None:
+            response = student_service_pb2.StatsResponse()
+            response.CopyFrom(cached)
+            response.processing_time = time.time() - start_time
+            return response
+        
+        try:
+            students = request_batch(request)
+            result = StatsService.perform_analysis(students, request.analysis_type or "all")
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return student_service_pb2.StatsResponse()
+        
+        response = self.stats_response(result)
+        response.processing_time = result['processing_time']
+        self.cache.put(key, response)
+        return response
+    
+    def ApplyStatisticsDeltas(self, request, context):
+        """Apply insert/update/delete deltas to the live cohort and return its statistics"""
+        start_time = time.time()
+        if request.reset:
+            self.live.reset()
+        try:
+            applied = self.live.apply_deltas((delta.operation, delta.student) for delta in request.deltas)
+        except ValueError as e:
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return student_service_pb2.StatsResponse()
+        
+        result = self.live.results()
+        response = self.stats_response(result)
+        response.processing_time = time.time() - start_time
+        print(f"[Statistics] Applied {applied} deltas ({result['total_count']} students live)", flush=True)
+        return response
+    
+    def chain_results(self, batch):
+        """Compute this stage's chain results for a StudentBatch as a CombinedResponse fragment"""
+        return self.chain_fragment(StatsService.perform_analysis(batch, "all"))
+    
+    def chain_fragment(self, result):
+        """Build this stage's CombinedResponse fragment from a perform_analysis / StatsStream result"""
+        # Mean CGPA comes from the same fused scan
+        print(f"[Statistics] Mean CGPA: {result['mean_cgpa']:.4f}", flush=True)
+        
+        fragment = student_service_pb2.CombinedResponse()
+        fragment.pass_rate = result['pass_rate']
+        fragment.mean_cgpa = result['mean_cgpa']
+        
+        for faculty_stat in result['faculty_stats']:
+            stat = fragment.faculty_stats.add()
+            stat.faculty = faculty_stat['faculty']
+            stat.average_cgpa = faculty_stat['average_cgpa']
+            stat.student_count = faculty_stat['student_count']
+        
+        for grade_dist in result['grade_distribution']:
+            dist = fragment.grade_distribution.add()
+            dist.grade = grade_dist['grade']
+            dist.count = grade_dist['count']
+            dist.percentage = grade_dist['percentage']
+        
+        percentiles = result['percentiles']
+        self.fill_percentiles(fragment.overall_percentiles, '', percentiles['overall'])
+        for faculty, values in percentiles['by_faculty'].items():
+            self.fill_percentiles(fragment.faculty_percentiles.add(), faculty, values)
+        fragment.percentiles_exact = percentiles['exact']
+        return fragment
+    
     def ProcessChain(self, request, context):
         """Process statistics and return FINAL combined results"""
         print(f"[Statistics Service] Received from MergeSort Service", flush=True)
-        print(f"[Statistics Service] Processing {len(request.students)} students...", flush=True)
+        print(f"[Statistics Service] Processing {request_size(request)} students...", flush=True)
         
         try:
             print(f"[Statistics] Comprehensive analysis", flush=True)
             start_time = time.time()
-            result = StatsService.perform_analysis(list(request.students), "all")
+            # Repeat payloads are served from the content-addressed cache
+            key = ResultCache.message_digest(request, 'ProcessChain', exclude=('partial_results',))
+            fragment, hit = self.cache.get_or_compute(
+                key, lambda: self.chain_results(request_batch(request)))
             processing_time = time.time() - start_time
             
-            # Calculate mean CGPA
-            mean_cgpa = sum(s.cgpa for s in request.students) / len(request.students) if request.students else 0.0
-            
-            print(f"[Statistics] Analyzed {len(request.students)} students", flush=True)
-            print(f"[Statistics] Mean CGPA: {mean_cgpa:.4f}", flush=True)
+            if hit:
+                print(f"[Statistics] Cache hit {self.cache.stats()}", flush=True)
+            print(f"[Statistics] Analyzed {request_size(request)} students", flush=True)
             print(f"[Statistics] Processing time: {processing_time:.4f} seconds", flush=True)
             
             # Get accumulated results from MapReduce, MergeSort Services
@@ -50,22 +160,9 @@ class StatisticsServiceHandler(student_service_pb2_grpc.StudentAnalysisServiceSe
             combined.CopyFrom(request.partial_results)
             
             # Add Statistics Service results (FINAL)
-            combined.pass_rate = result['pass_rate']
-            combined.mean_cgpa = mean_cgpa
+            combined.MergeFrom(fragment)
             combined.statistics_time = processing_time
             
-            for faculty_stat in result['faculty_stats']:
-                stat = combined.faculty_stats.add()
-                stat.faculty = faculty_stat['faculty']
-                stat.average_cgpa = faculty_stat['average_cgpa']
-                stat.student_count = faculty_stat['student_count']
-            
-            for grade_dist in result['grade_distribution']:
-                dist = combined.grade_distribution.add()
-                dist.grade = grade_dist['grade']
-                dist.count = grade_dist['count']
-                dist.percentage = grade_dist['percentage']
-            
             # Calculate total workflow time
             combined.total_workflow_time = (
                 combined.mapreduce_time + 
@@ -80,18 +177,50 @@ class StatisticsServiceHandler(student_service_pb2_grpc.StudentAnalysisServiceSe
             
             return combined
             
+        except ValueError as e:
+            print(f"[Statistics Service] ✗ Invalid request: {e}", flush=True)
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+            return student_service_pb2.CombinedResponse()
         except Exception as e:
             print(f"[Statistics Service] ✗ Error: {e}", flush=True)
             context.set_code(grpc.StatusCode.INTERNAL)
             return student_service_pb2.CombinedResponse()
 
+    
+    def ProcessChainPipeline(self, request_iterator, context):
+        """Fold student batches into the running statistics as they stream in, report at end-of-stream"""
+        print(f"[Statistics Service] Receiving student stream from MergeSort Service...", flush=True)
+        
+        try:
+            start_time = time.time()
+            stream = StatsStream()
+            batches = 0
+            for chunk in request_iterator:
+                stream.add(request_batch(chunk))
+                batches += 1
+            print(f"[Statistics] Comprehensive analysis of {stream.count} students ({batches} batches)", flush=True)
+            
+            analysis_start = time.time()
+            fragment = self.chain_fragment(stream.results())
+            fragment.statistics_time = stream.processing_time + time.time() - analysis_start
+            print(f"[Statistics] Processing time: {fragment.statistics_time:.4f} seconds "
+                  f"(stream received in {analysis_start - start_time:.4f}s)", flush=True)
+            print(f"[Statistics Service] Returning results upstream...", flush=True)
+            yield fragment
+        except ValueError as e:
+            print(f"[Statistics Service] ✗ Invalid request: {e}", flush=True)
+            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
+            context.set_details(str(e))
+        except Exception as e:
+            print(f"[Statistics Service] ✗ Error: {e}", flush=True)
+            context.set_code(grpc.StatusCode.INTERNAL)
 
 def serve():
     """Start Statistics Service"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    student_service_pb2_grpc.add_StudentAnalysisServiceServicer_to_server(
-        StatisticsServiceHandler(), server
-    )
+    handler = StatisticsServiceHandler()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=server_options())
+    student_service_pb2_grpc.add_StudentAnalysisServiceServicer_to_server(handler, server)
     
     port = os.getenv('STATISTICS_PORT', '50055')
     server.add_insecure_port(f'0.0.0.0:{port}')
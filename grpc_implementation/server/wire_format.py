@@ -0,0 +1,54 @@
+"""
+Wire Format
+Reads and writes the students of a request as repeated Student messages or packed StudentColumns
+"""
+
+import student_service_pb2
+from services.columnar_dataset import pack_columns, unpack_columns
+from services.student_batch import StudentBatch
+
+
+def is_columnar(request):
+    """True if the request carries its students as packed columns"""
+    return request.HasField('columns')
+
+
+def request_batch(request):
+    """Decode the students of a request into a StudentBatch (either wire format)"""
+    if is_columnar(request):
+        return unpack_columns(request.columns)
+    return StudentBatch.from_students(request.students)
+
+
+def request_size(request):
+    """Number of students in a request without decoding them"""
+    if is_columnar(request):
+        return len(request.columns.cgpa) // 8
+    return len(request.students)
+
+
+def add_sorted(messages, columns, batch, order, students=None):
+    """
+    Write sorted rows in the format of the request
+
+    Args:
+        messages: Repeated Student field (used when students is given)
+        columns: StudentColumns field (used for a columnar request)
+        batch: StudentBatch of the request
+        order: Row positions in sorted order
+        students: Student messages of a non-columnar request
+    """
+    if students is None:
+        pack_columns(batch.take(order), columns)
+    else:
+        messages.extend(students[i] for i in order.tolist())
+
+
+def forward_request(request, partial_results, top_k=0):
+    """ChainRequest carrying the request's students, in the same format, to the next service"""
+    next_request = student_service_pb2.ChainRequest(partial_results=partial_results, top_k=top_k)
+    if is_columnar(request):
+        next_request.columns.CopyFrom(request.columns)
+    else:
+        next_request.students.extend(request.students)
+    return next_request
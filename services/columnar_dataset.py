@@ -0,0 +1,364 @@
+"""
+Columnar Dataset
+Compact binary on-disk student cohort, loaded through mmap as zero-copy NumPy views
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+from services.student_batch import StudentBatch
+
+
+# File layout:
+#   magic | column sections (each aligned to SECTION_ALIGNMENT bytes) |
+#   JSON footer | footer length (uint64) | magic
+# The footer holds the row count, every section's offset / dtype / length
+# and the faculty and grade string tables. Numeric sections are raw
+# little-endian arrays; student IDs and names are UTF-8 blobs indexed by
+# int64 offset arrays (rows + 1 entries).
+DATASET_MAGIC = b'STUCOL01'
+FOOTER_TAIL = struct.Struct('<Q8s')
+SECTION_ALIGNMENT = 64
+
+# Suffix used for converted datasets
+DATASET_SUFFIX = '.stcol'
+
+# Sections written for every dataset: name -> dtype
+SECTIONS = {
+    'cgpa': '<f8',
+    'faculty_codes': '<i4',
+    'grade_codes': '<i4',
+    'student_id_offsets': '<i8',
+    'student_id_data': '|u1',
+    'name_offsets': '<i8',
+    'name_data': '|u1',
+}
+
+
+def is_dataset(path):
+    """True if path is a columnar dataset file (checked by its magic bytes)"""
+    try:
+        with open(path, 'rb') as file:
+            return file.read(len(DATASET_MAGIC)) == DATASET_MAGIC
+    except OSError:
+        return False
+
+
+class StringColumn:
+    """
+    Read-only sequence of strings stored as a UTF-8 blob plus offsets
+
+    Values are decoded on access, so opening a dataset never materializes
+    its student IDs or names. Pickles as a plain list.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def _decode(self, start, stop):
+        """Decode rows start..stop with a single copy of their bytes"""
+        offsets = self.offsets[start:stop + 1].tolist()
+        if len(offsets) < 2:
+            return []
+        base = offsets[0]
+        data = self.data[base:offsets[-1]].tobytes()
+        return [data[begin - base:end - base].decode('utf-8') for begin, end in zip(offsets, offsets[1:])]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._decode(start, stop)
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('string column index out of range')
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return self.data[start:stop].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return iter(self._decode(0, len(self)))
+
+    def take(self, indices):
+        """
+        Select rows by position without decoding them
+
+        Args:
+            indices: Integer array of row positions
+
+        Returns:
+            StringColumn over a gathered copy of the selected bytes
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        starts = np.asarray(self.offsets[indices], dtype=np.int64)
+        lengths = np.asarray(self.offsets[indices + 1], dtype=np.int64) - starts
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Byte i of the output comes from its row's start plus its position within the row
+        positions = np.arange(offsets[-1], dtype=np.int64) + np.repeat(starts - offsets[:-1], lengths)
+        return StringColumn(offsets, np.asarray(self.data)[positions])
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+
+def encode_strings(values):
+    """
+    Encode a string column as a UTF-8 blob plus int64 offsets (rows + 1 entries, from 0)
+
+    A StringColumn is re-based without decoding; ASCII columns (the common
+    case) take their byte lengths from the string lengths.
+
+    Returns:
+        Tuple of (offsets array, data bytes)
+    """
+    if isinstance(values, StringColumn):
+        offsets = np.asarray(values.offsets, dtype=np.int64)
+        return offsets - offsets[0], values.data[offsets[0]:offsets[-1]].tobytes()
+    values = list(map(str, values))
+    text = ''.join(values)
+    data = text.encode('utf-8')
+    if len(data) == len(text):
+        lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    else:
+        lengths = np.fromiter((len(value.encode('utf-8')) for value in values), dtype=np.int64, count=len(values))
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets, data
+
+
+def _decode_strings(offsets, data, rows):
+    """StringColumn over encoded offsets / data bytes, validating the offsets"""
+    offsets = np.frombuffer(offsets, dtype='<i4')
+    if len(offsets) != rows + 1:
+        raise ValueError("Packed string column has the wrong number of offsets")
+    if offsets[0] != 0 or offsets[-1] != len(data) or np.any(np.diff(offsets) < 0):
+        raise ValueError("Packed string column offsets are out of range")
+    data = np.frombuffer(data, dtype=np.uint8)
+    # Valid UTF-8 with every value starting on a character boundary (not a
+    # continuation byte) means every value decodes, so lazy reads never fail
+    starts = offsets[:-1][offsets[:-1] < len(data)]
+    try:
+        data.tobytes().decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError("Packed string column is not valid UTF-8") from None
+    if np.any(data[starts] & 0xC0 == 0x80):
+        raise ValueError("Packed string column offsets split a UTF-8 character")
+    return StringColumn(offsets, data)
+
+
+def _pack_strings(values):
+    """Offsets bytes (int32, as a message stays far below 2 GiB) and data bytes of a string column"""
+    offsets, data = encode_strings(values)
+    if len(data) > np.iinfo(np.int32).max:
+        raise ValueError("String column too large for a StudentColumns message")
+    return offsets.astype('<i4').tobytes(), data
+
+
+def pack_columns(batch, columns):
+    """
+    Fill a StudentColumns message from a StudentBatch (dataset section layout, int32 string offsets)
+
+    Args:
+        batch: StudentBatch to send
+        columns: Empty StudentColumns message
+
+    Returns:
+        The filled message
+    """
+    columns.cgpa = batch.cgpa.astype('<f8', copy=False).tobytes()
+    columns.faculty_codes = batch.faculty_codes.astype('<i4', copy=False).tobytes()
+    columns.faculty_table.extend(batch.faculty_table)
+    columns.grade_codes = batch.grade_codes.astype('<i4', copy=False).tobytes()
+    columns.grade_table.extend(batch.grade_table)
+    columns.student_id_offsets, columns.student_id_data = _pack_strings(batch.student_ids)
+    columns.name_offsets, columns.name_data = _pack_strings(batch.names)
+    return columns
+
+
+def unpack_columns(columns):
+    """
+    StudentBatch over a StudentColumns message without copying
+
+    CGPA and code columns are NumPy views of the message bytes and student
+    IDs / names are decoded lazily, like open_dataset.
+
+    Raises:
+        ValueError: If column lengths differ, a code is outside its string
+                    table or a string column is not valid UTF-8
+    """
+    cgpa = np.frombuffer(columns.cgpa, dtype='<f8')
+    rows = len(cgpa)
+    codes = {}
+    for column, table in (('faculty', columns.faculty_table), ('grade', columns.grade_table)):
+        codes[column] = np.frombuffer(getattr(columns, column + '_codes'), dtype='<i4')
+        if len(codes[column]) != rows:
+            raise ValueError(f"Packed {column} codes do not match the number of students")
+        if rows and (codes[column].min() < 0 or codes[column].max() >= len(table)):
+            raise ValueError(f"Packed {column} code outside its string table")
+    return StudentBatch(
+        _decode_strings(columns.student_id_offsets, columns.student_id_data, rows),
+        _decode_strings(columns.name_offsets, columns.name_data, rows),
+        cgpa,
+        codes['faculty'], columns.faculty_table,
+        codes['grade'], columns.grade_table
+    )
+
+
+class _SectionWriter:
+    """Spools one section to a temporary file while chunks stream in"""
+
+    def __init__(self, directory):
+        self.file = tempfile.TemporaryFile(dir=directory)
+        self.length = 0
+
+    def write(self, array):
+        data = np.ascontiguousarray(array).tobytes()
+        self.file.write(data)
+        self.length += len(data)
+
+
+def write_dataset(batches, path):
+    """
+    Write StudentBatch chunks as one columnar dataset
+
+    Chunks are streamed: each section is spooled to a temporary file next to
+    path and the sections are then copied into place, so only one chunk is
+    in memory at a time. Faculty / grade codes are remapped into a single
+    table per column (first-appearance order across chunks).
+
+    Args:
+        batches: Iterable of StudentBatch (e.g. csv_loader.iter_batches)
+        path: Output file path
+
+    Returns:
+        Number of rows written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    writers = {name: _SectionWriter(directory) for name in SECTIONS}
+    lookups = {'faculty': {}, 'grade': {}}
+    rows = 0
+    text_lengths = {'student_id': 0, 'name': 0}
+    writers['student_id_offsets'].write(np.zeros(1, dtype='<i8'))
+    writers['name_offsets'].write(np.zeros(1, dtype='<i8'))
+    try:
+        for batch in batches:
+            writers['cgpa'].write(batch.cgpa.astype('<f8', copy=False))
+            for column, codes, table in (('faculty', batch.faculty_codes, batch.faculty_table),
+                                         ('grade', batch.grade_codes, batch.grade_table)):
+                lookup = lookups[column]
+                remap = np.array([lookup.setdefault(value, len(lookup)) for value in table], dtype='<i4')
+                writers[column + '_codes'].write(remap[codes] if len(remap) else codes.astype('<i4'))
+            for column, values in (('student_id', batch.student_ids), ('name', batch.names)):
+                offsets, data = encode_strings(values)
+                writers[column + '_offsets'].write((text_lengths[column] + offsets[1:]).astype('<i8'))
+                writers[column + '_data'].write(np.frombuffer(data, dtype=np.uint8))
+                text_lengths[column] += len(data)
+            rows += len(batch)
+
+        sections = {}
+        with open(path, 'wb') as output:
+            output.write(DATASET_MAGIC)
+            for name, writer in writers.items():
+                output.write(b'\0' * (-output.tell() % SECTION_ALIGNMENT))
+                sections[name] = {'offset': output.tell(), 'dtype': SECTIONS[name], 'length': writer.length}
+                writer.file.seek(0)
+                shutil.copyfileobj(writer.file, output, 1 << 20)
+            footer = json.dumps({
+                'rows': rows,
+                'sections': sections,
+                'faculty_table': list(lookups['faculty']),
+                'grade_table': list(lookups['grade'])
+            }).encode('utf-8')
+            output.write(footer)
+            output.write(FOOTER_TAIL.pack(len(footer), DATASET_MAGIC))
+    finally:
+        for writer in writers.values():
+            writer.file.close()
+    return rows
+
+
+def convert_csv(csv_path, path=None, chunk_rows=None):
+    """
+    Convert a student CSV into a columnar dataset
+
+    Args:
+        csv_path: Source CSV
+        path: Output file (default: csv_path with DATASET_SUFFIX)
+        chunk_rows: CSV rows parsed per chunk
+
+    Returns:
+        Tuple of (output path, number of rows)
+    """
+    from services.csv_loader import iter_batches
+
+    path = path or os.path.splitext(csv_path)[0] + DATASET_SUFFIX
+    return path, write_dataset(iter_batches(csv_path, chunk_rows), path)
+
+
+def open_dataset(path):
+    """
+    Memory-map a columnar dataset as a StudentBatch
+
+    CGPA and code columns are NumPy views straight into the mapping and
+    student IDs / names are decoded lazily, so opening costs only the
+    footer parse. Pages are read on demand and shared through the OS page
+    cache by every process that maps the same file.
+
+    Raises:
+        ValueError: If the file is not a columnar dataset
+    """
+    with open(path, 'rb') as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mapping) < len(DATASET_MAGIC) + FOOTER_TAIL.size or mapping[:len(DATASET_MAGIC)] != DATASET_MAGIC:
+        raise ValueError(f"{path} is not a columnar student dataset")
+    footer_length, magic = FOOTER_TAIL.unpack_from(mapping, len(mapping) - FOOTER_TAIL.size)
+    if magic != DATASET_MAGIC:
+        raise ValueError(f"{path} is truncated (missing dataset footer)")
+    footer_start = len(mapping) - FOOTER_TAIL.size - footer_length
+    footer = json.loads(bytes(mapping[footer_start:footer_start + footer_length]).decode('utf-8'))
+
+    def section(name):
+        spec = footer['sections'][name]
+        dtype = np.dtype(spec['dtype'])
+        return np.frombuffer(mapping, dtype=dtype, count=spec['length'] // dtype.itemsize, offset=spec['offset'])
+
+    return StudentBatch(
+        StringColumn(section('student_id_offsets'), section('student_id_data')),
+        StringColumn(section('name_offsets'), section('name_data')),
+        section('cgpa'),
+        section('faculty_codes'), footer['faculty_table'],
+        section('grade_codes'), footer['grade_table']
+    )
+
+
+def iter_dataset_chunks(path, chunk_rows):
+    """
+    Column chunks of a dataset in the csv_loader chunk layout
+
+    Returns:
+        Generator of column dictionaries (string lists, cgpa as a float64 view)
+    """
+    batch = open_dataset(path)
+    faculty_table = np.array(batch.faculty_table, dtype=object)
+    grade_table = np.array(batch.grade_table, dtype=object)
+    for start in range(0, len(batch), chunk_rows):
+        stop = min(start + chunk_rows, len(batch))
+        yield {
+            'student_id': batch.student_ids[start:stop],
+            'name': batch.names[start:stop],
+            'faculty': faculty_table[batch.faculty_codes[start:stop]].tolist() if len(faculty_table) else [],
+            'cgpa': batch.cgpa[start:stop],
+            'grade': grade_table[batch.grade_codes[start:stop]].tolist() if len(grade_table) else []
+        }
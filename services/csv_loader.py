@@ -0,0 +1,154 @@
+"""
+CSV Loader
+Chunked, typed CSV ingestion into columnar batches, protobuf messages or dictionaries
+(columnar dataset files are accepted wherever a CSV path is)
+"""
+
+import csv
+import itertools
+import json
+import os
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+from services.columnar_dataset import is_dataset, iter_dataset_chunks, open_dataset
+from services.student_batch import StudentBatch
+
+
+# Columns of the student CSV, in file order
+CSV_COLUMNS = ('student_id', 'name', 'faculty', 'cgpa', 'grade')
+
+# Rows parsed per chunk
+CSV_CHUNK_ROWS = int(os.getenv('CSV_CHUNK_ROWS', '100000'))
+
+# Sidecar written next to a generated cohort (rows and generator seed)
+COHORT_INFO_SUFFIX = '.cohort.json'
+
+
+def _pandas_chunks(csv_path, chunk_rows):
+    """Column chunks through the pandas C parser"""
+    dtypes = {column: str for column in CSV_COLUMNS}
+    dtypes['cgpa'] = np.float64
+    reader = pd.read_csv(csv_path, usecols=list(CSV_COLUMNS), dtype=dtypes, chunksize=chunk_rows,
+                         keep_default_na=False, skipinitialspace=True, encoding='utf-8')
+    for frame in reader:
+        chunk = {column: frame[column].tolist() for column in CSV_COLUMNS if column != 'cgpa'}
+        chunk['cgpa'] = frame['cgpa'].to_numpy(dtype=np.float64)
+        yield chunk
+
+
+def _csv_chunks(csv_path, chunk_rows):
+    """Column chunks through the csv module (transposed with zip, no per-row dicts)"""
+    with open(csv_path, 'r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file, skipinitialspace=True)
+        header = [column.strip() for column in next(reader, [])]
+        missing = [column for column in CSV_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"CSV {csv_path} is missing column(s): {', '.join(missing)}")
+        positions = [header.index(column) for column in CSV_COLUMNS]
+        width = max(positions) + 1
+        while True:
+            rows = [row for row in itertools.islice(reader, chunk_rows) if len(row) >= width]
+            if not rows:
+                break
+            columns = list(zip(*rows))
+            chunk = {column: list(columns[position]) for column, position in zip(CSV_COLUMNS, positions)}
+            chunk['cgpa'] = np.asarray(chunk['cgpa'], dtype=np.float64)
+            yield chunk
+
+
+def iter_csv_chunks(csv_path, chunk_rows=None):
+    """
+    Parse a student CSV chunk by chunk
+
+    Uses pandas when it is installed and the csv module otherwise; either
+    way only one chunk of rows is held in memory at a time. A columnar
+    dataset (see columnar_dataset) is sliced from its memory mapping instead.
+
+    Args:
+        csv_path: Path to a CSV with student_id, name, faculty, cgpa, grade columns
+        chunk_rows: Rows per chunk (CSV_CHUNK_ROWS, default: 100000)
+
+    Returns:
+        Generator of column dictionaries (string lists, cgpa as a float64 array)
+    """
+    chunk_rows = chunk_rows or CSV_CHUNK_ROWS
+    if is_dataset(csv_path):
+        return iter_dataset_chunks(csv_path, chunk_rows)
+    if pd is not None:
+        return _pandas_chunks(csv_path, chunk_rows)
+    return _csv_chunks(csv_path, chunk_rows)
+
+
+def iter_batches(csv_path, chunk_rows=None):
+    """Parse a student CSV into one StudentBatch per chunk"""
+    for chunk in iter_csv_chunks(csv_path, chunk_rows):
+        yield StudentBatch.from_columns(chunk['student_id'], chunk['name'], chunk['faculty'],
+                                        chunk['cgpa'], chunk['grade'])
+
+
+def load_batch(csv_path, chunk_rows=None):
+    """Parse a whole student CSV into a single StudentBatch (memory-mapped for a columnar dataset)"""
+    if is_dataset(csv_path):
+        return open_dataset(csv_path)
+    return StudentBatch.concat(iter_batches(csv_path, chunk_rows))
+
+
+def iter_proto_batches(csv_path, student_cls, chunk_rows=None):
+    """
+    Parse a student CSV into lists of protobuf Student messages
+
+    Args:
+        csv_path: Path to the student CSV
+        student_cls: Generated Student message class
+        chunk_rows: Rows per chunk
+
+    Returns:
+        Generator of message lists, one per chunk, ready to send while the
+        next chunk is parsed
+    """
+    for chunk in iter_csv_chunks(csv_path, chunk_rows):
+        yield [
+            student_cls(student_id=student_id, name=name, faculty=faculty, cgpa=cgpa, grade=grade)
+            for student_id, name, faculty, cgpa, grade in zip(
+                chunk['student_id'], chunk['name'], chunk['faculty'], chunk['cgpa'].tolist(), chunk['grade'])
+        ]
+
+
+def iter_dict_batches(csv_path, chunk_rows=None):
+    """Parse a student CSV into lists of XML-RPC student dictionaries, one per chunk"""
+    for chunk in iter_csv_chunks(csv_path, chunk_rows):
+        yield [
+            {'student_id': student_id, 'name': name, 'faculty': faculty, 'cgpa': cgpa, 'grade': grade}
+            for student_id, name, faculty, cgpa, grade in zip(
+                chunk['student_id'], chunk['name'], chunk['faculty'], chunk['cgpa'].tolist(), chunk['grade'])
+        ]
+
+
+def cohort_info(csv_path, rows=None):
+    """
+    Describe an input cohort for benchmark metrics
+
+    Args:
+        csv_path: CSV or columnar dataset the students were loaded from
+        rows: Number of students actually loaded (overrides the sidecar)
+
+    Returns:
+        Dictionary with path, rows and seed (None unless the file was written
+        by tools/generate_cohort.py, which records it in a sidecar file)
+    """
+    info = {'path': os.path.abspath(csv_path), 'rows': rows, 'seed': None}
+    try:
+        with open(csv_path + COHORT_INFO_SUFFIX, encoding='utf-8') as file:
+            sidecar = json.load(file)
+    except (OSError, ValueError):
+        sidecar = {}
+    info['seed'] = sidecar.get('seed')
+    if rows is None:
+        info['rows'] = sidecar.get('rows')
+    return info
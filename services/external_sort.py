@@ -0,0 +1,197 @@
+"""
+External Merge Sort
+Out-of-core ranking of cohorts larger than memory
+"""
+
+import csv
+import heapq
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+from services.student_batch import StudentRecord
+
+
+# Fixed part of a run record: CGPA (float64), input sequence number (uint64),
+# then the UTF-8 lengths of student_id, name, faculty and grade (uint32 each)
+RECORD_HEADER = struct.Struct('<dQIIII')
+
+# Longest encoded text field a run record can hold
+MAX_FIELD_BYTES = 0xFFFFFFFF
+
+
+def encode_record(record, sequence):
+    """Pack a student record into the compact binary run format"""
+    fields = [str(value).encode('utf-8') for value in
+              (record.student_id, record.name, record.faculty, record.grade)]
+    if any(len(field) > MAX_FIELD_BYTES for field in fields):
+        raise ValueError(f"Student {record.student_id!r} has a text field longer than {MAX_FIELD_BYTES} bytes")
+    header = RECORD_HEADER.pack(float(record.cgpa), sequence, *(len(field) for field in fields))
+    return header + b''.join(fields)
+
+
+def read_records(file):
+    """Yield (sequence, StudentRecord) pairs from a binary run file"""
+    while True:
+        header = file.read(RECORD_HEADER.size)
+        if not header:
+            return
+        cgpa, sequence, *lengths = RECORD_HEADER.unpack(header)
+        student_id, name, faculty, grade = (file.read(length).decode('utf-8') for length in lengths)
+        yield sequence, StudentRecord(student_id, name, faculty, cgpa, grade)
+
+
+class ExternalMergeSort:
+    """
+    Sorts a stream of student records by CGPA (descending, stable) within a
+    fixed memory budget
+
+    Records are buffered until the budget is reached, each buffer is sorted
+    and spilled to a temporary run file, and the runs are k-way merged as a
+    stream. Ties keep their input order, matching MergeSortService.merge().
+    At most max_runs run files are open at once: when there are more, groups
+    of max_runs are first merged into longer runs, pass by pass.
+    """
+
+    # Estimated in-memory cost of one buffered record (record + key + list slot)
+    RECORD_OVERHEAD = 200
+
+    def __init__(self, memory_budget=None, temp_dir=None, buffer_size=1 << 20, max_runs=None):
+        """
+        Args:
+            memory_budget: Bytes of records held in memory per run
+                           (EXTERNAL_SORT_MEMORY, default: 256 MB)
+            temp_dir: Directory for run files (default: system temp directory)
+            buffer_size: Read/write buffer per run file in bytes
+            max_runs: Most run files merged (and open) at once
+                      (EXTERNAL_SORT_MAX_RUNS, default: 64)
+        """
+        self.memory_budget = memory_budget or int(os.getenv('EXTERNAL_SORT_MEMORY', str(256 << 20)))
+        self.max_runs = max(2, max_runs or int(os.getenv('EXTERNAL_SORT_MAX_RUNS', '64')))
+        self.temp_dir = temp_dir
+        self.buffer_size = buffer_size
+        self.run_paths = []
+
+    def _record_cost(self, record):
+        return (self.RECORD_OVERHEAD + len(record.student_id) + len(record.name)
+                + len(record.faculty) + len(record.grade))
+
+    def _spill(self, buffer):
+        """Sort the buffered records and write them as one run file"""
+        cgpa = np.fromiter((record.cgpa for _, record in buffer), dtype=np.float64, count=len(buffer))
+        order = np.argsort(-cgpa, kind='stable')
+
+        self.run_paths.append(self._write_run(buffer[index] for index in order.tolist()))
+
+    def _write_run(self, entries):
+        """Write (sequence, record) pairs to a new run file and return its path"""
+        handle, path = tempfile.mkstemp(prefix='mergesort_run_', suffix='.bin', dir=self.temp_dir)
+        with os.fdopen(handle, 'wb', buffering=self.buffer_size) as file:
+            for sequence, record in entries:
+                file.write(encode_record(record, sequence))
+        return path
+
+    def _merge(self, paths):
+        """Stream (sequence, record) pairs of several run files in merged order"""
+        files = [open(path, 'rb', buffering=self.buffer_size) for path in paths]
+        try:
+            streams = [
+                ((-record.cgpa, sequence, record) for sequence, record in read_records(file))
+                for file in files
+            ]
+            for _, sequence, record in heapq.merge(*streams):
+                yield sequence, record
+        finally:
+            for file in files:
+                file.close()
+
+    def create_runs(self, records):
+        """
+        Split the input stream into sorted run files
+
+        Args:
+            records: Iterable of objects with student_id, name, faculty, cgpa, grade
+
+        Returns:
+            Number of records read
+        """
+        buffer = []
+        used = 0
+        count = 0
+        for record in records:
+            record = StudentRecord(str(record.student_id), str(record.name),
+                                   str(record.faculty or ''), float(record.cgpa), str(record.grade))
+            buffer.append((count, record))
+            count += 1
+            used += self._record_cost(record)
+            if used >= self.memory_budget:
+                self._spill(buffer)
+                buffer = []
+                used = 0
+        if buffer:
+            self._spill(buffer)
+        return count
+
+    def merge_pass(self):
+        """Merge the run files in groups of max_runs, replacing them with fewer, longer runs"""
+        merged = []
+        remaining = list(self.run_paths)
+        while remaining:
+            group, remaining = remaining[:self.max_runs], remaining[self.max_runs:]
+            if len(group) > 1:
+                path = self._write_run(self._merge(group))
+                for old_path in group:
+                    os.remove(old_path)
+                group = [path]
+            merged.extend(group)
+            # Every existing run file stays listed for cleanup()
+            self.run_paths = merged + remaining
+
+    def merge_runs(self):
+        """
+        K-way merge of all run files as a stream, after as many merge passes
+        as needed to get down to max_runs files
+
+        Yields:
+            StudentRecord in descending CGPA order
+        """
+        while len(self.run_paths) > self.max_runs:
+            self.merge_pass()
+        for _, record in self._merge(self.run_paths):
+            yield record
+
+    def cleanup(self):
+        """Delete the temporary run files"""
+        for path in self.run_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        self.run_paths = []
+
+    def sort(self, records):
+        """
+        Sort a record stream, yielding records in descending CGPA order
+        Run files are removed once the iterator is exhausted or closed
+        """
+        try:
+            self.create_runs(records)
+            yield from self.merge_runs()
+        finally:
+            self.cleanup()
+
+    def sort_to_file(self, records, output_path):
+        """
+        Sort a record stream into a CSV file (student_id,name,faculty,cgpa,grade)
+
+        Returns:
+            Number of records written
+        """
+        count = 0
+        with open(output_path, 'w', encoding='utf-8', newline='', buffering=self.buffer_size) as file:
+            writer = csv.writer(file)
+            writer.writerow(StudentRecord._fields)
+            for record in self.sort(records):
+                writer.writerow(record)
+                count += 1
+        return count
@@ -0,0 +1,212 @@
+"""
+Group-By Engine
+Vectorized grouped aggregation over integer-coded StudentBatch columns
+"""
+
+import numpy as np
+
+
+# CGPA categories, highest first
+CGPA_CATEGORIES = [
+    "A (3.68-4.00)", "A- (3.50-3.67)", "B+ (3.33-3.49)", "B (3.00-3.32)",
+    "B- (2.83-2.99)", "C+ (2.67-2.82)", "C (2.50-2.66)", "C- (2.33-2.49)",
+    "D+ (2.17-2.32)", "D (2.00-2.16)", "D- (1.67-1.99)", "F (0.00-1.66)"
+]
+
+# Lower CGPA bound of each category except F, ascending (D- ... A)
+CGPA_BOUNDARIES = np.array([1.67, 2.00, 2.17, 2.33, 2.50, 2.67, 2.83, 3.00, 3.33, 3.50, 3.68])
+
+# Aggregates GroupBy can compute over the CGPA column
+AGGREGATES = ('count', 'sum', 'mean', 'min', 'max', 'std')
+
+# Partial arrays each aggregate needs
+_REQUIRES = {
+    'count': ('count',),
+    'sum': ('count', 'sum'),
+    'mean': ('count', 'sum'),
+    'min': ('count', 'min'),
+    'max': ('count', 'max'),
+    'std': ('count', 'sum', 'm2'),
+}
+
+
+def cgpa_bucket_codes(cgpa):
+    """CGPA category code per value via boundary search (0 = A ... 11 = F)"""
+    return len(CGPA_BOUNDARIES) - np.searchsorted(CGPA_BOUNDARIES, cgpa, side='right')
+
+
+def key_column(batch, key):
+    """
+    Integer codes and value table of a group key
+
+    Args:
+        batch: StudentBatch
+        key: "faculty", "grade" or "cgpa_bucket"
+
+    Returns:
+        Tuple of (code array, table of key values)
+    """
+    if key == 'faculty':
+        return batch.faculty_codes, batch.faculty_table
+    if key == 'grade':
+        return batch.grade_codes, batch.grade_table
+    if key == 'cgpa_bucket':
+        return cgpa_bucket_codes(batch.cgpa), CGPA_CATEGORIES
+    raise ValueError(f"Unknown group key: {key} (expected faculty, grade or cgpa_bucket)")
+
+
+class GroupBy:
+    """
+    Grouped aggregation of CGPA by any combination of keys
+
+    Key columns are integer codes, so a multi-key group is one mixed-radix
+    code and every aggregate is a bincount (count, sum, sum of squared
+    deviations) or an unbuffered ufunc reduction (min, max) over the whole
+    column; no per-row Python runs. partial() results merge exactly across
+    chunks of the same batch (Chan update for the deviations), so the same
+    engine serves single-pass statistics and the chunked MapReduce jobs.
+    With no keys the whole batch is one group.
+    """
+
+    def __init__(self, keys=(), aggregates=('count',)):
+        """
+        Args:
+            keys: Sequence of group keys ("faculty", "grade", "cgpa_bucket")
+            aggregates: Sequence of aggregates from AGGREGATES
+        """
+        unknown = [aggregate for aggregate in aggregates if aggregate not in _REQUIRES]
+        if unknown:
+            raise ValueError(f"Unknown aggregate(s): {', '.join(unknown)} (expected {', '.join(AGGREGATES)})")
+        self.keys = tuple(keys)
+        self.aggregates = tuple(aggregates)
+        self.partials = {name for aggregate in aggregates for name in _REQUIRES[aggregate]} | {'count'}
+
+    def tables(self, batch):
+        """Value table of every key"""
+        return [key_column(batch, key)[1] for key in self.keys]
+
+    def group_codes(self, batch):
+        """
+        Mixed-radix group code per row
+
+        Returns:
+            Tuple of (int64 code array, number of possible groups)
+        """
+        codes = np.zeros(len(batch), dtype=np.int64)
+        size = 1
+        for key in self.keys:
+            key_codes, table = key_column(batch, key)
+            codes = codes * len(table) + key_codes
+            size *= len(table)
+        return codes, size
+
+    def partial(self, batch):
+        """
+        Per-group partial aggregates of a batch (or chunk)
+
+        Returns:
+            Dictionary of code-indexed NumPy arrays (count, and sum / m2 /
+            min / max as required by the aggregates)
+        """
+        codes, size = self.group_codes(batch)
+        values = batch.cgpa
+        count = np.bincount(codes, minlength=size)
+        result = {'count': count}
+        if 'sum' in self.partials:
+            result['sum'] = np.bincount(codes, weights=values, minlength=size)
+        if 'm2' in self.partials:
+            means = np.divide(result['sum'], count, out=np.zeros(size), where=count > 0)
+            deviations = values - means[codes]
+            result['m2'] = np.bincount(codes, weights=deviations * deviations, minlength=size)
+        if 'min' in self.partials:
+            result['min'] = np.full(size, np.inf)
+            np.minimum.at(result['min'], codes, values)
+        if 'max' in self.partials:
+            result['max'] = np.full(size, -np.inf)
+            np.maximum.at(result['max'], codes, values)
+        return result
+
+    @staticmethod
+    def merge(left, right):
+        """Combine two partials of the same grouping (e.g. two chunks)"""
+        count = left['count'] + right['count']
+        result = {'count': count}
+        if 'sum' in left:
+            result['sum'] = left['sum'] + right['sum']
+        if 'm2' in left:
+            left_mean = np.divide(left['sum'], left['count'], out=np.zeros(len(count)), where=left['count'] > 0)
+            right_mean = np.divide(right['sum'], right['count'], out=np.zeros(len(count)), where=right['count'] > 0)
+            delta = right_mean - left_mean
+            weight = np.divide(left['count'] * right['count'], count, out=np.zeros(len(count)), where=count > 0)
+            result['m2'] = left['m2'] + right['m2'] + delta * delta * weight
+        if 'min' in left:
+            result['min'] = np.minimum(left['min'], right['min'])
+        if 'max' in left:
+            result['max'] = np.maximum(left['max'], right['max'])
+        return result
+
+    def values(self, partial):
+        """
+        Final aggregate arrays, code-indexed (empty groups hold 0 / NaN)
+
+        Returns:
+            Dictionary of aggregate -> NumPy array
+        """
+        count = partial['count']
+        occupied = count > 0
+        result = {}
+        for aggregate in self.aggregates:
+            if aggregate == 'count':
+                result['count'] = count
+            elif aggregate == 'sum':
+                result['sum'] = partial['sum']
+            elif aggregate == 'mean':
+                result['mean'] = np.divide(partial['sum'], count, out=np.full(len(count), np.nan), where=occupied)
+            elif aggregate == 'std':
+                variance = np.divide(partial['m2'], count, out=np.full(len(count), np.nan), where=occupied)
+                result['std'] = np.sqrt(variance)
+            else:
+                result[aggregate] = partial[aggregate]
+        return result
+
+    def groups(self, partial, tables):
+        """
+        Decode a partial into per-group results, skipping empty groups
+
+        Args:
+            partial: Output of partial() / merge()
+            tables: Key value tables (see tables())
+
+        Returns:
+            List of (group, {aggregate: value}) pairs in code order; group is
+            the key value for one key, a tuple for several, None for no keys
+        """
+        values = self.values(partial)
+        occupied = np.flatnonzero(partial['count'])
+        if self.keys:
+            indices = np.unravel_index(occupied, [len(table) for table in tables])
+        result = []
+        for position, code in enumerate(occupied.tolist()):
+            group = tuple(table[index[position]] for table, index in zip(tables, indices)) if self.keys else None
+            if len(self.keys) == 1:
+                group = group[0]
+            row = {}
+            for aggregate, column in values.items():
+                value = column[code]
+                row[aggregate] = int(value) if aggregate == 'count' else float(value)
+            result.append((group, row))
+        return result
+
+    def rows(self, batch):
+        """
+        Group a batch and return one flat dictionary per group
+        (key columns plus aggregates; XML-RPC / JSON serializable)
+        """
+        result = []
+        for group, aggregates in self.groups(self.partial(batch), self.tables(batch)):
+            if len(self.keys) == 1:
+                group = (group,)
+            row = dict(zip(self.keys, group or ()))
+            row.update(aggregates)
+            result.append(row)
+        return result
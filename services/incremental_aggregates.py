@@ -0,0 +1,227 @@
+"""
+Incremental Aggregates
+Live MapReduce counts and statistics maintained under insert / update / delete deltas
+"""
+
+import bisect
+import threading
+from abc import ABC, abstractmethod
+
+from services.mapreduce_jobs import CGPA_BOUNDARIES, CGPA_CATEGORIES, count_dict
+from services.stats_kernel import StatsAccumulator
+from services.stats_service import StatsService
+from services.student_batch import StudentRecord, grade_sort_key
+
+
+# Delta operations accepted by apply_deltas()
+DELTA_OPERATIONS = ("insert", "update", "delete")
+
+
+class IncrementalAggregates(ABC):
+    """
+    Current cohort keyed by student_id plus aggregates derived from it
+
+    Every change is applied as "remove the old record, add the new one"
+    through _apply(record, sign), so each insert / update / delete costs
+    O(1) and the aggregates always equal a full recompute over the current
+    cohort. Thread-safe; subclasses implement _apply, _reset and results.
+    """
+
+    def __init__(self):
+        self.records = {}
+        self.lock = threading.Lock()
+        self._reset()
+
+    @staticmethod
+    def record(student):
+        """Normalize a student object or dict to a StudentRecord"""
+        if isinstance(student, dict):
+            return StudentRecord(str(student['student_id']), str(student.get('name', '')),
+                                 str(student.get('faculty') or ''), float(student.get('cgpa', 0.0)),
+                                 str(student.get('grade', '')))
+        return StudentRecord(str(student.student_id), str(student.name), str(student.faculty or ''),
+                             float(student.cgpa), str(student.grade))
+
+    @abstractmethod
+    def _reset(self):
+        """Clear the aggregates (the records are cleared by the caller)"""
+
+    @abstractmethod
+    def _apply(self, record, sign):
+        """Add (sign 1) or remove (sign -1) one record's contribution"""
+
+    @abstractmethod
+    def results(self, *args):
+        """Current aggregates of the cohort"""
+
+    def _insert(self, record):
+        if record.student_id in self.records:
+            raise ValueError(f"Student {record.student_id} already exists")
+        self.records[record.student_id] = record
+        self._apply(record, 1)
+
+    def _update(self, record):
+        old = self.records.get(record.student_id)
+        if old is None:
+            raise ValueError(f"Student {record.student_id} not found")
+        self._apply(old, -1)
+        self.records[record.student_id] = record
+        self._apply(record, 1)
+
+    def _delete(self, student_id):
+        old = self.records.pop(student_id, None)
+        if old is None:
+            raise ValueError(f"Student {student_id} not found")
+        self._apply(old, -1)
+
+    def reset(self):
+        """Drop the cohort and all aggregates"""
+        with self.lock:
+            self.records = {}
+            self._reset()
+
+    def insert(self, student):
+        """Add a new student (ValueError if the student_id exists)"""
+        with self.lock:
+            self._insert(self.record(student))
+
+    def update(self, student):
+        """Replace an existing student's record (ValueError if unknown)"""
+        with self.lock:
+            self._update(self.record(student))
+
+    def delete(self, student_id):
+        """Remove a student by ID (ValueError if unknown)"""
+        with self.lock:
+            self._delete(str(student_id))
+
+    def apply_deltas(self, deltas):
+        """
+        Apply a sequence of changes atomically
+
+        Args:
+            deltas: Iterable of (operation, student) pairs, operation being
+                    "insert", "update" or "delete" (delete only needs student_id)
+
+        Returns:
+            Number of deltas applied
+
+        Raises:
+            ValueError: On an unknown operation or student; earlier deltas of
+                        the call are rolled back
+        """
+        with self.lock:
+            applied = []
+            try:
+                for operation, student in deltas:
+                    record = self.record(student)
+                    previous = self.records.get(record.student_id)
+                    if operation == "insert":
+                        self._insert(record)
+                    elif operation == "update":
+                        self._update(record)
+                    elif operation == "delete":
+                        self._delete(record.student_id)
+                    else:
+                        raise ValueError(f"Unknown delta operation: {operation} "
+                                         f"(expected one of {', '.join(DELTA_OPERATIONS)})")
+                    applied.append((record.student_id, previous))
+            except ValueError:
+                for student_id, previous in reversed(applied):
+                    current = self.records.pop(student_id, None)
+                    if current is not None:
+                        self._apply(current, -1)
+                    if previous is not None:
+                        self.records[student_id] = previous
+                        self._apply(previous, 1)
+                raise
+            return len(applied)
+
+    def __len__(self):
+        return len(self.records)
+
+
+class IncrementalMapReduce(IncrementalAggregates):
+    """
+    CGPA category, grade, faculty and faculty x grade counts of a live cohort
+    Results match MapReduceService.perform_mapreduce with all chain jobs
+    """
+
+    # Category lower bounds as a plain list for bisect (index 0 = F ... 11 = A)
+    BOUNDARIES = CGPA_BOUNDARIES.tolist()
+
+    def _reset(self):
+        self.category_counts = [0] * len(CGPA_CATEGORIES)
+        self.grade_counts = {}
+        self.faculty_counts = {}
+        self.faculty_grade_counts = {}
+
+    @staticmethod
+    def _count(counts, key, sign):
+        counts[key] = counts.get(key, 0) + sign
+        if not counts[key]:
+            del counts[key]
+
+    def _apply(self, record, sign):
+        self.category_counts[bisect.bisect_right(self.BOUNDARIES, record.cgpa)] += sign
+        self._count(self.grade_counts, record.grade, sign)
+        self._count(self.faculty_counts, record.faculty, sign)
+        grades = self.faculty_grade_counts.setdefault(record.faculty, {})
+        self._count(grades, record.grade, sign)
+        if not grades:
+            del self.faculty_grade_counts[record.faculty]
+
+    def results(self):
+        """Current job outputs keyed like perform_mapreduce()"""
+        with self.lock:
+            return {
+                'cgpa_classification': count_dict(self.category_counts[::-1], CGPA_CATEGORIES),
+                'grade_counts': count_dict(self.grade_counts.values(), self.grade_counts.keys(), grade_sort_key),
+                'faculty_counts': dict(self.faculty_counts),
+                'faculty_grade_counts': {
+                    faculty: count_dict(grades.values(), grades.keys(), grade_sort_key)
+                    for faculty, grades in self.faculty_grade_counts.items()
+                },
+                'total_count': len(self.records)
+            }
+
+
+class IncrementalStats(IncrementalAggregates):
+    """
+    Faculty averages, grade distribution, pass rate, mean and variance of a
+    live cohort, kept in a StatsAccumulator. A CGPA histogram keeps min/max
+    exact under deletes. Results match StatsService.perform_analysis.
+    """
+
+    def _reset(self):
+        self.accumulator = StatsAccumulator()
+        self.cgpa_counts = {}
+
+    def _apply(self, record, sign):
+        if sign > 0:
+            self.accumulator.add(record.cgpa, record.faculty, record.grade)
+            self.cgpa_counts[record.cgpa] = self.cgpa_counts.get(record.cgpa, 0) + 1
+            return
+        self.accumulator.remove(record.cgpa, record.faculty, record.grade)
+        self.cgpa_counts[record.cgpa] -= 1
+        if not self.cgpa_counts[record.cgpa]:
+            del self.cgpa_counts[record.cgpa]
+            # Only a vanished extreme needs a rescan of the distinct values
+            if self.cgpa_counts and record.cgpa in (self.accumulator.minimum, self.accumulator.maximum):
+                self.accumulator.minimum = min(self.cgpa_counts)
+                self.accumulator.maximum = max(self.cgpa_counts)
+
+    def results(self):
+        """Current statistics keyed like perform_analysis(..., "all")"""
+        with self.lock:
+            accumulator = self.accumulator
+            return {
+                'faculty_stats': StatsService.faculty_stats(accumulator),
+                'grade_distribution': StatsService.grade_distribution(accumulator),
+                'pass_rate': StatsService.pass_rate(accumulator),
+                'mean_cgpa': accumulator.mean,
+                'std_dev': accumulator.std_dev,
+                'min': accumulator.min,
+                'max': accumulator.max,
+                'total_count': accumulator.count
+            }
@@ -0,0 +1,81 @@
+"""
+MapReduce Executor
+Chunked map + local combine on the shared worker pool, then merge of partial results
+"""
+
+import os
+from collections import defaultdict, deque
+
+from services.worker_pool import WorkerPool
+
+
+def merge_counts(partials):
+    """Reduce function: merge partial count dictionaries"""
+    result = defaultdict(int)
+    for partial in partials:
+        for key, count in partial.items():
+            result[key] += count
+    return dict(result)
+
+
+class MapReduceExecutor:
+    """
+    Splits columnar input into chunks and runs a map + combiner function on
+    each chunk in the long-lived worker pool. Every chunk returns a small
+    partial result (e.g. a count dictionary) which the reduce step merges,
+    so no per-record intermediate values are ever materialized.
+    """
+
+    def __init__(self, workers=None, chunk_size=None):
+        """
+        Args:
+            workers: Number of worker processes (MAPREDUCE_WORKERS, default: CPU count)
+            chunk_size: Records per chunk (MAPREDUCE_CHUNK_SIZE, default: 250000)
+        """
+        self.workers = workers or int(os.getenv('MAPREDUCE_WORKERS', WorkerPool.default_workers()))
+        self.chunk_size = chunk_size or int(os.getenv('MAPREDUCE_CHUNK_SIZE', '250000'))
+
+    def chunks(self, length):
+        """Yield (start, stop) bounds covering length records"""
+        for start in range(0, length, self.chunk_size):
+            yield start, min(start + self.chunk_size, length)
+
+    def run(self, map_chunk, columns, args=(), reduce=merge_counts):
+        """
+        Run map_chunk over aligned column slices and reduce the partials
+
+        Args:
+            map_chunk: Picklable function(*column_slices, *args) -> partial result
+            columns: Sequence of equally long arrays, sliced together per chunk
+            args: Extra arguments passed unchanged to every map_chunk call
+            reduce: Function merging an iterable of partial results
+
+        Returns:
+            Reduced result
+        """
+        length = len(columns[0]) if columns else 0
+        bounds = list(self.chunks(length))
+
+        # Small inputs (or a single worker) are mapped in-process
+        if len(bounds) <= 1 or self.workers <= 1:
+            partials = (
+                map_chunk(*[column[start:stop] for column in columns], *args)
+                for start, stop in bounds
+            )
+            return reduce(partials)
+
+        return reduce(self.submit_chunks(map_chunk, columns, args, bounds))
+
+    def submit_chunks(self, map_chunk, columns, args, bounds):
+        """
+        Yield map_chunk results in chunk order from the shared pool, keeping
+        at most self.workers chunks in flight for this call
+        """
+        pool = WorkerPool.get(self.workers)
+        pending = deque()
+        for start, stop in bounds:
+            if len(pending) >= self.workers:
+                yield pending.popleft().result()
+            pending.append(pool.submit(map_chunk, *[column[start:stop] for column in columns], *args))
+        while pending:
+            yield pending.popleft().result()
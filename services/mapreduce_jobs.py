@@ -0,0 +1,166 @@
+"""
+MapReduce Job Registry
+Mapper / combiner / reducer definitions that run together in one scan
+"""
+
+import numpy as np
+
+from services.group_by import CGPA_BOUNDARIES, CGPA_CATEGORIES, GroupBy
+from services.student_batch import StudentBatch, grade_sort_key
+
+
+class MapReduceJob:
+    """
+    A named MapReduce job
+
+    mapper(chunk) maps a StudentBatch chunk and combines it locally into a
+    small partial result, reducer(left, right) merges two partials and
+    finalize(partial, batch) turns the merged partial into the output value.
+    combine(left, right) merges two finalized outputs of different batches
+    (whose string tables may differ), e.g. batches of a streamed upload.
+    """
+
+    def __init__(self, operation, output, mapper, finalize, combine, reducer=np.add):
+        self.operation = operation
+        self.output = output
+        self.mapper = mapper
+        self.finalize = finalize
+        self.combine = combine
+        self.reducer = reducer
+
+
+# operation name -> MapReduceJob
+JOB_REGISTRY = {}
+
+
+def register_job(job):
+    """Add a job to the registry under its operation name"""
+    JOB_REGISTRY[job.operation] = job
+    return job
+
+
+def resolve_jobs(operations):
+    """Look up registered jobs, rejecting unknown operation names"""
+    unknown = [operation for operation in operations if operation not in JOB_REGISTRY]
+    if unknown:
+        raise ValueError(f"Unknown MapReduce operation(s): {', '.join(unknown)}")
+    return [JOB_REGISTRY[operation] for operation in operations]
+
+
+def map_chunk(cgpa, faculty_codes, grade_codes, faculty_table, grade_table, operations):
+    """
+    Map + combine one chunk for every requested job (worker entry point)
+
+    Returns:
+        Dictionary of operation -> partial result
+    """
+    chunk = StudentBatch(None, None, cgpa, faculty_codes, faculty_table, grade_codes, grade_table)
+    return {job.operation: job.mapper(chunk) for job in resolve_jobs(operations)}
+
+
+def reduce_partials(partials):
+    """Reduce step: merge per-chunk partial results job by job"""
+    merged = {}
+    for partial in partials:
+        for operation, value in partial.items():
+            if operation in merged:
+                merged[operation] = JOB_REGISTRY[operation].reducer(merged[operation], value)
+            else:
+                merged[operation] = value
+    return merged
+
+
+# Groupings behind the counting jobs
+CGPA_GROUPS = GroupBy(('cgpa_bucket',))
+GRADE_GROUPS = GroupBy(('grade',))
+FACULTY_GROUPS = GroupBy(('faculty',))
+FACULTY_GRADE_GROUPS = GroupBy(('faculty', 'grade'))
+
+
+def cgpa_category_counts(cgpa):
+    """Count CGPA values per category (index 0 = A ... 11 = F)"""
+    return CGPA_GROUPS.partial(StudentBatch(None, None, cgpa, (), (), (), ()))['count']
+
+
+def count_dict(counts, table, order=None):
+    """Decode a count array into a {value: count} dict, skipping zero counts"""
+    items = [(value, int(count)) for value, count in zip(table, counts) if count]
+    if order is not None:
+        items.sort(key=lambda item: order(item[0]))
+    return dict(items)
+
+
+def merge_count_dicts(left, right, order=None):
+    """Add two {value: count} dicts, keeping first-appearance order unless an order key is given"""
+    merged = dict(left)
+    for value, count in right.items():
+        merged[value] = merged.get(value, 0) + count
+    if order is not None:
+        merged = dict(sorted(merged.items(), key=lambda item: order(item[0])))
+    return merged
+
+
+def _map_cgpa_count(chunk):
+    return CGPA_GROUPS.partial(chunk)['count']
+
+
+def _finalize_cgpa_count(counts, batch):
+    return count_dict(counts, CGPA_CATEGORIES)
+
+
+def _combine_cgpa_count(left, right):
+    return merge_count_dicts(left, right, CGPA_CATEGORIES.index)
+
+
+def _map_grade_count(chunk):
+    return GRADE_GROUPS.partial(chunk)['count']
+
+
+def _finalize_grade_count(counts, batch):
+    return count_dict(counts, batch.grade_table, grade_sort_key)
+
+
+def _combine_grade_count(left, right):
+    return merge_count_dicts(left, right, grade_sort_key)
+
+
+def _map_faculty_count(chunk):
+    return FACULTY_GROUPS.partial(chunk)['count']
+
+
+def _finalize_faculty_count(counts, batch):
+    return count_dict(counts, batch.faculty_table)
+
+
+def _combine_faculty_count(left, right):
+    return merge_count_dicts(left, right)
+
+
+def _map_faculty_grade_count(chunk):
+    return FACULTY_GRADE_GROUPS.partial(chunk)['count']
+
+
+def _finalize_faculty_grade_count(counts, batch):
+    result = {}
+    for (faculty, grade), cell in FACULTY_GRADE_GROUPS.groups({'count': counts}, FACULTY_GRADE_GROUPS.tables(batch)):
+        result.setdefault(faculty, {})[grade] = cell['count']
+    for faculty, grades in result.items():
+        result[faculty] = dict(sorted(grades.items(), key=lambda item: grade_sort_key(item[0])))
+    return result
+
+
+def _combine_faculty_grade_count(left, right):
+    merged = dict(left)
+    for faculty, grades in right.items():
+        merged[faculty] = merge_count_dicts(merged.get(faculty, {}), grades, grade_sort_key)
+    return merged
+
+
+register_job(MapReduceJob('cgpa_count', 'cgpa_classification',
+                          _map_cgpa_count, _finalize_cgpa_count, _combine_cgpa_count))
+register_job(MapReduceJob('grade_count', 'grade_counts',
+                          _map_grade_count, _finalize_grade_count, _combine_grade_count))
+register_job(MapReduceJob('faculty_count', 'faculty_counts',
+                          _map_faculty_count, _finalize_faculty_count, _combine_faculty_count))
+register_job(MapReduceJob('faculty_grade_count', 'faculty_grade_counts',
+                          _map_faculty_grade_count, _finalize_faculty_grade_count, _combine_faculty_grade_count))
@@ -5,7 +5,13 @@ Performs parallel counting of CGPA ranges based on grade scale
 
 import time
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
+
+from services.mapreduce_executor import MapReduceExecutor
+from services.mapreduce_jobs import (
+    CGPA_BOUNDARIES, CGPA_CATEGORIES, cgpa_category_counts, count_dict,
+    map_chunk, reduce_partials, resolve_jobs
+)
+from services.student_batch import StudentBatch
 
 
 class MapReduceService:
@@ -14,6 +20,18 @@ class MapReduceService:
     Based on official grading scale with CGPA ranges
     """
     
+    # Grade categories, highest first
+    GRADE_ORDER = CGPA_CATEGORIES
+    
+    # Lower CGPA bound of each category except F, ascending (D- ... A)
+    CGPA_BOUNDARIES = CGPA_BOUNDARIES
+    
+    # Per-student object lists at least this large use the vectorized path
+    VECTORIZE_THRESHOLD = 1000
+    
+    # Shared chunked executor (MAPREDUCE_WORKERS / MAPREDUCE_CHUNK_SIZE)
+    executor = MapReduceExecutor()
+    
     @staticmethod
     def map_cgpa(student):
         """
@@ -60,6 +78,20 @@ class MapReduceService:
         else:
             return ("F (0.00-1.66)", 1)
     
+    @staticmethod
+    def classify_cgpa(cgpa):
+        """
+        Vectorized map + reduce over a CGPA array
+        Grouped count over the CGPA category key of the group-by engine
+        
+        Args:
+            cgpa: NumPy array of CGPA values
+        
+        Returns:
+            Dictionary of category counts in grade order (empty categories omitted)
+        """
+        return count_dict(cgpa_category_counts(cgpa), CGPA_CATEGORIES)
+    
     @staticmethod
     def reduce_counts(mapped_data):
         """Reduce function: aggregate counts"""
@@ -69,36 +101,121 @@ class MapReduceService:
         return dict(result)
     
     @staticmethod
-    def perform_mapreduce(students):
+    def run_jobs(batch, operations, executor=None):
         """
-        Perform MapReduce operation on student data for CGPA classification
+        Run several registered MapReduce jobs in a single chunked scan
         
         Args:
-            students: List of student objects
+            batch: StudentBatch to process
+            operations: Registered operation names (e.g. "cgpa_count", "grade_count")
+            executor: MapReduceExecutor to use (defaults to the shared one)
         
         Returns:
-            Dictionary with counts and processing time
+            Dictionary of job output name -> result
         """
-        start_time = time.time()
+        jobs = resolve_jobs(operations)
+        executor = executor or MapReduceService.executor
+        merged = executor.run(
+            map_chunk,
+            [batch.cgpa, batch.faculty_codes, batch.grade_codes],
+            args=(batch.faculty_table, batch.grade_table, [job.operation for job in jobs]),
+            reduce=reduce_partials
+        )
         
-        # Map phase - parallel processing
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            mapped_data = list(executor.map(MapReduceService.map_cgpa, students))
+        results = {}
+        for job in jobs:
+            partial = merged.get(job.operation)
+            if partial is None:
+                partial = job.mapper(batch[:0])
+            results[job.output] = job.finalize(partial, batch)
+        return results
+    
+    @staticmethod
+    def perform_mapreduce(students, executor=None, operations=("cgpa_count",)):
+        """
+        Perform MapReduce operation on student data for CGPA classification
         
-        # Reduce phase
-        result = MapReduceService.reduce_counts(mapped_data)
+        StudentBatch input and large object lists are split into chunks and
+        every requested job is mapped and combined per chunk on the
+        executor's worker pool; small object lists doing only CGPA
+        classification stream map_cgpa output straight into reduce_counts.
         
-        # Sort results by grade order
-        grade_order = [
-            "A (3.68-4.00)", "A- (3.50-3.67)", "B+ (3.33-3.49)", "B (3.00-3.32)",
-            "B- (2.83-2.99)", "C+ (2.67-2.82)", "C (2.50-2.66)", "C- (2.33-2.49)",
-            "D+ (2.17-2.32)", "D (2.00-2.16)", "D- (1.67-1.99)", "F (0.00-1.66)"
-        ]
-        sorted_result = {grade: result[grade] for grade in grade_order if grade in result}
+        Args:
+            students: List of student objects or a StudentBatch
+            executor: MapReduceExecutor to use (defaults to the shared one)
+            operations: Registered operation names to compute in the same scan
+        
+        Returns:
+            Dictionary with one entry per job output (cgpa_classification,
+            grade_counts, faculty_counts, faculty_grade_counts) and processing time
+        """
+        start_time = time.time()
+        
+        if (isinstance(students, StudentBatch) or len(students) >= MapReduceService.VECTORIZE_THRESHOLD
+                or tuple(operations) != ("cgpa_count",)):
+            # Chunked map + local combine for every job, merged in the reduce step
+            batch = StudentBatch.ensure(students)
+            results = MapReduceService.run_jobs(batch, operations, executor)
+        else:
+            # Map and reduce fused in one stream (no intermediate list)
+            counts = MapReduceService.reduce_counts(map(MapReduceService.map_cgpa, students))
+            results = {
+                'cgpa_classification': {
+                    grade: counts[grade] for grade in MapReduceService.GRADE_ORDER if grade in counts
+                }
+            }
         
         processing_time = time.time() - start_time
         
-        return {
-            'cgpa_classification': sorted_result,
-            'processing_time': processing_time
-        }
+        results['processing_time'] = processing_time
+        return results
+
+
+class MapReduceStream:
+    """
+    MapReduce over a cohort that arrives in batches (e.g. a client stream)
+
+    Each batch is mapped and reduced as soon as it is added (chunked on
+    the executor like perform_mapreduce) and its job outputs are combined
+    into the running totals, so mapping overlaps the upload and results()
+    equals perform_mapreduce over the concatenated batches.
+    """
+    
+    def __init__(self, operations=("cgpa_count",), executor=None):
+        """
+        Args:
+            operations: Registered operation names to compute
+            executor: MapReduceExecutor to use (defaults to the shared one)
+        """
+        self.jobs = resolve_jobs(operations)
+        self.executor = executor
+        self.outputs = None
+        self.count = 0
+        self.processing_time = 0.0
+    
+    def add(self, batch):
+        """Map and reduce one batch (StudentBatch or student objects) into the running totals"""
+        start_time = time.time()
+        batch = StudentBatch.ensure(batch)
+        outputs = MapReduceService.run_jobs(batch, [job.operation for job in self.jobs], self.executor)
+        if self.outputs is None:
+            self.outputs = outputs
+        else:
+            for job in self.jobs:
+                self.outputs[job.output] = job.combine(self.outputs[job.output], outputs[job.output])
+        self.count += len(batch)
+        self.processing_time += time.time() - start_time
+    
+    def results(self):
+        """
+        Combined job outputs so far
+        
+        Returns:
+            Dictionary shaped like perform_mapreduce(); processing_time is
+            the time spent mapping batches, not waiting for them
+        """
+        if self.outputs is None:
+            self.add(StudentBatch.from_students([]))
+        results = dict(self.outputs)
+        results['processing_time'] = self.processing_time
+        return results
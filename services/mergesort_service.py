@@ -1,16 +1,34 @@
 """
 Merge Sort Service Implementation
-Performs distributed sorting of students by CGPA
+Performs distributed sorting of students by CGPA and grade
 """
 
+import heapq
+import os
 import time
 
+import numpy as np
+
+from services.external_sort import ExternalMergeSort
+from services.student_batch import StudentBatch, grade_sort_key
+from services.worker_pool import WorkerPool
+
 
 class MergeSortService:
     """
     Implements Merge Sort algorithm for student ranking by CGPA
     """
     
+    # Inputs at least this large are sample-sorted on the worker pool
+    PARALLEL_THRESHOLD = int(os.getenv('MERGESORT_PARALLEL_THRESHOLD', '500000'))
+    
+    # Splitter candidates drawn per partition when sampling
+    OVERSAMPLING = 32
+    
+    # CGPAs are recorded to two decimals on a 0.00-4.00 scale: 401 distinct keys
+    CGPA_SCALE = 100
+    MAX_CGPA_KEY = 400
+    
     @staticmethod
     def merge(left, right):
         """Merge two sorted lists by CGPA (descending)"""
@@ -43,23 +61,352 @@ class MergeSortService:
         return MergeSortService.merge(left, right)
     
     @staticmethod
-    def perform_sort(students):
+    def cgpa_order(cgpa):
+        """
+        Stable descending order of a CGPA array
+        Ties keep their input order, matching merge()
+        """
+        return np.argsort(-cgpa, kind='stable')
+    
+    @staticmethod
+    def sort_partition(cgpa, positions):
+        """Sort one sample-sort partition, returning its input positions (worker entry point)"""
+        return positions[MergeSortService.cgpa_order(cgpa)]
+    
+    @staticmethod
+    def parallel_order(cgpa, workers=None):
+        """
+        Parallel sample sort of a CGPA array (descending, stable)
+        
+        Sampled CGPA splitters cut the input into one value range per worker,
+        the ranges are sorted concurrently on the worker pool and concatenated
+        from highest to lowest. Equal CGPAs always land in the same range and
+        each range keeps input order, so the result equals cgpa_order().
+        
+        Args:
+            cgpa: NumPy array of CGPA values
+            workers: Number of partitions / worker processes
+        
+        Returns:
+            Array of input positions in sorted order
+        """
+        workers = workers or int(os.getenv('MERGESORT_WORKERS', WorkerPool.default_workers()))
+        if workers <= 1 or len(cgpa) < workers * MergeSortService.OVERSAMPLING:
+            return MergeSortService.cgpa_order(cgpa)
+        
+        # Pick workers - 1 splitters from a sorted random sample
+        rng = np.random.default_rng(0)
+        sample = np.sort(rng.choice(cgpa, size=workers * MergeSortService.OVERSAMPLING))
+        splitters = sample[MergeSortService.OVERSAMPLING::MergeSortService.OVERSAMPLING]
+        
+        # Partition 0 holds the highest CGPAs; positions stay ascending inside each partition
+        partition = (workers - 1) - np.searchsorted(splitters, cgpa, side='right')
+        grouped = np.argsort(partition, kind='stable')
+        bounds = np.cumsum(np.bincount(partition, minlength=workers))[:-1]
+        
+        pool = WorkerPool.get(workers)
+        futures = [
+            pool.submit(MergeSortService.sort_partition, cgpa[positions], positions)
+            for positions in np.split(grouped, bounds)
+            if len(positions)
+        ]
+        return np.concatenate([future.result() for future in futures])
+    
+    @staticmethod
+    def fixed_precision_keys(cgpa):
+        """
+        Integer CGPA keys in hundredths (0-400) when every value is an exact
+        two-decimal CGPA, otherwise None
+        """
+        keys = np.rint(cgpa * MergeSortService.CGPA_SCALE)
+        if len(keys) and not (0 <= keys.min() and keys.max() <= MergeSortService.MAX_CGPA_KEY):
+            return None
+        # k / 100 rounds to the same double as parsing the two-decimal text
+        if not np.array_equal(keys / MergeSortService.CGPA_SCALE, cgpa):
+            return None
+        return keys.astype(np.uint16)
+    
+    @staticmethod
+    def counting_order(keys):
+        """
+        Stable O(n) descending order of fixed-precision CGPA keys
+        
+        Keys are flipped so the highest CGPA comes first and sorted as 16-bit
+        integers, for which NumPy's stable sort is an LSD radix (counting) sort.
+        Ties keep their input order, matching merge().
+        """
+        return np.argsort(MergeSortService.MAX_CGPA_KEY - keys, kind='stable')
+    
+    @staticmethod
+    def key_order(cgpa, parallel=None):
+        """
+        Stable descending order of a CGPA array using the cheapest exact method
+        
+        Two-decimal CGPAs use the counting sort; arbitrary floats fall back to
+        a comparison sort, sample-sorted in parallel for large inputs.
+        
+        Args:
+            cgpa: NumPy array of CGPA values
+            parallel: Force (True) or disable (False) the parallel sample sort;
+                      None chooses it for at least PARALLEL_THRESHOLD values
+        """
+        keys = MergeSortService.fixed_precision_keys(cgpa)
+        if keys is not None:
+            return MergeSortService.counting_order(keys)
+        
+        if parallel is None:
+            parallel = len(cgpa) >= MergeSortService.PARALLEL_THRESHOLD
+        if parallel:
+            return MergeSortService.parallel_order(cgpa)
+        return MergeSortService.cgpa_order(cgpa)
+    
+    @staticmethod
+    def sort_order(batch, parallel=None):
+        """Stable descending-CGPA order of a StudentBatch (see key_order)"""
+        return MergeSortService.key_order(batch.cgpa, parallel)
+    
+    @staticmethod
+    def table_ranks(table, key=None):
+        """Sorted rank of every entry of a dictionary-encoding table, indexed by code"""
+        ranked = sorted(range(len(table)), key=lambda code: key(table[code]) if key else table[code])
+        ranks = np.empty(len(table), dtype=np.int64)
+        ranks[ranked] = np.arange(len(table))
+        return ranks
+    
+    @staticmethod
+    def cgpa_rank_keys(cgpa, order=None):
+        """
+        Integer keys ranking CGPA descending (0 = highest)
+        
+        Two-decimal CGPAs map directly to 400 - hundredths; other values get
+        dense ranks read off their sorted order (computed if not given).
+        """
+        keys = MergeSortService.fixed_precision_keys(cgpa)
+        if keys is not None:
+            return MergeSortService.MAX_CGPA_KEY - keys.astype(np.int64)
+        
+        if order is None:
+            order = MergeSortService.key_order(cgpa)
+        ordered = cgpa[order]
+        new_value = np.ones(len(ordered), dtype=np.int64)
+        new_value[1:] = ordered[1:] != ordered[:-1]
+        ranks = np.empty(len(ordered), dtype=np.int64)
+        ranks[order] = np.cumsum(new_value) - 1
+        return ranks
+    
+    @staticmethod
+    def extract_sort_keys(batch, cgpa_order=None):
+        """
+        Precompute the integer sort keys of a batch
+        
+        Returns:
+            Dictionary of per-row integer keys: 'grade' (ordinal, A first),
+            'cgpa' (descending rank), 'faculty' and 'name' (alphabetical rank)
+        """
+        grade_ranks = MergeSortService.table_ranks(batch.grade_table, grade_sort_key)
+        faculty_ranks = MergeSortService.table_ranks(batch.faculty_table)
+        _, name_ranks = np.unique(np.asarray(batch.names, dtype=str), return_inverse=True)
+        return {
+            'grade': grade_ranks[batch.grade_codes],
+            'cgpa': MergeSortService.cgpa_rank_keys(batch.cgpa, cgpa_order),
+            'faculty': faculty_ranks[batch.faculty_codes],
+            'name': name_ranks.reshape(-1)
+        }
+    
+    @staticmethod
+    def grade_order(keys):
+        """
+        Composite order: grade (A > A- > B+ ...), then CGPA descending,
+        then faculty, then name
+        
+        LSD style: rows are first ordered by the faculty/name tie-breakers,
+        then stably bucket-sorted on the combined grade-ordinal + CGPA key,
+        which fits 16 bits for two-decimal CGPAs (radix sort).
+        """
+        tiebreak = np.lexsort((keys['name'], keys['faculty']))
+        cgpa_span = int(keys['cgpa'].max()) + 1 if len(keys['cgpa']) else 1
+        major = keys['grade'] * cgpa_span + keys['cgpa']
+        if len(major) and major.max() <= np.iinfo(np.uint16).max:
+            major = major.astype(np.uint16)
+        return tiebreak[np.argsort(major[tiebreak], kind='stable')]
+    
+    @staticmethod
+    def validate_top_k(top_k):
+        """Return top_k, raising ValueError if it is negative (None / 0 = full sort)"""
+        if top_k is not None and top_k < 0:
+            raise ValueError(f"top_k must be >= 0, got {top_k}")
+        return top_k
+    
+    @staticmethod
+    def top_k_order(cgpa, k):
+        """
+        Positions of the k highest CGPAs in stable descending order
+        
+        A linear-time partition finds the k-th highest CGPA; everything above
+        it plus the earliest ties at it are the winners, and only those k
+        values are sorted (O(n + k log k)).
+        """
+        n = len(cgpa)
+        if k >= n:
+            return MergeSortService.key_order(cgpa)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        
+        threshold = np.partition(cgpa, n - k)[n - k]
+        above = np.flatnonzero(cgpa > threshold)
+        ties = np.flatnonzero(cgpa == threshold)[:k - len(above)]
+        winners = np.sort(np.concatenate((above, ties)))
+        return winners[MergeSortService.cgpa_order(cgpa[winners])]
+    
+    @staticmethod
+    def top_k(students, k):
+        """
+        Heap selection of the k highest-CGPA students from an object list
+        O(n log k); ties keep their input order, matching merge()
+        """
+        students = list(students)
+        winners = heapq.nsmallest(k, range(len(students)), key=lambda i: (-students[i].cgpa, i))
+        return [students[i] for i in winners]
+    
+    @staticmethod
+    def perform_sort(students, parallel=None, top_k=None, sort_by="cgpa"):
         """
         Perform merge sort on student data by CGPA
         
+        StudentBatch input (and large object lists) are ranked on extracted
+        CGPA keys: two-decimal CGPAs with a linear-time counting sort, other
+        values with a comparison sort. Small object lists use merge_sort().
+        With top_k only the K highest students are selected and sorted.
+        sort_by="grade" ranks by grade, CGPA, faculty and name instead.
+        
         Args:
-            students: List of student objects
+            students: List of student objects or a StudentBatch
+            parallel: Parallel sample sort mode (None = automatic by size)
+            top_k: Number of top students to return (None or 0 = full sort)
+            sort_by: "cgpa" or "grade"
         
         Returns:
-            Dictionary with sorted students and processing time
+            Dictionary with sorted students, total_count and processing time.
+            For a StudentBatch, sorted_students is a StudentBatch and
+            'order' holds the sorted row positions of the input.
         """
+        if sort_by not in ("cgpa", "grade"):
+            raise ValueError(f"Unknown sort key: {sort_by}")
+        MergeSortService.validate_top_k(top_k)
+        
         start_time = time.time()
+        total_count = len(students)
         
-        sorted_students = MergeSortService.merge_sort(list(students))
+        if sort_by == "grade":
+            batch = StudentBatch.ensure(students)
+            order = MergeSortService.grade_order(MergeSortService.extract_sort_keys(batch))
+            if top_k:
+                order = order[:top_k]
+            if isinstance(students, StudentBatch):
+                sorted_students = students.take(order)
+            else:
+                students = list(students)
+                sorted_students = [students[i] for i in order.tolist()]
+            processing_time = time.time() - start_time
+            return {
+                'sorted_students': sorted_students,
+                'order': order,
+                'total_count': total_count,
+                'processing_time': processing_time
+            }
+        
+        if isinstance(students, StudentBatch):
+            if top_k:
+                order = MergeSortService.top_k_order(students.cgpa, top_k)
+            else:
+                order = MergeSortService.sort_order(students, parallel)
+            sorted_students = students.take(order)
+            processing_time = time.time() - start_time
+            return {
+                'sorted_students': sorted_students,
+                'order': order,
+                'total_count': total_count,
+                'processing_time': processing_time
+            }
+        
+        if top_k:
+            sorted_students = MergeSortService.top_k(students, top_k)
+        elif parallel or (parallel is None and len(students) >= MergeSortService.PARALLEL_THRESHOLD):
+            # Large object lists are ranked on their extracted CGPA keys
+            students = list(students)
+            cgpa = np.fromiter((student.cgpa for student in students), dtype=np.float64, count=len(students))
+            sorted_students = [students[i] for i in MergeSortService.key_order(cgpa, parallel).tolist()]
+        else:
+            sorted_students = MergeSortService.merge_sort(list(students))
         
         processing_time = time.time() - start_time
         
         return {
             'sorted_students': sorted_students,
+            'total_count': total_count,
+            'processing_time': processing_time
+        }
+    
+    @staticmethod
+    def perform_multi_sort(students, parallel=None, top_k=None):
+        """
+        Rank students by CGPA and by grade from one set of extracted keys
+        
+        Args:
+            students: List of student objects or a StudentBatch
+            parallel: Parallel sample sort mode (None = automatic by size)
+            top_k: Number of top students per ranking (None or 0 = full sort)
+        
+        Returns:
+            Dictionary with cgpa_order / grade_order (row positions),
+            sorted_by_cgpa / sorted_by_grade batches, total_count and processing time
+        """
+        MergeSortService.validate_top_k(top_k)
+        start_time = time.time()
+        batch = StudentBatch.ensure(students)
+        
+        if top_k and MergeSortService.fixed_precision_keys(batch.cgpa) is not None:
+            cgpa_order = MergeSortService.top_k_order(batch.cgpa, top_k)
+            keys = MergeSortService.extract_sort_keys(batch)
+        else:
+            cgpa_order = MergeSortService.sort_order(batch, parallel)
+            keys = MergeSortService.extract_sort_keys(batch, cgpa_order)
+            if top_k:
+                cgpa_order = cgpa_order[:top_k]
+        
+        grade_order = MergeSortService.grade_order(keys)
+        if top_k:
+            grade_order = grade_order[:top_k]
+        
+        sorted_by_cgpa = batch.take(cgpa_order)
+        sorted_by_grade = batch.take(grade_order)
+        processing_time = time.time() - start_time
+        
+        return {
+            'cgpa_order': cgpa_order,
+            'grade_order': grade_order,
+            'sorted_by_cgpa': sorted_by_cgpa,
+            'sorted_by_grade': sorted_by_grade,
+            'total_count': len(batch),
             'processing_time': processing_time
         }
+    
+    @staticmethod
+    def external_sort(records, memory_budget=None, output_path=None, temp_dir=None):
+        """
+        Out-of-core sort by CGPA (descending, stable) for cohorts larger than memory
+        
+        Args:
+            records: Iterable of student objects, consumed as a stream
+            memory_budget: Bytes of records buffered per sorted run
+            output_path: Write the ranking to this CSV file instead of returning an iterator
+            temp_dir: Directory for temporary run files
+        
+        Returns:
+            Iterator of StudentRecord in sorted order, or the number of
+            records written when output_path is given
+        """
+        sorter = ExternalMergeSort(memory_budget, temp_dir)
+        if output_path:
+            return sorter.sort_to_file(records, output_path)
+        return sorter.sort(records)
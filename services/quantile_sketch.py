@@ -0,0 +1,184 @@
+"""
+Quantile Sketch
+Bounded-memory, mergeable KLL-style sketch for CGPA percentiles
+"""
+
+import os
+
+import numpy as np
+
+
+# Percentiles reported by the Statistics service
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+
+class QuantileSketch:
+    """
+    KLL quantile sketch
+
+    Values are buffered in levels of compactors; an item at level h stands
+    for 2^h input values. When a level exceeds its capacity it is sorted and
+    every second item (random offset) is promoted to the next level, so
+    memory stays O(k log(n / k)) while the rank error stays around 1.7% for
+    k = 200. Sketches of different shards merge level by level.
+
+    In exact mode nothing is ever compacted: all values are kept and
+    quantiles match np.quantile. Sketches that have not compacted yet are
+    exact as well. The compaction offsets come from a fixed seed, so the
+    same input in the same chunk order always gives the same percentiles.
+    """
+
+    # Capacity decay between consecutive levels (from the KLL paper)
+    CAPACITY_DECAY = 2 / 3
+
+    # Smallest compactor size
+    MIN_CAPACITY = 8
+
+    def __init__(self, k=None, exact=False, seed=None):
+        """
+        Args:
+            k: Accuracy parameter, the top level's capacity (QUANTILE_SKETCH_K, default: 200)
+            exact: Keep every value instead of compacting
+            seed: Seed for the compaction offsets (QUANTILE_SKETCH_SEED, default: 0)
+        """
+        self.k = k or int(os.getenv('QUANTILE_SKETCH_K', '200'))
+        self.exact = exact
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(int(os.getenv('QUANTILE_SKETCH_SEED', '0')) if seed is None else seed)
+
+    def capacity(self, level):
+        """Capacity of a level; lower levels shrink geometrically"""
+        depth = len(self.levels) - level - 1
+        return max(self.MIN_CAPACITY, int(np.ceil(self.k * self.CAPACITY_DECAY ** depth)))
+
+    def is_exact(self):
+        """True while every inserted value is still held at weight 1"""
+        return len(self.levels) == 1
+
+    def update(self, values):
+        """
+        Add an array of values
+
+        Returns:
+            self, so calls can be chained
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values):
+            self.levels[0] = np.concatenate((self.levels[0], values))
+            self.count += len(values)
+            self.compress()
+        return self
+
+    def compress(self):
+        """Compact every level that is over capacity, bottom up"""
+        if self.exact:
+            return
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # An odd item out stays behind at this level
+                kept = items[len(items) - len(items) % 2:]
+                paired = items[:len(items) - len(kept)]
+                promoted = paired[int(self.rng.integers(2))::2]
+                self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+                self.levels[level] = kept
+            level += 1
+
+    def merge(self, other):
+        """
+        Merge another sketch (e.g. from another shard) into this one
+
+        Returns:
+            self, so calls can be chained
+        """
+        self.exact = self.exact and other.exact
+        self.k = min(self.k, other.k)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.count += other.count
+        self.compress()
+        return self
+
+    def quantiles(self, fractions):
+        """
+        Estimate quantiles
+
+        Args:
+            fractions: Sequence of quantiles in [0, 1]
+
+        Returns:
+            List of float values (linear interpolation when exact, weighted
+            nearest rank otherwise; 0.0 for an empty sketch)
+        """
+        if not self.count:
+            return [0.0 for _ in fractions]
+        if self.is_exact():
+            return [float(value) for value in np.quantile(self.levels[0], fractions)]
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level_items), 1 << level, dtype=np.int64)
+            for level, level_items in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        targets = np.asarray(fractions, dtype=np.float64) * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, targets, side='left'), len(items) - 1)
+        return [float(value) for value in items[positions]]
+
+    def quantile(self, fraction):
+        """Estimate a single quantile"""
+        return self.quantiles([fraction])[0]
+
+
+def sketch_by_group(values, codes, table, exact=False, k=None):
+    """
+    Build one sketch over all values plus one per group
+
+    Args:
+        values: NumPy array of values
+        codes: Integer group code per value
+        table: Group name per code
+        exact: Keep every value instead of compacting
+        k: Sketch accuracy parameter
+
+    Returns:
+        Tuple of (overall sketch, {group: sketch}) with groups in table order
+    """
+    overall = QuantileSketch(k, exact).update(values)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(table)))))
+    grouped = values[order]
+    groups = {}
+    for code, name in enumerate(table):
+        start, stop = bounds[code], bounds[code + 1]
+        if stop > start:
+            groups[name] = QuantileSketch(k, exact).update(grouped[start:stop])
+    return overall, groups
+
+
+def sketch_chunk(cgpa, faculty_codes, faculty_table, exact, k):
+    """Sketch one column chunk overall and per faculty (worker entry point)"""
+    return sketch_by_group(cgpa, faculty_codes, faculty_table, exact, k)
+
+
+def merge_sketches(partials):
+    """Reduce step: merge per-chunk (overall, {faculty: sketch}) pairs in chunk order"""
+    overall = None
+    groups = {}
+    for partial_overall, partial_groups in partials:
+        overall = partial_overall if overall is None else overall.merge(partial_overall)
+        for name, sketch in partial_groups.items():
+            if name in groups:
+                groups[name].merge(sketch)
+            else:
+                groups[name] = sketch
+    return overall or QuantileSketch(), groups
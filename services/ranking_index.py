@@ -0,0 +1,198 @@
+"""
+Ranking Index
+Incrementally maintained CGPA ranking (blocked sorted list) for the MergeSort service
+"""
+
+import bisect
+import os
+
+from services.incremental_aggregates import IncrementalAggregates
+
+
+class RankingIndex(IncrementalAggregates):
+    """
+    Students ordered by CGPA (descending), kept sorted under deltas
+
+    Keys (-cgpa, sequence, student_id) live in a list of sorted blocks of
+    roughly RANKING_BLOCK_SIZE keys; a binary search over the block maxima
+    finds the block and a second one the slot, and a Fenwick tree over the
+    block sizes turns a slot into a global rank. Insert, delete, update and
+    rank are O(log n) plus a short in-block shift, top-K walks only the
+    first blocks. A student gets a fresh sequence number on insert, keeps
+    it across updates and drops it on delete, so sequence order is the
+    order of the records dict and ties rank exactly like the stable
+    MergeSortService.perform_sort over the current cohort.
+    """
+
+    def __init__(self, block_size=None):
+        """
+        Args:
+            block_size: Target keys per block (RANKING_BLOCK_SIZE, default: 512)
+        """
+        self.block_size = block_size or int(os.getenv('RANKING_BLOCK_SIZE', '512'))
+        super().__init__()
+
+    def _reset(self):
+        self.sequence = {}
+        self.next_sequence = 0
+        self.blocks = []
+        self.maxes = []
+        self.tree = [0]
+
+    def _key(self, record):
+        sequence = self.sequence.get(record.student_id)
+        if sequence is None:
+            sequence = self.sequence[record.student_id] = self.next_sequence
+            self.next_sequence += 1
+        return (-record.cgpa, sequence, record.student_id)
+
+    def _rebuild_tree(self):
+        """Rebuild the Fenwick tree of block sizes after blocks split or vanish"""
+        tree = [0] * (len(self.blocks) + 1)
+        for index, block in enumerate(self.blocks, 1):
+            tree[index] += len(block)
+            parent = index + (index & -index)
+            if parent < len(tree):
+                tree[parent] += tree[index]
+        self.tree = tree
+
+    def _tree_add(self, block_index, delta):
+        index = block_index + 1
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+
+    def _prefix(self, block_index):
+        """Number of keys in blocks before block_index"""
+        total = 0
+        while block_index > 0:
+            total += self.tree[block_index]
+            block_index -= block_index & -block_index
+        return total
+
+    def _apply(self, record, sign):
+        key = self._key(record)
+        if sign > 0:
+            self._add_key(key)
+        else:
+            self._remove_key(key)
+            del self.sequence[record.student_id]
+
+    def _update(self, record):
+        # The record keeps its place in the records dict, so it keeps its sequence number too
+        old = self.records.get(record.student_id)
+        if old is None:
+            raise ValueError(f"Student {record.student_id} not found")
+        self._remove_key(self._key(old))
+        self.records[record.student_id] = record
+        self._add_key(self._key(record))
+
+    def _add_key(self, key):
+        if not self.blocks:
+            self.blocks = [[key]]
+            self.maxes = [key]
+            self._rebuild_tree()
+            return
+        index = min(bisect.bisect_left(self.maxes, key), len(self.blocks) - 1)
+        block = self.blocks[index]
+        bisect.insort(block, key)
+        self.maxes[index] = block[-1]
+        if len(block) > 2 * self.block_size:
+            self.blocks[index:index + 1] = [block[:self.block_size], block[self.block_size:]]
+            self.maxes[index:index + 1] = [block[self.block_size - 1], block[-1]]
+            self._rebuild_tree()
+        else:
+            self._tree_add(index, 1)
+
+    def _remove_key(self, key):
+        index = bisect.bisect_left(self.maxes, key)
+        block = self.blocks[index]
+        del block[bisect.bisect_left(block, key)]
+        if block:
+            self.maxes[index] = block[-1]
+            self._tree_add(index, -1)
+        else:
+            del self.blocks[index]
+            del self.maxes[index]
+            self._rebuild_tree()
+
+    def _position(self, key):
+        index = bisect.bisect_left(self.maxes, key)
+        if index == len(self.blocks):
+            return len(self.records)
+        return self._prefix(index) + bisect.bisect_left(self.blocks[index], key)
+
+    def load(self, students):
+        """
+        Replace the index with a cohort, sorting it once
+
+        Args:
+            students: Iterable of student objects, dicts or StudentRecords (arrival order)
+        """
+        with self.lock:
+            self.records = {}
+            self._reset()
+            for student in students:
+                record = self.record(student)
+                if record.student_id in self.records:
+                    raise ValueError(f"Student {record.student_id} already exists")
+                self.records[record.student_id] = record
+            keys = sorted(self._key(record) for record in self.records.values())
+            self.blocks = [keys[start:start + self.block_size]
+                           for start in range(0, len(keys), self.block_size)]
+            self.maxes = [block[-1] for block in self.blocks]
+            self._rebuild_tree()
+
+    def lookup(self, student_id):
+        """
+        Rank and CGPA of a student read together under the lock, so a
+        concurrent delta cannot change or remove the record in between
+
+        Returns:
+            Tuple of (1-based CGPA rank, CGPA)
+
+        Raises:
+            ValueError: If the student is not in the index
+        """
+        with self.lock:
+            record = self.records.get(str(student_id))
+            if record is None:
+                raise ValueError(f"Student {student_id} not found")
+            return self._position(self._key(record)) + 1, record.cgpa
+
+    def rank(self, student_id):
+        """1-based CGPA rank of a student (ValueError if unknown)"""
+        return self.lookup(student_id)[0]
+
+    def count_above(self, cgpa):
+        """Number of students with a CGPA strictly above cgpa"""
+        with self.lock:
+            return self._position((-cgpa, -1, ''))
+
+    def top_k(self, k):
+        """
+        The k highest ranked students without re-sorting
+
+        Returns:
+            List of StudentRecord, best first
+
+        Raises:
+            ValueError: If k is negative
+        """
+        if k < 0:
+            raise ValueError(f"top_k must be >= 0, got {k}")
+        result = []
+        with self.lock:
+            for block in self.blocks:
+                for _, _, student_id in block[:k - len(result)]:
+                    result.append(self.records[student_id])
+                if len(result) >= k:
+                    break
+        return result
+
+    def results(self, k):
+        """Top k students and the cohort size"""
+        return {
+            'top_students': self.top_k(k),
+            'total_count': len(self.records)
+        }
@@ -0,0 +1,172 @@
+"""
+Result Cache
+Content-addressed in-memory LRU cache for per-service results
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache keyed by a digest of the request payload
+
+    Entries are evicted least-recently-used first once max_entries or the
+    max_bytes budget is exceeded, and expire ttl seconds after they were
+    stored; a single result larger than the whole budget is not cached.
+    Hit, miss, eviction and expiry counters are kept for monitoring. Services cache
+    only their own stage's result, so a repeat request skips decoding and
+    computation but still flows through the chain.
+    """
+
+    def __init__(self, max_entries=None, ttl=None, max_bytes=None):
+        """
+        Args:
+            max_entries: Maximum cached results (RESULT_CACHE_SIZE, default: 32, 0 disables)
+            ttl: Seconds an entry stays valid (RESULT_CACHE_TTL, default: 300, 0 = no expiry)
+            max_bytes: Total size budget of the cached results
+                       (RESULT_CACHE_MAX_BYTES, default: 128 MB, 0 = no limit)
+        """
+        self.max_entries = int(os.getenv('RESULT_CACHE_SIZE', '32')) if max_entries is None else max_entries
+        self.ttl = float(os.getenv('RESULT_CACHE_TTL', '300')) if ttl is None else ttl
+        self.max_bytes = int(os.getenv('RESULT_CACHE_MAX_BYTES', str(128 << 20))) if max_bytes is None else max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def digest(*parts):
+        """
+        Content hash of a request payload
+
+        Args:
+            parts: bytes (e.g. serialized protobuf) or plain Python values
+                   (hashed through their repr, e.g. XML-RPC student lists)
+
+        Returns:
+            Hex digest string
+        """
+        hasher = hashlib.blake2b(digest_size=20)
+        for part in parts:
+            if not isinstance(part, (bytes, bytearray)):
+                part = repr(part).encode('utf-8')
+            hasher.update(len(part).to_bytes(8, 'little'))
+            hasher.update(part)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def message_digest(message, *params, exclude=()):
+        """
+        Content hash of a protobuf message, ignoring the excluded fields
+
+        Args:
+            message: Protobuf message
+            params: Extra values mixed into the key (e.g. the stage name)
+            exclude: Field names left out of the key (e.g. partial_results)
+        """
+        if exclude:
+            trimmed = type(message)()
+            trimmed.CopyFrom(message)
+            for field in exclude:
+                trimmed.ClearField(field)
+            message = trimmed
+        return ResultCache.digest(message.SerializeToString(deterministic=True), *params)
+
+    @staticmethod
+    def size_of(value):
+        """
+        Approximate size of a cached result in bytes
+
+        Protobuf messages report their serialized size (ByteSize()),
+        bytes and strings their length; dictionaries, lists and tuples
+        (XML-RPC results) are summed over their items, 8 bytes per scalar.
+        """
+        if hasattr(value, 'ByteSize'):
+            return value.ByteSize()
+        if isinstance(value, (bytes, bytearray, str)):
+            return len(value)
+        if isinstance(value, dict):
+            return sum(ResultCache.size_of(key) + ResultCache.size_of(item) for key, item in value.items())
+        if isinstance(value, (list, tuple)):
+            return sum(ResultCache.size_of(item) for item in value)
+        return 8
+
+    def _remove(self, key):
+        """Drop one entry and its bytes (caller holds the lock)"""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and time.monotonic() - entry[1] > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries over capacity"""
+        if self.max_entries <= 0:
+            return
+        size = self.size_of(value)
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic(), size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, computing and storing it on a miss
+
+        Returns:
+            Tuple of (value, hit)
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.put(key, value)
+        return value, False
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Counters for monitoring (XML-RPC / JSON serializable)"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,286 @@
+"""
+Fused Statistics Kernel
+Single-scan, mergeable accumulation of every aggregate the Statistics service reports
+"""
+
+import numpy as np
+
+from services.group_by import GroupBy
+from services.mergesort_service import MergeSortService
+from services.student_batch import StudentBatch
+
+
+# Minimum CGPA counted as a pass
+PASS_CGPA = 2.0
+
+# Rows processed per step; small enough for a chunk to stay in cache while
+# every aggregate is taken from it
+KERNEL_CHUNK_SIZE = 65536
+
+# Groupings computed from every chunk
+OVERALL_GROUPS = GroupBy((), ('count', 'sum', 'std', 'min', 'max'))
+FACULTY_GROUPS = GroupBy(('faculty',), ('count', 'sum'))
+GRADE_GROUPS = GroupBy(('grade',))
+
+
+class StatsAccumulator:
+    """
+    Mergeable statistics state
+
+    Holds count, sum, M2 (sum of squared deviations from the mean), min/max,
+    pass count, per-faculty counts / CGPA sums and the grade histogram.
+    update(batch) folds a batch in with one cache-blocked scan and
+    merge(other) combines two accumulators with the parallel Welford
+    (Chan et al.) update, so shards summarized by different worker processes
+    or Statistics replicas combine to exactly the single-pass result.
+    Faculty and grade aggregates are keyed by value rather than by code, so
+    shards with different dictionary tables merge correctly; insertion order
+    follows first appearance across the merged shards.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.m2 = 0.0
+        self.minimum = float('inf')
+        self.maximum = float('-inf')
+        self.passed = 0
+        self.faculty_counts = {}
+        self.faculty_sums = {}
+        self.grade_counts = {}
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self):
+        """Population variance"""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std_dev(self):
+        """Population standard deviation"""
+        return self.variance ** 0.5
+
+    @property
+    def min(self):
+        return self.minimum if self.count else 0.0
+
+    @property
+    def max(self):
+        return self.maximum if self.count else 0.0
+
+    def _fold(self, count, total, m2, minimum, maximum, passed):
+        """Combine another set of moments into this one (Chan et al.)"""
+        if not count:
+            return
+        if self.count:
+            delta = total / count - self.mean
+            self.m2 += m2 + delta * delta * self.count * count / (self.count + count)
+        else:
+            self.m2 = m2
+        self.count += count
+        self.total += total
+        self.minimum = min(self.minimum, minimum)
+        self.maximum = max(self.maximum, maximum)
+        self.passed += passed
+
+    def _add_counts(self, faculty_counts, faculty_sums, grade_counts):
+        for faculty, count in faculty_counts.items():
+            self.faculty_counts[faculty] = self.faculty_counts.get(faculty, 0) + count
+            self.faculty_sums[faculty] = self.faculty_sums.get(faculty, 0.0) + faculty_sums[faculty]
+        for grade, count in grade_counts.items():
+            self.grade_counts[grade] = self.grade_counts.get(grade, 0) + count
+
+    def update(self, batch, chunk_size=KERNEL_CHUNK_SIZE):
+        """
+        Fold a batch of students into the accumulator in one traversal
+
+        Args:
+            batch: StudentBatch (or list of student objects)
+            chunk_size: Rows per cache-resident chunk
+
+        Returns:
+            self, so calls can be chained
+        """
+        batch = StudentBatch.ensure(batch)
+        faculty_partial = None
+        grade_partial = None
+
+        for start in range(0, len(batch), chunk_size):
+            stop = start + chunk_size
+            chunk = StudentBatch(None, None, batch.cgpa[start:stop],
+                                 batch.faculty_codes[start:stop], batch.faculty_table,
+                                 batch.grade_codes[start:stop], batch.grade_table)
+
+            # Every aggregate is taken while the chunk is cache resident
+            overall = OVERALL_GROUPS.partial(chunk)
+            self._fold(
+                int(overall['count'][0]), float(overall['sum'][0]), float(overall['m2'][0]),
+                float(overall['min'][0]), float(overall['max'][0]),
+                int(np.count_nonzero(chunk.cgpa >= PASS_CGPA))
+            )
+            faculty = FACULTY_GROUPS.partial(chunk)
+            grade = GRADE_GROUPS.partial(chunk)
+            faculty_partial = faculty if faculty_partial is None else GroupBy.merge(faculty_partial, faculty)
+            grade_partial = grade if grade_partial is None else GroupBy.merge(grade_partial, grade)
+
+        if faculty_partial is not None:
+            faculty_groups = FACULTY_GROUPS.groups(faculty_partial, [batch.faculty_table])
+            self._add_counts(
+                {faculty: values['count'] for faculty, values in faculty_groups},
+                {faculty: values['sum'] for faculty, values in faculty_groups},
+                {grade: values['count'] for grade, values in GRADE_GROUPS.groups(grade_partial, [batch.grade_table])}
+            )
+        return self
+
+    def add(self, cgpa, faculty, grade):
+        """Add one student in O(1) (Welford update)"""
+        self._fold(1, cgpa, 0.0, cgpa, cgpa, int(cgpa >= PASS_CGPA))
+        self._add_counts({faculty: 1}, {faculty: cgpa}, {grade: 1})
+
+    def remove(self, cgpa, faculty, grade):
+        """
+        Remove one previously added student in O(1) (reverse Welford update)
+
+        min/max are not maintained on removal; callers that delete track
+        extremes themselves.
+        """
+        if self.count <= 1:
+            self.__init__()
+            return
+        old_mean = self.mean
+        self.count -= 1
+        self.total -= cgpa
+        self.m2 = max(0.0, self.m2 - (cgpa - old_mean) * (cgpa - self.mean))
+        self.passed -= int(cgpa >= PASS_CGPA)
+        self.faculty_counts[faculty] -= 1
+        self.faculty_sums[faculty] -= cgpa
+        if not self.faculty_counts[faculty]:
+            del self.faculty_counts[faculty]
+            del self.faculty_sums[faculty]
+        self.grade_counts[grade] -= 1
+        if not self.grade_counts[grade]:
+            del self.grade_counts[grade]
+
+    def merge(self, other):
+        """
+        Merge another accumulator (e.g. from another shard) into this one
+
+        Returns:
+            self, so calls can be chained
+        """
+        self._fold(other.count, other.total, other.m2, other.minimum, other.maximum, other.passed)
+        self._add_counts(other.faculty_counts, other.faculty_sums, other.grade_counts)
+        return self
+
+    def to_dict(self):
+        """Plain (XML-RPC / JSON serializable) state for shipping between replicas"""
+        return {
+            'count': self.count,
+            'total': self.total,
+            'm2': self.m2,
+            'min': self.min,
+            'max': self.max,
+            'passed': self.passed,
+            'faculty_counts': dict(self.faculty_counts),
+            'faculty_sums': dict(self.faculty_sums),
+            'grade_counts': dict(self.grade_counts)
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """Rebuild an accumulator from to_dict() output"""
+        accumulator = cls()
+        if state['count']:
+            accumulator._fold(state['count'], state['total'], state['m2'],
+                              state['min'], state['max'], state['passed'])
+        accumulator._add_counts(state['faculty_counts'], state['faculty_sums'], state['grade_counts'])
+        return accumulator
+
+
+def accumulate_chunk(cgpa, faculty_codes, grade_codes, faculty_table, grade_table):
+    """Summarize one column chunk into an accumulator (worker entry point)"""
+    chunk = StudentBatch(None, None, cgpa, faculty_codes, faculty_table, grade_codes, grade_table)
+    return StatsAccumulator().update(chunk)
+
+
+def merge_accumulators(partials):
+    """Reduce step: merge per-chunk accumulators in chunk order"""
+    result = StatsAccumulator()
+    for partial in partials:
+        result.merge(partial)
+    return result
+
+
+def kth_smallest(cgpa, ranks, order=None):
+    """
+    Exact k-th smallest CGPA values without sorting the whole column
+
+    Uses, in order of preference: an existing sort order (O(1) lookups), a
+    histogram over the fixed two-decimal CGPA domain when every value is an
+    exact hundredth (one counting pass), or introselect via np.partition.
+
+    Args:
+        cgpa: NumPy array of CGPA values
+        ranks: 0-based ranks to select
+        order: Optional permutation sorting cgpa (ascending or descending);
+               ignored unless it has exactly one position per value
+
+    Returns:
+        List of float values, one per rank
+    """
+    n = len(cgpa)
+    if order is not None and len(order) != n:
+        # A partial order (e.g. a top-K prefix) cannot answer arbitrary ranks
+        order = None
+    if order is not None:
+        order = np.asarray(order)
+        # A descending order holds rank r at position n - 1 - r
+        descending = n > 1 and cgpa[order[0]] > cgpa[order[-1]]
+        return [float(cgpa[order[n - 1 - rank if descending else rank]]) for rank in ranks]
+
+    keys = MergeSortService.fixed_precision_keys(cgpa)
+    if keys is not None:
+        histogram = np.bincount(keys, minlength=MergeSortService.MAX_CGPA_KEY + 1)
+        cumulative = np.cumsum(histogram)
+        positions = np.searchsorted(cumulative, np.asarray(ranks) + 1)
+        return [float(key / MergeSortService.CGPA_SCALE) for key in positions.tolist()]
+
+    selected = np.partition(cgpa, list(ranks))
+    return [float(selected[rank]) for rank in ranks]
+
+
+def exact_median(cgpa, order=None):
+    """
+    Exact median in linear time (see kth_smallest)
+
+    Args:
+        cgpa: NumPy array of CGPA values
+        order: Optional permutation sorting cgpa, reused when it covers every value
+
+    Returns:
+        Median as a float (0.0 for an empty array)
+    """
+    n = len(cgpa)
+    if not n:
+        return 0.0
+    if n % 2 == 1:
+        return kth_smallest(cgpa, [n // 2], order)[0]
+    lower, upper = kth_smallest(cgpa, [n // 2 - 1, n // 2], order)
+    return (lower + upper) / 2
+
+
+def fused_statistics(batch, chunk_size=KERNEL_CHUNK_SIZE):
+    """
+    Compute every Statistics aggregate of a batch in one traversal
+
+    Args:
+        batch: StudentBatch to summarize
+        chunk_size: Rows per chunk
+
+    Returns:
+        StatsAccumulator holding the batch's aggregates
+    """
+    return StatsAccumulator().update(batch, chunk_size)
@@ -3,8 +3,17 @@ Statistical Analysis Service Implementation
 Performs comprehensive statistical analysis on student data
 """
 
+import os
 import time
-from collections import defaultdict
+
+from services.group_by import GroupBy
+from services.mapreduce_executor import MapReduceExecutor
+from services.quantile_sketch import DEFAULT_PERCENTILES, QuantileSketch, merge_sketches, sketch_chunk
+from services.stats_kernel import (
+    StatsAccumulator, accumulate_chunk, exact_median, fused_statistics, merge_accumulators
+)
+from services.student_batch import StudentBatch
+from services.worker_pool import WorkerPool
 
 
 class StatsService:
@@ -12,58 +21,190 @@ class StatsService:
     Implements statistical analysis for student marks
     """
     
+    # Cohorts at least this large are summarized across the worker pool
+    PARALLEL_THRESHOLD = int(os.getenv('STATS_PARALLEL_THRESHOLD', '1000000'))
+    
+    # Chunked executor for sharded accumulation (STATS_WORKERS / MAPREDUCE_CHUNK_SIZE)
+    executor = MapReduceExecutor(workers=int(os.getenv('STATS_WORKERS', WorkerPool.default_workers())))
+    
+    # Cohorts up to this size get exact percentiles, larger ones are sketched
+    QUANTILE_EXACT_LIMIT = int(os.getenv('QUANTILE_EXACT_LIMIT', '100000'))
+    
+    # Analyses accepted by perform_analysis()
+    ANALYSIS_TYPES = ("avg_cgpa_faculty", "grade_distribution", "pass_rate", "percentiles", "all")
+    
     @staticmethod
-    def calculate_avg_cgpa_by_faculty(students):
-        """Calculate average CGPA per faculty"""
-        faculty_data = defaultdict(lambda: {'total_cgpa': 0, 'count': 0})
+    def accumulate(batch, executor=None):
+        """
+        Summarize a batch into a StatsAccumulator
         
-        for student in students:
-            faculty_data[student.faculty]['total_cgpa'] += student.cgpa
-            faculty_data[student.faculty]['count'] += 1
+        Large batches are split into shards, accumulated in the worker pool
+        and merged; the result equals a single-process scan.
         
+        Args:
+            batch: StudentBatch
+            executor: MapReduceExecutor to use (defaults to the shared one)
+        """
+        if len(batch) < StatsService.PARALLEL_THRESHOLD and executor is None:
+            return fused_statistics(batch)
+        executor = executor or StatsService.executor
+        return executor.run(
+            accumulate_chunk,
+            (batch.cgpa, batch.faculty_codes, batch.grade_codes),
+            args=(batch.faculty_table, batch.grade_table),
+            reduce=merge_accumulators
+        )
+    
+    @staticmethod
+    def aggregate(students):
+        """Convert students to a batch and accumulate its statistics"""
+        batch = StudentBatch.ensure(students)
+        return batch, StatsService.accumulate(batch)
+    
+    @staticmethod
+    def faculty_stats(accumulator):
+        """Average CGPA per faculty from an accumulator"""
         result = []
-        for faculty, data in faculty_data.items():
-            avg_cgpa = data['total_cgpa'] / data['count']
+        for faculty, count in accumulator.faculty_counts.items():
             result.append({
                 'faculty': faculty,
-                'average_cgpa': avg_cgpa,
-                'student_count': data['count']
+                'average_cgpa': accumulator.faculty_sums[faculty] / count,
+                'student_count': count
             })
-        
         return result
     
     @staticmethod
-    def calculate_grade_distribution(students):
-        """Calculate grade distribution with percentages"""
-        grade_counts = defaultdict(int)
-        total_students = len(students)
-        
-        for student in students:
-            grade_counts[student.grade] += 1
+    def grade_distribution(accumulator):
+        """Grade distribution with percentages from an accumulator"""
+        total_students = accumulator.count
         
         result = []
-        for grade, count in sorted(grade_counts.items()):
+        for grade, count in sorted(accumulator.grade_counts.items()):
             percentage = (count / total_students) * 100 if total_students > 0 else 0
             result.append({
                 'grade': grade,
                 'count': count,
                 'percentage': percentage
             })
+        return result
+    
+    @staticmethod
+    def pass_rate(accumulator):
+        """Pass rate (CGPA >= 2.0) from an accumulator"""
+        if not accumulator.count:
+            return 0.0
+        return (accumulator.passed / accumulator.count) * 100
+    
+    @staticmethod
+    def percentile_sketches(batch, exact=None, executor=None):
+        """
+        Quantile sketches of CGPA overall and per faculty
         
+        Large batches are sketched per chunk in the worker pool and merged.
+        
+        Args:
+            batch: StudentBatch
+            exact: Keep every value (default: only up to QUANTILE_EXACT_LIMIT rows)
+            executor: MapReduceExecutor to use (defaults to the shared one)
+        
+        Returns:
+            Tuple of (overall QuantileSketch, {faculty: QuantileSketch})
+        """
+        if exact is None:
+            exact = len(batch) <= StatsService.QUANTILE_EXACT_LIMIT
+        if len(batch) < StatsService.PARALLEL_THRESHOLD and executor is None:
+            return sketch_chunk(batch.cgpa, batch.faculty_codes, batch.faculty_table, exact, None)
+        executor = executor or StatsService.executor
+        return executor.run(
+            sketch_chunk,
+            (batch.cgpa, batch.faculty_codes),
+            args=(batch.faculty_table, exact, None),
+            reduce=merge_sketches
+        )
+    
+    @staticmethod
+    def percentile_values(sketch, percentiles=DEFAULT_PERCENTILES):
+        """Read percentiles from a sketch as {'p10': value, ...}"""
+        values = sketch.quantiles([percentile / 100 for percentile in percentiles])
+        return {f"p{percentile:g}": value for percentile, value in zip(percentiles, values)}
+    
+    @staticmethod
+    def percentile_report(batch, percentiles=DEFAULT_PERCENTILES, exact=None):
+        """CGPA percentiles overall and by faculty from one set of sketches"""
+        overall, by_faculty = StatsService.percentile_sketches(batch, exact)
+        return StatsService.sketch_report(overall, by_faculty, percentiles)
+    
+    @staticmethod
+    def sketch_report(overall, by_faculty, percentiles=DEFAULT_PERCENTILES):
+        """CGPA percentiles overall and by faculty from already built sketches"""
+        return {
+            'overall': StatsService.percentile_values(overall, percentiles),
+            'by_faculty': {
+                faculty: StatsService.percentile_values(sketch, percentiles)
+                for faculty, sketch in by_faculty.items()
+            },
+            'exact': overall.is_exact()
+        }
+    
+    @staticmethod
+    def calculate_percentiles(students, percentiles=DEFAULT_PERCENTILES, exact=None):
+        """
+        Calculate CGPA percentiles overall and per faculty
+        
+        Args:
+            students: List of student objects or a StudentBatch
+            percentiles: Percentiles to report (0-100)
+            exact: Force exact (True) or sketched (False) percentiles;
+                   by default cohorts up to QUANTILE_EXACT_LIMIT rows are exact
+        
+        Returns:
+            Dictionary with overall, by_faculty, exact and processing_time
+        """
+        start_time = time.time()
+        batch = StudentBatch.ensure(students)
+        result = StatsService.percentile_report(batch, percentiles, exact)
+        result['processing_time'] = time.time() - start_time
         return result
     
+    @staticmethod
+    def calculate_group_by(students, keys, aggregates=('count', 'mean')):
+        """
+        Arbitrary CGPA breakdown on the group-by engine
+        
+        Args:
+            students: List of student objects or a StudentBatch
+            keys: Group keys, any of "faculty", "grade", "cgpa_bucket"
+            aggregates: Any of count, sum, mean, min, max, std
+        
+        Returns:
+            Dictionary with groups (one flat dict per non-empty group) and processing_time
+        """
+        start_time = time.time()
+        groups = GroupBy(keys, aggregates).rows(StudentBatch.ensure(students))
+        return {
+            'groups': groups,
+            'processing_time': time.time() - start_time
+        }
+    
+    @staticmethod
+    def calculate_avg_cgpa_by_faculty(students):
+        """Calculate average CGPA per faculty"""
+        _, accumulator = StatsService.aggregate(students)
+        return StatsService.faculty_stats(accumulator)
+    
+    @staticmethod
+    def calculate_grade_distribution(students):
+        """Calculate grade distribution with percentages"""
+        _, accumulator = StatsService.aggregate(students)
+        return StatsService.grade_distribution(accumulator)
+    
     @staticmethod
     def calculate_pass_rate(students):
         """
         Calculate pass rate (assuming CGPA >= 2.0 is passing)
         """
-        if not students:
-            return 0.0
-        
-        passed = sum(1 for student in students if student.cgpa >= 2.0)
-        pass_rate = (passed / len(students)) * 100
-        
-        return pass_rate
+        _, accumulator = StatsService.aggregate(students)
+        return StatsService.pass_rate(accumulator)
     
     @staticmethod
     def perform_analysis(students, analysis_type):
@@ -71,28 +212,45 @@ class StatsService:
         Perform statistical analysis on student data
         
         Args:
-            students: List of student objects
+            students: List of student objects or a StudentBatch
             analysis_type: Type of analysis to perform
         
         Returns:
-            Dictionary with analysis results and processing time
+            Dictionary with analysis results, mean_cgpa, std_dev, min, max,
+            total_count and processing time (all taken from one accumulator)
+        
+        Raises:
+            ValueError: If analysis_type is not one of ANALYSIS_TYPES
         """
+        if analysis_type not in StatsService.ANALYSIS_TYPES:
+            raise ValueError(f"Unknown analysis type: {analysis_type}")
+        
         start_time = time.time()
+        batch, accumulator = StatsService.aggregate(students)
         
         result = {
             'faculty_stats': [],
             'grade_distribution': [],
-            'pass_rate': 0.0
+            'pass_rate': 0.0,
+            'percentiles': {},
+            'mean_cgpa': accumulator.mean,
+            'std_dev': accumulator.std_dev,
+            'min': accumulator.min,
+            'max': accumulator.max,
+            'total_count': accumulator.count
         }
         
         if analysis_type in ["avg_cgpa_faculty", "all"]:
-            result['faculty_stats'] = StatsService.calculate_avg_cgpa_by_faculty(students)
+            result['faculty_stats'] = StatsService.faculty_stats(accumulator)
         
         if analysis_type in ["grade_distribution", "all"]:
-            result['grade_distribution'] = StatsService.calculate_grade_distribution(students)
+            result['grade_distribution'] = StatsService.grade_distribution(accumulator)
         
         if analysis_type in ["pass_rate", "all"]:
-            result['pass_rate'] = StatsService.calculate_pass_rate(students)
+            result['pass_rate'] = StatsService.pass_rate(accumulator)
+        
+        if analysis_type in ["percentiles", "all"]:
+            result['percentiles'] = StatsService.percentile_report(batch)
         
         processing_time = time.time() - start_time
         
@@ -100,64 +258,126 @@ class StatsService:
         return result
     
     @staticmethod
-    def calculate_statistics(students):
+    def calculate_statistics(students, order=None, percentiles=()):
         """
         Comprehensive statistical analysis wrapper
-        Calculates mean, median, std dev, and distributions
+        Calculates mean, median, std dev and distributions (one accumulator
+        scan and a linear-time median); CGPA percentiles take an extra
+        sketching pass and are only computed when requested
         
         Args:
-            students: List of student objects
+            students: List of student objects or a StudentBatch
+            order: Optional CGPA sort order of the students (e.g. from
+                   MergeSortService.sort_order) reused for the median
+            percentiles: Percentiles to report overall and by faculty
+                         (e.g. DEFAULT_PERCENTILES); empty skips them
         
         Returns:
             Dictionary with statistics and processing_time
         """
         start_time = time.time()
         
-        if not students:
+        batch, accumulator = StatsService.aggregate(students)
+        n = accumulator.count
+        if not n:
             return {
                 'statistics': {},
                 'processing_time': 0.0
             }
         
-        # Calculate CGPA statistics
-        cgpas = [s.cgpa for s in students]
-        cgpas_sorted = sorted(cgpas)
-        n = len(cgpas)
-        
-        mean_cgpa = sum(cgpas) / n
-        median_cgpa = cgpas_sorted[n // 2] if n % 2 == 1 else (cgpas_sorted[n // 2 - 1] + cgpas_sorted[n // 2]) / 2
+        # Median by linear-time selection instead of a full sort
+        median_cgpa = exact_median(batch.cgpa, order)
         
-        # Standard deviation
-        variance = sum((x - mean_cgpa) ** 2 for x in cgpas) / n
-        std_dev = variance ** 0.5
+        # Faculty and grade distribution
+        faculty_counts = dict(accumulator.faculty_counts)
+        grade_counts = dict(accumulator.grade_counts)
         
-        # Faculty distribution
-        faculty_counts = defaultdict(int)
-        for student in students:
-            faculty_counts[student.faculty] += 1
+        statistics = {
+            'cgpa': {
+                'mean': accumulator.mean,
+                'median': median_cgpa,
+                'std_dev': accumulator.std_dev,
+                'min': accumulator.min,
+                'max': accumulator.max
+            },
+            'distribution': {
+                'total_students': n,
+                'total_faculties': len(faculty_counts),
+                'by_faculty': faculty_counts,
+                'by_grade': grade_counts
+            }
+        }
         
-        # Grade distribution
-        grade_counts = defaultdict(int)
-        for student in students:
-            grade_counts[student.grade] += 1
+        # CGPA percentiles overall and by faculty, only when asked for
+        if percentiles:
+            statistics['percentiles'] = StatsService.percentile_report(batch, percentiles)
         
         processing_time = time.time() - start_time
         
         return {
-            'statistics': {
-                'cgpa': {
-                    'mean': mean_cgpa,
-                    'median': median_cgpa,
-                    'std_dev': std_dev,
-                    'min': min(cgpas),
-                    'max': max(cgpas)
-                },
-                'distribution': {
-                    'total_students': len(students),
-                    'total_faculties': len(faculty_counts),
-                    'by_faculty': dict(faculty_counts),
-                    'by_grade': dict(grade_counts)
-                }
-            },
+            'statistics': statistics,
             'processing_time': processing_time
         }
+
+
+class StatsStream:
+    """
+    Statistical analysis over a cohort that arrives in batches (e.g. a chain stream)
+
+    Each batch is folded into a running StatsAccumulator and merged into the
+    running quantile sketches as soon as it is added, so only the summaries
+    are kept and results() equals perform_analysis(..., "all") over the
+    concatenated batches. Percentiles stay exact until the running count
+    passes QUANTILE_EXACT_LIMIT; from then on the sketches compact, like a
+    unary request for a cohort that large.
+    """
+    
+    def __init__(self, exact_limit=None, executor=None):
+        """
+        Args:
+            exact_limit: Rows kept for exact percentiles (default: QUANTILE_EXACT_LIMIT)
+            executor: MapReduceExecutor to use (defaults to the shared one for large batches)
+        """
+        self.exact_limit = StatsService.QUANTILE_EXACT_LIMIT if exact_limit is None else exact_limit
+        self.executor = executor
+        self.accumulator = StatsAccumulator()
+        self.sketches = None
+        self.processing_time = 0.0
+    
+    @property
+    def count(self):
+        return self.accumulator.count
+    
+    def add(self, batch):
+        """Fold one batch (StudentBatch or student objects) into the running summaries"""
+        start_time = time.time()
+        batch = StudentBatch.ensure(batch)
+        self.accumulator.merge(StatsService.accumulate(batch, self.executor))
+        sketches = StatsService.percentile_sketches(batch, self.count <= self.exact_limit, self.executor)
+        self.sketches = sketches if self.sketches is None else merge_sketches([self.sketches, sketches])
+        self.processing_time += time.time() - start_time
+    
+    def results(self):
+        """
+        Analysis of every batch added so far
+        
+        Returns:
+            Dictionary shaped like perform_analysis(..., "all"); processing_time
+            is the time spent folding batches, not waiting for them
+        """
+        start_time = time.time()
+        accumulator = self.accumulator
+        overall, by_faculty = self.sketches or (QuantileSketch(exact=True), {})
+        result = {
+            'faculty_stats': StatsService.faculty_stats(accumulator),
+            'grade_distribution': StatsService.grade_distribution(accumulator),
+            'pass_rate': StatsService.pass_rate(accumulator),
+            'percentiles': StatsService.sketch_report(overall, by_faculty),
+            'mean_cgpa': accumulator.mean,
+            'std_dev': accumulator.std_dev,
+            'min': accumulator.min,
+            'max': accumulator.max,
+            'total_count': accumulator.count
+        }
+        result['processing_time'] = self.processing_time + time.time() - start_time
+        return result
@@ -0,0 +1,207 @@
+"""
+Columnar Student Batch
+Array-backed representation of a student cohort shared by all services
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+
+# Grade letters of the university grading scale, best first
+GRADE_LETTERS = ['A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F']
+
+
+def grade_sort_key(grade):
+    """Order grade letters A, A-, B+ ... F with unknown grades last"""
+    if grade in GRADE_LETTERS:
+        return (0, GRADE_LETTERS.index(grade), grade)
+    return (1, 0, grade)
+
+
+# Row view returned when a batch is indexed or iterated
+StudentRecord = namedtuple('StudentRecord', ['student_id', 'name', 'faculty', 'cgpa', 'grade'])
+
+
+class StudentBatch:
+    """
+    Columnar student cohort
+
+    CGPA values are held in a float64 NumPy array, faculty and grade are
+    dictionary-encoded as integer codes into small string tables (kept in
+    first-appearance order), and student IDs / names are plain sequences.
+    Indexing or iterating yields StudentRecord rows so code written against
+    per-student objects keeps working.
+    """
+
+    __slots__ = ('student_ids', 'names', 'cgpa',
+                 'faculty_codes', 'faculty_table', 'grade_codes', 'grade_table')
+
+    def __init__(self, student_ids, names, cgpa, faculty_codes, faculty_table, grade_codes, grade_table):
+        self.student_ids = student_ids
+        self.names = names
+        self.cgpa = np.asarray(cgpa, dtype=np.float64)
+        self.faculty_codes = np.asarray(faculty_codes, dtype=np.int32)
+        self.faculty_table = list(faculty_table)
+        self.grade_codes = np.asarray(grade_codes, dtype=np.int32)
+        self.grade_table = list(grade_table)
+
+    @staticmethod
+    def encode(values):
+        """
+        Dictionary-encode a sequence of strings
+
+        Returns:
+            Tuple of (int32 code array, string table in first-appearance order)
+        """
+        lookup = {}
+        codes = np.fromiter(
+            (lookup.setdefault(value, len(lookup)) for value in values),
+            dtype=np.int32
+        )
+        return codes, list(lookup)
+
+    @classmethod
+    def from_columns(cls, student_ids, names, faculties, cgpas, grades):
+        """Build a batch from decoded column sequences"""
+        faculty_codes, faculty_table = cls.encode(faculties)
+        grade_codes, grade_table = cls.encode(grades)
+        return cls(
+            list(student_ids), list(names), np.asarray(cgpas, dtype=np.float64),
+            faculty_codes, faculty_table, grade_codes, grade_table
+        )
+
+    @classmethod
+    def from_students(cls, students):
+        """
+        Build a batch from per-student objects (e.g. protobuf Student messages)
+
+        Args:
+            students: Iterable of objects with student_id, name, faculty, cgpa, grade
+        """
+        student_ids = []
+        names = []
+        cgpas = []
+        faculties = []
+        grades = []
+        for student in students:
+            student_ids.append(student.student_id)
+            names.append(student.name)
+            faculties.append(student.faculty or '')
+            cgpas.append(student.cgpa)
+            grades.append(student.grade)
+        return cls.from_columns(student_ids, names, faculties, cgpas, grades)
+
+    @classmethod
+    def from_dicts(cls, rows):
+        """
+        Build a batch from student dictionaries (XML-RPC payload)
+
+        Args:
+            rows: Iterable of dicts with student_id, name, cgpa, grade and optional faculty
+        """
+        student_ids = []
+        names = []
+        cgpas = []
+        faculties = []
+        grades = []
+        for row in rows:
+            student_ids.append(row['student_id'])
+            names.append(row['name'])
+            faculties.append(row.get('faculty') or '')
+            cgpas.append(row['cgpa'])
+            grades.append(row['grade'])
+        return cls.from_columns(student_ids, names, faculties, cgpas, grades)
+
+    @classmethod
+    def ensure(cls, students):
+        """Return students as a StudentBatch, converting per-student objects if needed"""
+        if isinstance(students, cls):
+            return students
+        return cls.from_students(students)
+
+    @classmethod
+    def concat(cls, batches):
+        """
+        Concatenate batches, merging their string tables
+
+        Codes of every batch are remapped into one table per column (kept in
+        first-appearance order across the batches) with a vectorized lookup.
+        """
+        student_ids = []
+        names = []
+        cgpas = []
+        faculty_codes = []
+        grade_codes = []
+        faculty_lookup = {}
+        grade_lookup = {}
+        for batch in batches:
+            student_ids.extend(batch.student_ids)
+            names.extend(batch.names)
+            cgpas.append(batch.cgpa)
+            for codes, table, lookup, output in (
+                (batch.faculty_codes, batch.faculty_table, faculty_lookup, faculty_codes),
+                (batch.grade_codes, batch.grade_table, grade_lookup, grade_codes),
+            ):
+                remap = np.array([lookup.setdefault(value, len(lookup)) for value in table], dtype=np.int32)
+                output.append(remap[codes] if len(remap) else codes)
+        return cls(
+            student_ids, names,
+            np.concatenate(cgpas) if cgpas else np.empty(0),
+            np.concatenate(faculty_codes) if faculty_codes else np.empty(0, dtype=np.int32), list(faculty_lookup),
+            np.concatenate(grade_codes) if grade_codes else np.empty(0, dtype=np.int32), list(grade_lookup)
+        )
+
+    def __len__(self):
+        return len(self.cgpa)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self))[index])
+        return StudentRecord(
+            self.student_ids[index],
+            self.names[index],
+            self.faculty_table[self.faculty_codes[index]],
+            float(self.cgpa[index]),
+            self.grade_table[self.grade_codes[index]]
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def take(self, indices):
+        """
+        Select rows by position, sharing the string tables
+
+        Args:
+            indices: Integer array or sequence of row positions
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return StudentBatch(
+            self.take_values(self.student_ids, indices),
+            self.take_values(self.names, indices),
+            self.cgpa[indices],
+            self.faculty_codes[indices], self.faculty_table,
+            self.grade_codes[indices], self.grade_table
+        )
+
+    @staticmethod
+    def take_values(values, indices):
+        """Select positions of a string column (columns with their own take() gather without decoding)"""
+        if hasattr(values, 'take'):
+            return values.take(indices)
+        return [values[i] for i in indices.tolist()]
+
+    def to_dicts(self):
+        """Convert rows to XML-RPC serializable student dictionaries"""
+        return [
+            {
+                'student_id': str(record.student_id),
+                'name': str(record.name),
+                'faculty': str(record.faculty),
+                'cgpa': record.cgpa,
+                'grade': str(record.grade)
+            }
+            for record in self
+        ]
@@ -0,0 +1,58 @@
+"""
+Worker Pool
+Long-lived process pool shared by the CPU-bound services
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+class WorkerPool:
+    """
+    Lazily created process pool that lives for the whole service process
+
+    Workers are started with the 'spawn' method so the pool is safe to create
+    from inside a running gRPC / XML-RPC server (no forking of server threads).
+    """
+
+    _executor = None
+    _workers = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def default_workers():
+        """Worker count from SERVICE_WORKERS, defaulting to the number of CPUs"""
+        return max(1, int(os.getenv('SERVICE_WORKERS', os.cpu_count() or 1)))
+
+    @classmethod
+    def get(cls, workers=None):
+        """
+        Return the shared pool, creating it on first use
+
+        The pool is sized once per process (the larger of the first request
+        and default_workers()) and is never replaced while the service runs,
+        so concurrent callers can always submit to it. Callers asking for
+        more workers than the pool holds simply queue on it.
+
+        Args:
+            workers: Number of worker processes the caller would like
+        """
+        with cls._lock:
+            if cls._executor is None:
+                cls._workers = max(workers or 1, cls.default_workers())
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=cls._workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return cls._executor
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the shared pool (it is recreated on the next get())"""
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=True)
+                cls._executor = None
+                cls._workers = 0
@@ -0,0 +1,114 @@
+"""
+Baseline Implementations
+The original per-student services, kept as the reference the optimized code must match
+"""
+
+from collections import defaultdict
+
+
+def map_cgpa(student):
+    """Original MapReduceService.map_cgpa: CGPA category of one student"""
+    cgpa = student.cgpa
+    if cgpa >= 3.68:
+        return ("A (3.68-4.00)", 1)
+    elif cgpa >= 3.50:
+        return ("A- (3.50-3.67)", 1)
+    elif cgpa >= 3.33:
+        return ("B+ (3.33-3.49)", 1)
+    elif cgpa >= 3.00:
+        return ("B (3.00-3.32)", 1)
+    elif cgpa >= 2.83:
+        return ("B- (2.83-2.99)", 1)
+    elif cgpa >= 2.67:
+        return ("C+ (2.67-2.82)", 1)
+    elif cgpa >= 2.50:
+        return ("C (2.50-2.66)", 1)
+    elif cgpa >= 2.33:
+        return ("C- (2.33-2.49)", 1)
+    elif cgpa >= 2.17:
+        return ("D+ (2.17-2.32)", 1)
+    elif cgpa >= 2.00:
+        return ("D (2.00-2.16)", 1)
+    elif cgpa >= 1.67:
+        return ("D- (1.67-1.99)", 1)
+    else:
+        return ("F (0.00-1.66)", 1)
+
+
+def cgpa_classification(students):
+    """Original map + reduce_counts over a student list"""
+    result = defaultdict(int)
+    for key, value in map(map_cgpa, students):
+        result[key] += value
+    return dict(result)
+
+
+def merge(left, right):
+    """Original MergeSortService.merge (CGPA descending, ties keep input order)"""
+    result = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        if left[i].cgpa >= right[j].cgpa:
+            result.append(left[i])
+            i += 1
+        else:
+            result.append(right[j])
+            j += 1
+    result.extend(left[i:])
+    result.extend(right[j:])
+    return result
+
+
+def merge_sort(students):
+    """Original recursive MergeSortService.merge_sort"""
+    if len(students) <= 1:
+        return students
+    mid = len(students) // 2
+    return merge(merge_sort(students[:mid]), merge_sort(students[mid:]))
+
+
+def avg_cgpa_by_faculty(students):
+    """Original StatsService.calculate_avg_cgpa_by_faculty"""
+    faculty_data = defaultdict(lambda: {'total_cgpa': 0, 'count': 0})
+    for student in students:
+        faculty_data[student.faculty]['total_cgpa'] += student.cgpa
+        faculty_data[student.faculty]['count'] += 1
+    return [
+        {'faculty': faculty, 'average_cgpa': data['total_cgpa'] / data['count'], 'student_count': data['count']}
+        for faculty, data in faculty_data.items()
+    ]
+
+
+def grade_distribution(students):
+    """Original StatsService.calculate_grade_distribution"""
+    grade_counts = defaultdict(int)
+    for student in students:
+        grade_counts[student.grade] += 1
+    return [
+        {'grade': grade, 'count': count, 'percentage': (count / len(students)) * 100}
+        for grade, count in sorted(grade_counts.items())
+    ]
+
+
+def pass_rate(students):
+    """Original StatsService.calculate_pass_rate (CGPA >= 2.0 passes)"""
+    if not students:
+        return 0.0
+    return (sum(1 for student in students if student.cgpa >= 2.0) / len(students)) * 100
+
+
+def cgpa_statistics(students):
+    """Original StatsService.calculate_statistics CGPA summary (mean, median, std_dev, min, max)"""
+    cgpas = [s.cgpa for s in students]
+    cgpas_sorted = sorted(cgpas)
+    n = len(cgpas)
+    mean_cgpa = sum(cgpas) / n
+    median_cgpa = cgpas_sorted[n // 2] if n % 2 == 1 else (cgpas_sorted[n // 2 - 1] + cgpas_sorted[n // 2]) / 2
+    variance = sum((x - mean_cgpa) ** 2 for x in cgpas) / n
+    return {
+        'mean': mean_cgpa,
+        'median': median_cgpa,
+        'std_dev': variance ** 0.5,
+        'min': min(cgpas),
+        'max': max(cgpas)
+    }
@@ -0,0 +1,40 @@
+"""
+Shared fixtures: the repository root and generated gRPC code on sys.path, and seeded random cohorts
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+# Generated protobuf modules (student_service_pb2, student_service_pb2_grpc)
+sys.path.append(os.path.join(ROOT, 'grpc_implementation', 'server', 'generated'))
+
+from services.student_batch import GRADE_LETTERS, StudentRecord  # noqa: E402
+
+
+# Faculties of the generated cohorts (one non-ASCII name exercises the UTF-8 paths)
+FACULTIES = ['Engineering', 'Science', 'Arts', 'Business', 'Médecine']
+
+
+def make_students(count, seed=0):
+    """
+    Seeded random cohort of StudentRecords
+
+    CGPAs have two decimals, so ties, category boundaries and the
+    counting-sort path are all exercised.
+    """
+    rng = random.Random(seed)
+    return [
+        StudentRecord(f"S{index:05d}", f"Student {rng.randrange(count)} Ñ", rng.choice(FACULTIES),
+                      round(rng.uniform(0.0, 4.0), 2), rng.choice(GRADE_LETTERS))
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def students():
+    return make_students(2000)
@@ -0,0 +1,59 @@
+"""
+Columnar datasets: .stcol files round-trip the cohort and load memory-mapped with lazy strings
+"""
+
+import csv
+import pickle
+
+import numpy as np
+import pytest
+
+from services.columnar_dataset import StringColumn, convert_csv, iter_dataset_chunks, open_dataset, write_dataset
+from services.csv_loader import iter_batches, load_batch
+from services.mapreduce_service import MapReduceService
+from services.student_batch import StudentBatch
+from tests import baseline
+
+
+def test_dataset_round_trip(students, tmp_path):
+    path = str(tmp_path / 'students.stcol')
+    chunks = [StudentBatch.from_students(students[start:start + 600]) for start in range(0, len(students), 600)]
+    assert write_dataset(chunks, path) == len(students)
+    dataset = open_dataset(path)
+    assert isinstance(dataset.names, StringColumn)
+    assert list(dataset) == students
+    assert list(load_batch(path)) == students
+    assert [len(chunk['cgpa']) for chunk in iter_dataset_chunks(path, 900)] == [900, 900, 200]
+    assert list(StudentBatch.concat(iter_batches(path, 700))) == students
+    assert MapReduceService.perform_mapreduce(dataset)['cgpa_classification'] == \
+        baseline.cgpa_classification(students)
+
+
+def test_convert_csv(students, tmp_path):
+    csv_path = tmp_path / 'cohort.csv'
+    with open(csv_path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(('student_id', 'name', 'faculty', 'cgpa', 'grade'))
+        writer.writerows(students)
+    path, count = convert_csv(str(csv_path), str(tmp_path / 'cohort.stcol'), chunk_rows=500)
+    assert count == len(students)
+    assert list(open_dataset(path)) == students
+
+
+def test_string_column_access_and_pickling():
+    values = ['a', 'Ñb', '', 'cdé']
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.cumsum([0] + [len(value) for value in encoded])
+    column = StringColumn(offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    assert len(column) == 4
+    assert list(column) == values
+    assert (column[1], column[-1]) == ('Ñb', 'cdé')
+    assert list(column.take(np.array([3, 0, 3]))) == ['cdé', 'a', 'cdé']
+    assert list(pickle.loads(pickle.dumps(column))) == values
+
+
+def test_non_dataset_file_is_rejected(tmp_path):
+    path = tmp_path / 'not.stcol'
+    path.write_bytes(b'student_id,name\n')
+    with pytest.raises(ValueError):
+        open_dataset(str(path))
@@ -0,0 +1,80 @@
+"""
+Columnar wire format: packed StudentColumns messages round-trip the cohort, feed the
+services like the baseline, and reject malformed input
+"""
+
+import numpy as np
+import pytest
+
+from services.columnar_dataset import StringColumn, encode_strings, pack_columns, unpack_columns
+from services.mapreduce_service import MapReduceService
+from services.mergesort_service import MergeSortService
+from services.student_batch import StudentBatch
+from tests import baseline
+
+student_service_pb2 = pytest.importorskip('student_service_pb2')
+
+
+def packed(students):
+    message = pack_columns(StudentBatch.from_students(students), student_service_pb2.StudentColumns())
+    # Go through the wire bytes, like a real request
+    return student_service_pb2.StudentColumns.FromString(message.SerializeToString())
+
+
+def test_columns_round_trip(students):
+    batch = unpack_columns(packed(students))
+    assert isinstance(batch.student_ids, StringColumn)
+    assert list(batch) == students
+    assert list(batch.take(np.array([3, 1]))) == [students[3], students[1]]
+
+
+def test_services_on_unpacked_columns_match_baseline(students):
+    batch = unpack_columns(packed(students))
+    assert MapReduceService.perform_mapreduce(batch)['cgpa_classification'] == baseline.cgpa_classification(students)
+    sorted_batch = MergeSortService.perform_sort(batch)['sorted_students']
+    assert list(sorted_batch) == baseline.merge_sort(list(students))
+    # A sorted result re-packs without decoding its strings
+    assert list(unpack_columns(pack_columns(sorted_batch, student_service_pb2.StudentColumns()))) == list(sorted_batch)
+
+
+def test_empty_columns():
+    assert len(unpack_columns(packed([]))) == 0
+
+
+def test_encode_strings_offsets():
+    offsets, data = encode_strings(['a', 'Ñb', ''])
+    assert offsets.tolist() == [0, 1, 4, 4]
+    assert data.decode('utf-8') == 'aÑb'
+
+
+def corrupt(columns, **fields):
+    message = student_service_pb2.StudentColumns()
+    message.CopyFrom(columns)
+    for name, value in fields.items():
+        setattr(message, name, value)
+    return message
+
+
+@pytest.mark.parametrize('fields', [
+    {'faculty_codes': b''},
+    {'grade_codes': np.full(5, 99, dtype='<i4').tobytes()},
+    {'student_id_offsets': np.array([0, 1], dtype='<i4').tobytes()},
+    {'name_offsets': np.array([0, 2, 40, 30, 30, 30], dtype='<i4').tobytes()},
+])
+def test_malformed_columns_are_rejected(students, fields):
+    with pytest.raises(ValueError):
+        unpack_columns(corrupt(packed(students[:5]), **fields))
+
+
+def test_invalid_utf8_is_rejected_up_front(students):
+    columns = packed(students[:5])
+    data = bytearray(columns.name_data)
+    data[0] = 0xFF
+    with pytest.raises(ValueError, match='UTF-8'):
+        unpack_columns(corrupt(columns, name_data=bytes(data)))
+
+
+def test_offsets_splitting_a_character_are_rejected(students):
+    columns = packed([students[0]._replace(name='Ñ'), students[1]._replace(name='a')])
+    with pytest.raises(ValueError, match='split'):
+        unpack_columns(corrupt(columns, name_offsets=np.array([0, 1, 3], dtype='<i4').tobytes()))
@@ -0,0 +1,51 @@
+"""
+CSV loader: chunked parsing must equal the csv module row by row
+"""
+
+import csv
+import os
+
+import pytest
+import student_service_pb2
+
+from services import csv_loader
+from services.csv_loader import iter_batches, iter_dict_batches, iter_proto_batches, load_batch
+from services.student_batch import StudentBatch
+from tests.conftest import ROOT
+
+SAMPLE_CSV = os.path.join(ROOT, 'data', 'students.csv')
+
+
+def csv_rows(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        return [{**row, 'cgpa': float(row['cgpa'])} for row in csv.DictReader(file)]
+
+
+def test_csv_loader_matches_csv_module():
+    rows = csv_rows(SAMPLE_CSV)
+    assert load_batch(SAMPLE_CSV).to_dicts() == rows
+    assert StudentBatch.concat(iter_batches(SAMPLE_CSV, 7)).to_dicts() == rows
+
+
+def test_dict_and_proto_batches(students, tmp_path):
+    path = tmp_path / 'cohort.csv'
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(('grade', 'cgpa', 'extra', 'faculty', 'name', 'student_id'))
+        writer.writerows((s.grade, s.cgpa, 'x', s.faculty, s.name, s.student_id) for s in students)
+    expected = [student._asdict() for student in students]
+    batches = list(iter_dict_batches(str(path), 300))
+    assert [len(batch) for batch in batches][:2] == [300, 300]
+    assert [row for batch in batches for row in batch] == expected
+    messages = [message for batch in iter_proto_batches(str(path), student_service_pb2.Student, 300)
+                for message in batch]
+    assert [(m.student_id, m.name, m.faculty, m.cgpa, m.grade) for m in messages] == \
+        [tuple(row.values()) for row in expected]
+
+
+def test_missing_column_is_rejected(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_loader, 'pd', None)
+    path = tmp_path / 'broken.csv'
+    path.write_text('student_id,name,cgpa\nS1,A,3.0\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_batch(str(path))
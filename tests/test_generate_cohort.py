@@ -0,0 +1,53 @@
+"""
+Cohort generator: a seed always yields the same cohort, recorded next to the output
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from services.columnar_dataset import open_dataset
+from services.csv_loader import cohort_info, load_batch
+from tests.conftest import ROOT
+
+sys.path.append(os.path.join(ROOT, 'tools'))
+import generate_cohort  # noqa: E402
+
+
+def columns(batches):
+    return [(list(batch.student_ids), list(batch.names), batch.cgpa.tolist(),
+             list(batch.faculty_table), batch.faculty_codes.tolist(), batch.grade_codes.tolist())
+            for batch in batches]
+
+
+def test_same_seed_gives_the_same_cohort():
+    assert columns(generate_cohort.generate_batches(3000, seed=5)) == \
+        columns(generate_cohort.generate_batches(3000, seed=5))
+    assert columns(generate_cohort.generate_batches(3000, seed=5)) != \
+        columns(generate_cohort.generate_batches(3000, seed=6))
+
+
+def test_chunks_do_not_depend_on_cohort_size(monkeypatch):
+    monkeypatch.setattr(generate_cohort, 'GENERATOR_CHUNK_ROWS', 1000)
+    small = list(generate_cohort.generate_batches(2000, seed=5))
+    large = list(generate_cohort.generate_batches(2500, seed=5))
+    assert [batch.cgpa.tolist() for batch in small] == [batch.cgpa.tolist() for batch in large[:2]]
+
+
+def test_grades_follow_the_cgpa_scale():
+    [batch] = generate_cohort.generate_batches(2000, seed=1)
+    assert np.all((batch.cgpa >= 0) & (batch.cgpa <= 4))
+    assert all(record.grade == generate_cohort.GRADE_LETTERS[code]
+               for record, code in zip(batch, generate_cohort.cgpa_bucket_codes(batch.cgpa).tolist()))
+
+
+def test_written_cohorts_record_rows_and_seed(tmp_path):
+    csv_path = str(tmp_path / 'cohort.csv')
+    dataset_path = str(tmp_path / 'cohort.stcol')
+    assert generate_cohort.write_cohort(1500, 9, csv_path) == 1500
+    assert generate_cohort.write_cohort(1500, 9, dataset_path) == 1500
+    assert list(load_batch(csv_path)) == list(open_dataset(dataset_path))
+    assert cohort_info(csv_path) == {'path': os.path.abspath(csv_path), 'rows': 1500, 'seed': 9}
+    assert cohort_info(dataset_path, rows=10)['rows'] == 10
+    assert cohort_info(os.path.join(ROOT, 'data', 'students.csv'))['seed'] is None
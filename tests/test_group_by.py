@@ -0,0 +1,63 @@
+"""
+Group-by engine against per-student Python grouping
+"""
+
+from collections import defaultdict
+
+import pytest
+
+from services.group_by import GroupBy
+from services.stats_service import StatsService
+from services.student_batch import StudentBatch
+from tests import baseline
+
+
+def grouped(students, key):
+    groups = defaultdict(list)
+    for student in students:
+        groups[key(student)].append(student)
+    return groups
+
+
+@pytest.mark.parametrize('keys', [('faculty',), ('grade',), ('faculty', 'grade'), ('cgpa_bucket',)])
+def test_group_by_matches_python_grouping(students, keys):
+    def key(student):
+        values = {'faculty': student.faculty, 'grade': student.grade,
+                  'cgpa_bucket': baseline.map_cgpa(student)[0]}
+        return tuple(values[name] for name in keys)
+
+    rows = GroupBy(keys, ('count', 'sum', 'mean', 'min', 'max', 'std')).rows(StudentBatch.from_students(students))
+    expected = grouped(students, key)
+    assert {tuple(row[name] for name in keys) for row in rows} == set(expected)
+    for row in rows:
+        members = expected[tuple(row[name] for name in keys)]
+        summary = baseline.cgpa_statistics(members)
+        assert row['count'] == len(members)
+        assert row['sum'] == pytest.approx(sum(member.cgpa for member in members))
+        assert row['mean'] == pytest.approx(summary['mean'])
+        assert row['std'] == pytest.approx(summary['std_dev'], abs=1e-9)
+        assert (row['min'], row['max']) == (summary['min'], summary['max'])
+
+
+def test_group_by_partials_merge_across_chunks(students):
+    engine = GroupBy(('faculty',), ('count', 'mean', 'std', 'min', 'max'))
+    batch = StudentBatch.from_students(students)
+    partial = engine.partial(batch[:700])
+    for start in range(700, len(batch), 500):
+        partial = GroupBy.merge(partial, engine.partial(batch[start:start + 500]))
+    whole = engine.groups(engine.partial(batch), engine.tables(batch))
+    merged = engine.groups(partial, engine.tables(batch))
+    assert [group for group, _ in merged] == [group for group, _ in whole]
+    for (_, left), (_, right) in zip(merged, whole):
+        assert left == pytest.approx(right)
+
+
+def test_unknown_aggregate_is_rejected():
+    with pytest.raises(ValueError):
+        GroupBy(('faculty',), ('median',))
+
+
+def test_calculate_group_by_returns_rows(students):
+    result = StatsService.calculate_group_by(StudentBatch.from_students(students), ['faculty'], ['count'])
+    assert {row['faculty']: row['count'] for row in result['groups']} == \
+        {faculty: len(members) for faculty, members in grouped(students, lambda s: s.faculty).items()}
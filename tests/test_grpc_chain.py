@@ -0,0 +1,206 @@
+"""
+gRPC chain: the three services and the client running in-process on local ports
+"""
+
+import csv
+import importlib.util
+import os
+import sys
+from concurrent import futures
+
+import grpc
+import pytest
+
+from services.student_batch import StudentRecord
+from tests.conftest import ROOT, make_students
+
+SERVER_DIR = os.path.join(ROOT, 'grpc_implementation', 'server')
+CLIENT_DIR = os.path.join(ROOT, 'grpc_implementation', 'client')
+# Appended so server modules never shadow the standard library (e.g. statistics)
+sys.path.append(SERVER_DIR)
+
+
+def load_module(directory, filename, name):
+    """Import a service script as a module under a name that cannot clash"""
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(directory, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+mapreduce_server = load_module(SERVER_DIR, 'mapreduce_cgpa.py', 'grpc_mapreduce_server')
+mergesort_server = load_module(SERVER_DIR, 'mergesort_cgpa.py', 'grpc_mergesort_server')
+statistics_server = load_module(SERVER_DIR, 'statistics.py', 'grpc_statistics_server')
+grpc_client = load_module(CLIENT_DIR, 'client.py', 'grpc_client')
+
+from chain_relay import ChainRelay  # noqa: E402
+from channel_pool import ChannelPool, server_options  # noqa: E402
+import student_service_pb2  # noqa: E402
+import student_service_pb2_grpc  # noqa: E402
+
+
+def start_server(handler):
+    """Serve a handler on a free local port; returns (server, address)"""
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), options=server_options())
+    student_service_pb2_grpc.add_StudentAnalysisServiceServicer_to_server(handler, server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    return server, f'localhost:{port}'
+
+
+@pytest.fixture(scope='module')
+def chain():
+    """MapReduce → MergeSort → Statistics chain; yields the MapReduce address"""
+    servers = []
+    with pytest.MonkeyPatch.context() as patch:
+        server, address = start_server(statistics_server.StatisticsServiceHandler())
+        servers.append(server)
+        patch.setenv('STATISTICS_ADDRESS', address)
+        server, address = start_server(mergesort_server.MergeSortServiceHandler())
+        servers.append(server)
+        patch.setenv('MERGESORT_ADDRESS', address)
+        server, address = start_server(mapreduce_server.MapReduceServiceHandler())
+        servers.append(server)
+    yield address
+    for server in servers:
+        server.stop(None)
+
+
+def write_csv(path, students):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(StudentRecord._fields)
+        writer.writerows(students)
+    return str(path)
+
+
+def run_client(monkeypatch, address, csv_path, **env):
+    """Run the client workflow against the chain; returns its metrics"""
+    monkeypatch.setenv('MAPREDUCE_ADDRESS', address)
+    for name, value in env.items():
+        monkeypatch.setenv(name, str(value))
+    client = grpc_client.MicroservicesClient()
+    client.load_students(csv_path)
+    assert client.initiate_workflow()
+    return client.metrics
+
+
+def test_full_ranking_above_default_message_limit(chain, monkeypatch, tmp_path):
+    students = make_students(120000, seed=7)
+    metrics = run_client(monkeypatch, chain, write_csv(tmp_path / 'cohort.csv', students), TOP_K=0)
+    assert metrics['detailed_results']['mergesort']['sorted_count'] == len(students)
+    assert metrics['dataset']['rows'] == len(students)
+    top = max(students, key=lambda student: student.cgpa)
+    assert metrics['detailed_results']['mergesort']['top_10'][0]['cgpa'] == top.cgpa
+
+
+def results(metrics, approx=False):
+    """detailed_results without the timings, floats optionally compared approximately"""
+    def strip(value):
+        if isinstance(value, dict):
+            return {key: strip(item) for key, item in value.items() if key != 'processing_time'}
+        if isinstance(value, list):
+            return [strip(item) for item in value]
+        if approx and isinstance(value, float):
+            return pytest.approx(value)
+        return value
+    return strip(metrics['detailed_results'])
+
+
+@pytest.mark.parametrize('wire_format', ['students', 'columns'])
+@pytest.mark.parametrize('chain_mode, top_k', [('stream', 10), ('pipeline', 10), ('pipeline', 0)])
+def test_streamed_chain_matches_unary(chain, monkeypatch, tmp_path, chain_mode, top_k, wire_format):
+    csv_path = write_csv(tmp_path / 'cohort.csv', make_students(5000, seed=3))
+    unary = run_client(monkeypatch, chain, csv_path, WIRE_FORMAT=wire_format, CHAIN_MODE='unary', TOP_K=top_k)
+    streamed = run_client(monkeypatch, chain, csv_path, WIRE_FORMAT=wire_format, TOP_K=top_k,
+                          CHAIN_MODE=chain_mode, CHAIN_STREAM_BATCH=700)
+    assert streamed['dataset']['rows'] == 5000
+    assert results(streamed) == results(unary, approx=True)
+
+
+class RecordingService(student_service_pb2_grpc.StudentAnalysisServiceServicer):
+    """Downstream stage that records the top_k of every batch and answers with two fragments"""
+    
+    def __init__(self, fail_after=None):
+        """fail_after: abort the call with RESOURCE_EXHAUSTED after this many batches"""
+        self.received = []
+        self.fail_after = fail_after
+    
+    def ProcessChainPipeline(self, request_iterator, context):
+        for chunk in request_iterator:
+            self.received.append(chunk.top_k)
+            if len(self.received) == self.fail_after:
+                context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, 'queue full')
+        yield student_service_pb2.CombinedResponse(sorted_count=len(self.received))
+        yield student_service_pb2.CombinedResponse(mean_cgpa=2.5)
+
+
+def test_chain_relay_forwards_batches_in_order(monkeypatch):
+    monkeypatch.setenv('CHAIN_RELAY_QUEUE', '1')
+    downstream = RecordingService()
+    server, address = start_server(downstream)
+    try:
+        relay = ChainRelay(ChannelPool(address).stub(), 'Test', 'Recording')
+        for top_k in range(20):
+            relay.send(student_service_pb2.ChainRequest(top_k=top_k))
+        relay.close()
+        fragments = list(relay.responses())
+    finally:
+        server.stop(None)
+    assert downstream.received == list(range(20))
+    assert [fragment.sorted_count for fragment in fragments] == [20, 0]
+    assert fragments[1].mean_cgpa == 2.5
+
+
+def test_chain_relay_reports_downstream_failure(monkeypatch):
+    monkeypatch.setenv('CHAIN_RELAY_QUEUE', '1')
+    server, address = start_server(RecordingService(fail_after=2))
+    try:
+        relay = ChainRelay(ChannelPool(address).stub(), 'Test', 'Recording', timeout=10)
+        for top_k in range(20):
+            relay.send(student_service_pb2.ChainRequest(top_k=top_k))
+        relay.close()
+        assert list(relay.responses()) == []
+    finally:
+        server.stop(None)
+    assert relay.failure == (grpc.StatusCode.RESOURCE_EXHAUSTED, 'Recording: queue full')
+
+
+def test_relay_timeout_defaults_to_environment(monkeypatch):
+    monkeypatch.setenv('CHAIN_STREAM_TIMEOUT', '0.5')
+    server, address = start_server(RecordingService())
+    try:
+        relay = ChainRelay(ChannelPool(address).stub(), 'Test', 'Recording')
+        relay.send(student_service_pb2.ChainRequest())
+        assert list(relay.responses()) == []
+    finally:
+        server.stop(None)
+    assert relay.failure[0] == grpc.StatusCode.DEADLINE_EXCEEDED
+
+
+@pytest.mark.parametrize('chain_mode', ['stream', 'pipeline'])
+def test_streamed_chain_returns_downstream_failure(monkeypatch, tmp_path, chain_mode):
+    server, address = start_server(RecordingService(fail_after=1))
+    monkeypatch.setenv('MERGESORT_ADDRESS', address)
+    mapreduce, mapreduce_address = start_server(mapreduce_server.MapReduceServiceHandler())
+    monkeypatch.setenv('MAPREDUCE_ADDRESS', mapreduce_address)
+    monkeypatch.setenv('CHAIN_MODE', chain_mode)
+    monkeypatch.setenv('CHAIN_STREAM_BATCH', '100')
+    client = grpc_client.MicroservicesClient()
+    client.load_students(write_csv(tmp_path / 'cohort.csv', make_students(1000)))
+    channel = grpc.insecure_channel(mapreduce_address)
+    stub = student_service_pb2_grpc.StudentAnalysisServiceStub(channel)
+    try:
+        with pytest.raises(grpc.RpcError) as error:
+            if chain_mode == 'stream':
+                stub.ProcessChainStream(client.chain_batches(), timeout=10)
+            else:
+                list(stub.ProcessChainPipeline(client.chain_batches(), timeout=10))
+    finally:
+        channel.close()
+        mapreduce.stop(None)
+        server.stop(None)
+    assert error.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+    assert error.value.details() == 'MergeSort Service: queue full'
@@ -0,0 +1,114 @@
+"""
+Incremental aggregates: live results under deltas must equal the baseline
+computation over the current cohort
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from services.incremental_aggregates import IncrementalAggregates, IncrementalMapReduce, IncrementalStats
+from services.stats_kernel import StatsAccumulator
+from services.stats_service import StatsService
+from tests import baseline
+from tests.conftest import make_students
+from tests.test_student_batch import by_faculty, by_grade
+
+
+def random_deltas(aggregates, count, seed):
+    """Apply count random insert / update / delete deltas, including some failing ones"""
+    rng = random.Random(seed)
+    pool = make_students(400, seed)
+    for step in range(count):
+        current = list(aggregates.records)
+        roll = rng.random()
+        try:
+            if roll < 0.45 or not current:
+                aggregates.insert(rng.choice(pool))
+            elif roll < 0.7:
+                aggregates.update(rng.choice(pool)._replace(student_id=rng.choice(current)))
+            elif roll < 0.9:
+                aggregates.delete(rng.choice(current))
+            else:
+                aggregates.apply_deltas([
+                    ("update", rng.choice(pool)._replace(student_id=rng.choice(current))),
+                    ("delete", {'student_id': rng.choice(current)}),
+                    ("insert", rng.choice(pool)),
+                ])
+        except ValueError:
+            # Duplicate insert or unknown student: the call must leave no trace
+            pass
+        yield step
+
+
+def test_mapreduce_matches_baseline_under_deltas():
+    aggregates = IncrementalMapReduce()
+    for step in random_deltas(aggregates, 600, seed=1):
+        if step % 50:
+            continue
+        cohort = list(aggregates.records.values())
+        result = aggregates.results()
+        assert result['cgpa_classification'] == baseline.cgpa_classification(cohort)
+        assert result['grade_counts'] == Counter(record.grade for record in cohort)
+        assert result['faculty_counts'] == Counter(record.faculty for record in cohort)
+        assert result['faculty_grade_counts'] == {
+            faculty: Counter(record.grade for record in cohort if record.faculty == faculty)
+            for faculty in {record.faculty for record in cohort}
+        }
+        assert result['total_count'] == len(cohort)
+
+
+def test_stats_match_baseline_under_deltas():
+    aggregates = IncrementalStats()
+    for step in random_deltas(aggregates, 600, seed=2):
+        cohort = list(aggregates.records.values())
+        if step % 50 or not cohort:
+            continue
+        result = aggregates.results()
+        summary = baseline.cgpa_statistics(cohort)
+        assert by_faculty(result['faculty_stats']) == by_faculty(baseline.avg_cgpa_by_faculty(cohort))
+        assert by_grade(result['grade_distribution']) == by_grade(baseline.grade_distribution(cohort))
+        assert result['pass_rate'] == pytest.approx(baseline.pass_rate(cohort))
+        assert result['mean_cgpa'] == pytest.approx(summary['mean'])
+        assert result['std_dev'] == pytest.approx(summary['std_dev'], abs=1e-9)
+        assert (result['min'], result['max']) == (summary['min'], summary['max'])
+
+
+def test_failed_deltas_roll_back():
+    aggregates = IncrementalStats()
+    students = make_students(20)
+    for student in students:
+        aggregates.insert(student)
+    before = aggregates.results()
+    with pytest.raises(ValueError):
+        aggregates.apply_deltas([
+            ("update", students[0]._replace(cgpa=0.5)),
+            ("delete", students[1]),
+            ("delete", {'student_id': 'missing'}),
+        ])
+    assert aggregates.results() == before
+    assert set(aggregates.records) == {student.student_id for student in students}
+
+
+def test_unknown_operation_is_rejected():
+    with pytest.raises(ValueError):
+        IncrementalMapReduce().apply_deltas([("upsert", make_students(1)[0])])
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        IncrementalAggregates()
+
+
+def test_accumulator_add_and_remove(students):
+    accumulator = StatsAccumulator()
+    for student in students:
+        accumulator.add(student.cgpa, student.faculty, student.grade)
+    for student in students[:500]:
+        accumulator.remove(student.cgpa, student.faculty, student.grade)
+    remaining = students[500:]
+    assert accumulator.count == len(remaining)
+    assert accumulator.mean == pytest.approx(baseline.cgpa_statistics(remaining)['mean'])
+    assert accumulator.std_dev == pytest.approx(baseline.cgpa_statistics(remaining)['std_dev'])
+    assert by_faculty(StatsService.faculty_stats(accumulator)) == by_faculty(baseline.avg_cgpa_by_faculty(remaining))
@@ -0,0 +1,123 @@
+"""
+Keep-alive XML-RPC transport: connection reuse, the pool's size limit and recovery
+from connections the server has closed
+"""
+
+import threading
+import time
+
+import pytest
+
+from xmlrpc_implementation.keepalive_transport import (
+    ConnectionPool, KeepAliveRequestHandler, KeepAliveTransport, SafeKeepAliveTransport,
+    ThreadingXMLRPCServer, keepalive_proxy, keepalive_transport
+)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def start_server(handler=KeepAliveRequestHandler):
+    """Threaded keep-alive XML-RPC server on a free local port; returns (server, url)"""
+    server = ThreadingXMLRPCServer(('localhost', 0), requestHandler=handler, logRequests=False, allow_none=True)
+    server.register_function(lambda value: value * 2, 'double')
+    server.register_function(lambda seconds: time.sleep(seconds) or True, 'sleep')
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://localhost:{server.server_address[1]}/RPC2'
+
+
+@pytest.fixture
+def server_url():
+    server, url = start_server()
+    yield url
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_reuses_released_connections():
+    pool = ConnectionPool('host', 2, 30, FakeConnection)
+    first = pool.acquire()
+    pool.release(first, reusable=True)
+    assert pool.acquire() is first
+    pool.release(first, reusable=False)
+    assert first.closed
+    stats = pool.stats()
+    assert (stats['connections_created'], stats['connections_reused'], stats['connections_discarded']) == (1, 1, 1)
+    assert stats['reuse_rate'] == 0.5
+
+
+def test_pool_drops_idle_connections():
+    pool = ConnectionPool('host', 1, -1, FakeConnection)
+    first = pool.acquire()
+    pool.release(first, reusable=True)
+    assert pool.acquire() is not first
+    assert first.closed
+    assert pool.stats()['connections_discarded'] == 1
+
+
+def test_pool_waits_at_max_size():
+    pool = ConnectionPool('host', 1, 30, FakeConnection)
+    held = pool.acquire()
+    borrowed = []
+    waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire()))
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive() and not borrowed
+    pool.release(held, reusable=True)
+    waiter.join(5)
+    assert borrowed == [held]
+    assert pool.stats()['waits'] == 1
+
+
+def test_proxy_reuses_one_connection(server_url):
+    transport = KeepAliveTransport()
+    proxy = keepalive_proxy(server_url, transport)
+    assert [proxy.double(value) for value in range(5)] == [0, 2, 4, 6, 8]
+    stats = next(iter(transport.stats().values()))
+    assert (stats['connections_created'], stats['connections_reused']) == (1, 4)
+
+
+def test_concurrent_calls_stay_within_pool_size(server_url):
+    transport = KeepAliveTransport(max_connections=2)
+    proxy = keepalive_proxy(server_url, transport)
+    threads = [threading.Thread(target=proxy.sleep, args=(0.05,)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = next(iter(transport.stats().values()))
+    assert stats['requests'] == 6
+    assert stats['connections_created'] <= 2
+    assert stats['waits'] > 0
+
+
+def test_retries_connection_closed_by_server():
+    class ShortKeepAlive(KeepAliveRequestHandler):
+        timeout = 0.1
+
+    server, url = start_server(ShortKeepAlive)
+    try:
+        transport = KeepAliveTransport()
+        proxy = keepalive_proxy(url, transport)
+        assert proxy.double(1) == 2
+        time.sleep(0.5)
+        assert proxy.double(2) == 4
+    finally:
+        server.shutdown()
+        server.server_close()
+    stats = next(iter(transport.stats().values()))
+    assert stats['connections_created'] == 2
+
+
+def test_transport_follows_url_scheme():
+    assert type(keepalive_transport('http://localhost:8000')) is KeepAliveTransport
+    assert type(keepalive_transport('https://localhost:8000')) is SafeKeepAliveTransport
+    with pytest.raises(ValueError):
+        keepalive_transport('ftp://localhost:8000')
+    with pytest.raises(ValueError):
+        keepalive_proxy('https://localhost:8000', KeepAliveTransport())
@@ -0,0 +1,86 @@
+"""
+MapReduce: vectorized CGPA classification, the chunked executor and multi-output jobs against the baseline
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from services.mapreduce_executor import MapReduceExecutor, merge_counts
+from services.mapreduce_service import MapReduceService
+from services.student_batch import StudentBatch
+from tests import baseline
+
+
+def test_mapreduce_keeps_category_order(students):
+    result = MapReduceService.perform_mapreduce(StudentBatch.from_students(students))['cgpa_classification']
+    assert list(result) == [category for category in MapReduceService.GRADE_ORDER if category in result]
+
+
+@pytest.mark.parametrize('boundary', [1.67, 2.0, 2.17, 2.33, 2.5, 2.67, 2.83, 3.0, 3.33, 3.5, 3.68, 0.0, 4.0])
+def test_mapreduce_category_boundaries(students, boundary):
+    cohort = [students[0]._replace(cgpa=boundary), students[1]._replace(cgpa=round(boundary - 0.01, 2))]
+    assert MapReduceService.perform_mapreduce(StudentBatch.from_students(cohort))['cgpa_classification'] == \
+        baseline.cgpa_classification(cohort)
+
+
+def test_large_object_list_uses_vectorized_path(students):
+    cohort = students * (MapReduceService.VECTORIZE_THRESHOLD // len(students) + 1)
+    assert MapReduceService.perform_mapreduce(cohort)['cgpa_classification'] == \
+        baseline.cgpa_classification(cohort)
+
+
+def test_executor_chunks_cover_input():
+    executor = MapReduceExecutor(workers=2, chunk_size=300)
+    assert list(executor.chunks(700)) == [(0, 300), (300, 600), (600, 700)]
+    assert list(executor.chunks(0)) == []
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_executor_merges_chunks_across_workers(students, workers):
+    executor = MapReduceExecutor(workers=workers, chunk_size=170)
+    result = MapReduceService.perform_mapreduce(StudentBatch.from_students(students), executor)
+    assert result['cgpa_classification'] == baseline.cgpa_classification(students)
+
+
+def test_shared_pool_survives_concurrent_callers(students):
+    batch = StudentBatch.from_students(students)
+    executors = [MapReduceExecutor(workers=workers, chunk_size=250) for workers in (2, 4, 8, 16)]
+    with ThreadPoolExecutor(max_workers=len(executors)) as threads:
+        results = list(threads.map(lambda executor: MapReduceService.perform_mapreduce(batch, executor), executors))
+    expected = baseline.cgpa_classification(students)
+    assert all(result['cgpa_classification'] == expected for result in results)
+
+
+def test_merge_counts():
+    assert merge_counts([{'a': 1}, {'a': 2, 'b': 1}, {}]) == {'a': 3, 'b': 1}
+
+
+ALL_JOBS = ('cgpa_count', 'grade_count', 'faculty_count', 'faculty_grade_count')
+
+
+@pytest.mark.parametrize('chunk_size', [170, 250000])
+def test_jobs_match_baseline_in_one_scan(students, chunk_size):
+    executor = MapReduceExecutor(workers=2, chunk_size=chunk_size)
+    result = MapReduceService.perform_mapreduce(StudentBatch.from_students(students), executor, ALL_JOBS)
+    assert result['cgpa_classification'] == baseline.cgpa_classification(students)
+    assert result['grade_counts'] == {row['grade']: row['count'] for row in baseline.grade_distribution(students)}
+    assert result['faculty_counts'] == \
+        {row['faculty']: row['student_count'] for row in baseline.avg_cgpa_by_faculty(students)}
+    pairs = Counter((record.faculty, record.grade) for record in students)
+    assert {faculty: dict(grades) for faculty, grades in result['faculty_grade_counts'].items()} == \
+        {faculty: {grade: count for (f, grade), count in pairs.items() if f == faculty}
+         for faculty in {record.faculty for record in students}}
+
+
+def test_jobs_on_object_list_match_batch(students):
+    from_list = MapReduceService.perform_mapreduce(students[:50], operations=ALL_JOBS)
+    from_batch = MapReduceService.perform_mapreduce(StudentBatch.from_students(students[:50]), operations=ALL_JOBS)
+    for output in ('cgpa_classification', 'grade_counts', 'faculty_counts', 'faculty_grade_counts'):
+        assert from_list[output] == from_batch[output]
+
+
+def test_unknown_job_is_rejected(students):
+    with pytest.raises(ValueError):
+        MapReduceService.perform_mapreduce(students, operations=('median',))
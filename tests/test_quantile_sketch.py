@@ -0,0 +1,107 @@
+"""
+KLL quantile sketch: exact mode equals np.quantile, compacted mode stays within its rank error
+"""
+
+import numpy as np
+import pytest
+
+from services.quantile_sketch import QuantileSketch, merge_sketches, sketch_by_group
+from services.stats_service import StatsService, StatsStream
+from services.student_batch import StudentBatch
+from tests.conftest import make_students
+
+FRACTIONS = [0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+@pytest.fixture
+def values():
+    return np.round(np.random.default_rng(7).normal(3.0, 0.5, 200000).clip(0, 4), 2)
+
+
+def rank_error(values, estimates):
+    """Largest distance between a requested rank and the rank range of its estimate"""
+    ordered = np.sort(values)
+    lower = np.searchsorted(ordered, estimates, side='left') / len(values)
+    upper = np.searchsorted(ordered, estimates, side='right') / len(values)
+    return max(max(0.0, low - fraction, fraction - high)
+               for fraction, low, high in zip(FRACTIONS, lower, upper))
+
+
+def test_exact_mode_matches_numpy(values):
+    sketch = QuantileSketch(exact=True).update(values)
+    assert sketch.is_exact()
+    assert sketch.quantiles(FRACTIONS) == pytest.approx(np.quantile(values, FRACTIONS).tolist())
+
+
+def test_small_inputs_stay_exact():
+    values = np.linspace(0, 4, 101)
+    sketch = QuantileSketch(k=200).update(values)
+    assert sketch.is_exact()
+    assert sketch.quantile(0.5) == pytest.approx(2.0)
+
+
+def test_sketch_stays_within_rank_error(values):
+    sketch = QuantileSketch(k=200)
+    for start in range(0, len(values), 10000):
+        sketch.update(values[start:start + 10000])
+    assert not sketch.is_exact()
+    assert sketch.count == len(values)
+    assert sum(len(level) for level in sketch.levels) < 5000
+    assert rank_error(values, sketch.quantiles(FRACTIONS)) < 0.02
+
+
+def test_merged_shards_stay_within_rank_error(values):
+    shards = [QuantileSketch(k=200).update(shard) for shard in np.array_split(values, 8)]
+    merged = shards[0]
+    for shard in shards[1:]:
+        merged.merge(shard)
+    assert merged.count == len(values)
+    assert rank_error(values, merged.quantiles(FRACTIONS)) < 0.02
+
+
+def test_default_seed_is_reproducible(values):
+    first = QuantileSketch(k=100).update(values).quantiles(FRACTIONS)
+    second = QuantileSketch(k=100).update(values).quantiles(FRACTIONS)
+    assert first == second
+
+
+def test_empty_sketch():
+    assert QuantileSketch().quantiles(FRACTIONS) == [0.0] * len(FRACTIONS)
+
+
+def test_grouped_sketches_match_per_faculty_quantiles(students):
+    batch = StudentBatch.from_students(students)
+    partials = [sketch_by_group(chunk.cgpa, chunk.faculty_codes, chunk.faculty_table, exact=True)
+                for chunk in (batch[:900], batch[900:])]
+    overall, groups = merge_sketches(partials)
+    assert overall.quantiles(FRACTIONS) == pytest.approx(np.quantile(batch.cgpa, FRACTIONS).tolist())
+    for faculty, sketch in groups.items():
+        cgpa = [student.cgpa for student in students if student.faculty == faculty]
+        assert sketch.quantiles(FRACTIONS) == pytest.approx(np.quantile(cgpa, FRACTIONS).tolist())
+
+
+def test_percentile_report(students):
+    report = StatsService.percentile_report(StudentBatch.from_students(students), exact=True)
+    assert report['exact']
+    cgpa = [student.cgpa for student in students]
+    assert report['overall']['p50'] == pytest.approx(float(np.median(cgpa)))
+    assert set(report['by_faculty']) == {student.faculty for student in students}
+
+
+def test_statistics_report_percentiles_only_on_request(students):
+    batch = StudentBatch.from_students(students)
+    assert 'percentiles' not in StatsService.calculate_statistics(batch)['statistics']
+    report = StatsService.calculate_statistics(batch, percentiles=(25, 50))['statistics']['percentiles']
+    assert set(report['overall']) == {'p25', 'p50'}
+    assert report['overall']['p50'] == pytest.approx(float(np.median(batch.cgpa)))
+
+
+def test_stats_stream_sketches_past_the_exact_limit():
+    students = make_students(20000, seed=5)
+    stream = StatsStream(exact_limit=5000)
+    for start in range(0, len(students), 2000):
+        stream.add(StudentBatch.from_students(students[start:start + 2000]))
+    report = stream.results()['percentiles']
+    assert not report['exact']
+    cgpa = np.array([student.cgpa for student in students])
+    assert rank_error(cgpa, [report['overall'][f"p{fraction * 100:g}"] for fraction in FRACTIONS]) < 0.02
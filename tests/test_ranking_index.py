@@ -0,0 +1,94 @@
+"""
+Ranking index: live ranks and top-K under deltas must equal the baseline merge sort
+over the current cohort
+"""
+
+import sys
+import threading
+
+import pytest
+
+from services.ranking_index import RankingIndex
+from tests import baseline
+from tests.test_incremental_aggregates import random_deltas
+from xmlrpc_implementation.server.mergesort import MergeSortServiceHandler
+
+
+def test_ranking_matches_baseline_under_deltas():
+    index = RankingIndex(block_size=8)
+    for step in random_deltas(index, 1500, seed=3):
+        assert len(index.sequence) == len(index.records)
+        if step % 25:
+            continue
+        expected = baseline.merge_sort(list(index.records.values()))
+        assert index.top_k(len(expected)) == expected
+        assert index.top_k(5) == expected[:5]
+        for position, record in enumerate(expected[:20], 1):
+            assert index.rank(record.student_id) == position
+
+
+def test_ranking_load_matches_baseline(students):
+    index = RankingIndex(block_size=16)
+    index.load(students)
+    expected = baseline.merge_sort(list(students))
+    assert index.results(len(students))['top_students'] == expected
+    assert [index.rank(record.student_id) for record in expected[:50]] == list(range(1, 51))
+    assert index.count_above(3.0) == sum(1 for record in students if record.cgpa > 3.0)
+
+
+def test_ranking_reinsert_gets_a_new_sequence(students):
+    index = RankingIndex()
+    tied = [student._replace(cgpa=3.5) for student in students[:3]]
+    index.load(tied)
+    index.delete(tied[0].student_id)
+    index.insert(tied[0])
+    assert [record.student_id for record in index.top_k(3)] == [s.student_id for s in (tied[1], tied[2], tied[0])]
+    index.update(tied[1]._replace(name='Renamed'))
+    assert [record.student_id for record in index.top_k(3)] == [s.student_id for s in (tied[1], tied[2], tied[0])]
+
+
+def test_ranking_rejects_negative_k():
+    with pytest.raises(ValueError):
+        RankingIndex().top_k(-1)
+
+
+def test_lookup_returns_rank_and_cgpa(students):
+    index = RankingIndex(block_size=16)
+    index.load(students)
+    best = baseline.merge_sort(list(students))[0]
+    assert index.lookup(best.student_id) == (1, best.cgpa)
+    with pytest.raises(ValueError):
+        index.lookup('missing')
+
+
+def test_rank_lookups_race_with_deltas(students):
+    handler = MergeSortServiceHandler('http://localhost:1/RPC2')
+    handler.index.load(students[:200])
+    target = students[0]
+    done = threading.Event()
+    errors = []
+
+    def churn():
+        while not done.is_set():
+            handler.index.delete(target.student_id)
+            handler.index.insert(target)
+
+    # Switch threads as often as possible so deltas land between lookups
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=churn)
+    thread.start()
+    try:
+        for _ in range(5000):
+            try:
+                [entry] = handler.rank([target.student_id])
+                assert entry['cgpa'] == target.cgpa
+            except ValueError:
+                pass  # Deleted at the moment of the lookup
+            except KeyError as e:
+                errors.append(e)
+    finally:
+        done.set()
+        thread.join()
+        sys.setswitchinterval(interval)
+    assert errors == []
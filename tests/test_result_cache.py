@@ -0,0 +1,90 @@
+"""
+Result cache: LRU eviction, byte budget, TTL expiry, counters and request digests
+"""
+
+import pytest
+import student_service_pb2
+
+from services.result_cache import ResultCache
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = ResultCache(max_entries=2, ttl=0)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('services.result_cache.time.monotonic', lambda: now[0])
+    cache = ResultCache(max_entries=4, ttl=10)
+    cache.put('a', 1)
+    now[0] += 5
+    assert cache.get('a') == 1
+    now[0] += 6
+    assert cache.get('a') is None
+    stats = cache.stats()
+    assert (stats['expirations'], stats['entries'], stats['bytes']) == (1, 0, 0)
+
+
+def test_hit_and_miss_counters():
+    cache = ResultCache(max_entries=4, ttl=0)
+    assert cache.get_or_compute('a', lambda: 'x') == ('x', False)
+    assert cache.get_or_compute('a', lambda: 'y') == ('x', True)
+    assert cache.get('b') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+    assert stats['hit_rate'] == pytest.approx(1 / 3)
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResultCache(max_entries=0, ttl=0)
+    cache.put('a', 1)
+    assert cache.get('a') is None
+
+
+def test_byte_budget_evicts_large_results():
+    cache = ResultCache(max_entries=10, ttl=0, max_bytes=100)
+    cache.put('a', b'x' * 40)
+    cache.put('b', 'y' * 40)
+    cache.put('c', [b'z' * 30])
+    assert cache.get('a') is None
+    assert cache.stats()['bytes'] == 70
+    # A result over the whole budget is never cached and evicts nothing
+    cache.put('d', b'w' * 101)
+    assert cache.get('d') is None
+    assert cache.get('b') is not None and cache.get('c') is not None
+
+
+def test_replacing_an_entry_keeps_the_byte_count():
+    cache = ResultCache(max_entries=10, ttl=0, max_bytes=100)
+    cache.put('a', 'x' * 60)
+    cache.put('a', 'y' * 60)
+    assert cache.stats()['bytes'] == 60
+    assert cache.get('a') == 'y' * 60
+
+
+def test_protobuf_results_are_sized_by_byte_size():
+    response = student_service_pb2.MergeSortResponse(total_count=3)
+    response.sorted_students.add(student_id='S1', name='Ñame', faculty='Arts', cgpa=3.5, grade='A')
+    assert ResultCache.size_of(response) == response.ByteSize()
+    assert ResultCache.size_of({'top_10': [{'name': 'ab', 'cgpa': 3.5}]}) == len('top_10') + 4 + 2 + 4 + 8
+
+
+def test_message_digest_ignores_excluded_fields():
+    request = student_service_pb2.ChainRequest(top_k=5)
+    request.students.add(student_id='S1', name='A', faculty='Arts', cgpa=3.5, grade='A')
+    other = student_service_pb2.ChainRequest()
+    other.CopyFrom(request)
+    other.partial_results.mean_cgpa = 3.0
+    key = ResultCache.message_digest(request, 'ProcessChain', exclude=('partial_results',))
+    assert ResultCache.message_digest(other, 'ProcessChain', exclude=('partial_results',)) == key
+    assert ResultCache.message_digest(other, 'ProcessChain') != ResultCache.message_digest(request, 'ProcessChain')
+    assert ResultCache.message_digest(request, 'PerformMergeSort', exclude=('partial_results',)) != key
+    # Excluding a field does not modify the request itself
+    assert other.partial_results.mean_cgpa == 3.0
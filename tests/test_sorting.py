@@ -0,0 +1,132 @@
+"""
+MergeSort paths against the baseline merge sort
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from services.external_sort import ExternalMergeSort
+from services.mergesort_service import MergeSortService
+from services.student_batch import StudentBatch, grade_sort_key
+from tests import baseline
+
+
+def unrounded(students, seed=0):
+    """Same cohort with CGPAs that are not two-decimal values (comparison sort path)"""
+    rng = random.Random(seed)
+    return [student._replace(cgpa=round(student.cgpa + rng.random() / 1000, 6)) for student in students]
+
+
+def test_counting_sort_is_used_and_stable(students):
+    cgpa = StudentBatch.from_students(students).cgpa
+    assert MergeSortService.fixed_precision_keys(cgpa) is not None
+    expected = baseline.merge_sort(list(students))
+    assert [students[i] for i in MergeSortService.key_order(cgpa).tolist()] == expected
+
+
+def test_out_of_range_cgpa_falls_back_to_comparison_sort(students):
+    cohort = [students[0]._replace(cgpa=4.5), *students[1:50], students[50]._replace(cgpa=-0.25)]
+    assert MergeSortService.fixed_precision_keys(StudentBatch.from_students(cohort).cgpa) is None
+    assert list(MergeSortService.perform_sort(StudentBatch.from_students(cohort))['sorted_students']) == \
+        baseline.merge_sort(list(cohort))
+
+
+def test_comparison_sorts_match_baseline(students):
+    students = unrounded(students)
+    cgpa = StudentBatch.from_students(students).cgpa
+    assert MergeSortService.fixed_precision_keys(cgpa) is None
+    expected = baseline.merge_sort(list(students))
+    for order in (MergeSortService.key_order(cgpa, parallel=False), MergeSortService.parallel_order(cgpa, workers=2)):
+        assert [students[i] for i in order.tolist()] == expected
+
+
+def test_large_object_list_path_matches_baseline(students):
+    expected = baseline.merge_sort(list(students))
+    assert MergeSortService.perform_sort(students, parallel=True)['sorted_students'] == expected
+
+
+@pytest.mark.parametrize('workers', [2, 5])
+def test_sample_sort_keeps_ties_in_input_order(students, workers):
+    students = [student._replace(cgpa=round(student.cgpa, 1)) for student in unrounded(students)]
+    cgpa = StudentBatch.from_students(students).cgpa
+    expected = baseline.merge_sort(list(students))
+    assert [students[i] for i in MergeSortService.parallel_order(cgpa, workers=workers).tolist()] == expected
+
+
+@pytest.mark.parametrize('k', [1, 10, 137, 2000, 5000])
+def test_top_k_matches_baseline_prefix(students, k):
+    expected = baseline.merge_sort(list(students))[:k]
+    batch = StudentBatch.from_students(students)
+    assert list(MergeSortService.perform_sort(batch, top_k=k)['sorted_students']) == expected
+    assert MergeSortService.perform_sort(students, top_k=k)['sorted_students'] == expected
+    assert list(MergeSortService.perform_multi_sort(batch, top_k=k)['sorted_by_cgpa']) == expected
+
+
+def test_negative_top_k_is_rejected(students):
+    with pytest.raises(ValueError):
+        MergeSortService.perform_sort(students, top_k=-1)
+    with pytest.raises(ValueError):
+        MergeSortService.perform_multi_sort(students, top_k=-1)
+
+
+@pytest.mark.parametrize('rounded', [True, False])
+def test_grade_order_matches_composite_sort(students, rounded):
+    if not rounded:
+        students = unrounded(students)
+    expected = sorted(students, key=lambda s: (grade_sort_key(s.grade), -s.cgpa, s.faculty, s.name))
+    batch = StudentBatch.from_students(students)
+    assert list(MergeSortService.perform_sort(batch, sort_by="grade")['sorted_students']) == expected
+    result = MergeSortService.perform_multi_sort(batch)
+    assert list(result['sorted_by_grade']) == expected
+    assert list(result['sorted_by_cgpa']) == baseline.merge_sort(list(students))
+
+
+def test_rank_keys_are_dense_descending(students):
+    for cohort in (students, unrounded(students)):
+        cgpa = np.array([student.cgpa for student in cohort])
+        keys = MergeSortService.cgpa_rank_keys(cgpa)
+        order = np.argsort(-cgpa, kind='stable')
+        assert np.all(np.diff(keys[order]) >= 0)
+        assert np.array_equal(np.diff(keys[order]) > 0, np.diff(cgpa[order]) < 0)
+
+
+def test_external_sort_matches_baseline(students, tmp_path):
+    expected = baseline.merge_sort(list(students))
+    sorter = ExternalMergeSort(memory_budget=20000, temp_dir=str(tmp_path))
+    assert list(sorter.sort(iter(students))) == expected
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_external_sort_to_file(students, tmp_path):
+    output = tmp_path / 'ranking.csv'
+    count = MergeSortService.external_sort(students, memory_budget=50000, output_path=str(output),
+                                           temp_dir=str(tmp_path))
+    lines = output.read_text(encoding='utf-8').splitlines()
+    assert count == len(students) == len(lines) - 1
+    assert lines[1].split(',')[0] == baseline.merge_sort(list(students))[0].student_id
+
+
+class FanInRecorder(ExternalMergeSort):
+    """External sort that records how many runs each merge reads"""
+
+    fan_in = ()
+
+    def _merge(self, paths):
+        self.fan_in += (len(paths),)
+        return super()._merge(paths)
+
+
+def test_external_sort_merges_in_bounded_passes(students, tmp_path):
+    expected = baseline.merge_sort(list(students))
+    sorter = FanInRecorder(memory_budget=5000, temp_dir=str(tmp_path), max_runs=3)
+    assert list(sorter.sort(iter(students))) == expected
+    assert len(sorter.fan_in) > 1 and max(sorter.fan_in) == 3
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_external_sort_handles_long_fields(students, tmp_path):
+    cohort = [students[0]._replace(name='N' * 70000), *students[1:20]]
+    sorter = ExternalMergeSort(memory_budget=20000, temp_dir=str(tmp_path))
+    assert list(sorter.sort(iter(cohort))) == baseline.merge_sort(list(cohort))
@@ -0,0 +1,103 @@
+"""
+Statistics kernel: fused single-pass aggregates, mergeable accumulators and linear-time
+median against the baseline statistics
+"""
+
+import numpy as np
+import pytest
+
+from services.stats_kernel import StatsAccumulator, exact_median, fused_statistics, kth_smallest, merge_accumulators
+from services.mapreduce_executor import MapReduceExecutor
+from services.stats_service import StatsService, StatsStream
+from services.student_batch import StudentBatch
+from tests import baseline
+from tests.test_student_batch import by_faculty, by_grade
+
+
+def check_accumulator(accumulator, students):
+    summary = baseline.cgpa_statistics(students)
+    assert accumulator.count == len(students)
+    assert accumulator.mean == pytest.approx(summary['mean'])
+    assert accumulator.std_dev == pytest.approx(summary['std_dev'], abs=1e-9)
+    assert (accumulator.min, accumulator.max) == (summary['min'], summary['max'])
+    assert by_faculty(StatsService.faculty_stats(accumulator)) == by_faculty(baseline.avg_cgpa_by_faculty(students))
+    assert by_grade(StatsService.grade_distribution(accumulator)) == by_grade(baseline.grade_distribution(students))
+    assert StatsService.pass_rate(accumulator) == pytest.approx(baseline.pass_rate(students))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 300, 1 << 16])
+def test_fused_statistics_match_baseline(students, chunk_size):
+    check_accumulator(fused_statistics(StudentBatch.from_students(students), chunk_size), students)
+
+
+def test_fused_statistics_of_empty_batch():
+    accumulator = fused_statistics(StudentBatch.from_students([]))
+    assert accumulator.count == 0
+    assert StatsService.faculty_stats(accumulator) == []
+
+
+def test_accumulator_shards_merge_exactly(students):
+    shards = [students[start:start + 333] for start in range(0, len(students), 333)]
+    merged = StatsAccumulator()
+    for shard in shards:
+        # Each shard has its own dictionary tables and travels as a plain dict
+        state = StatsAccumulator().update(StudentBatch.from_students(shard)).to_dict()
+        merged.merge(StatsAccumulator.from_dict(state))
+    check_accumulator(merged, students)
+
+
+def test_merge_accumulators_keeps_empty_partials(students):
+    partials = [StatsAccumulator(), fused_statistics(StudentBatch.from_students(students)), StatsAccumulator()]
+    check_accumulator(merge_accumulators(partials), students)
+
+
+def test_sharded_statistics_on_the_worker_pool(students):
+    executor = MapReduceExecutor(workers=2, chunk_size=300)
+    check_accumulator(StatsService.accumulate(StudentBatch.from_students(students), executor), students)
+
+
+@pytest.mark.parametrize('count', [1, 2, 999, 2000])
+def test_exact_median_matches_baseline(students, count):
+    cohort = students[:count]
+    cgpa = StudentBatch.from_students(cohort).cgpa
+    expected = baseline.cgpa_statistics(cohort)['median']
+    assert exact_median(cgpa) == pytest.approx(expected)
+    # Unrounded CGPAs take the introselect path instead of the histogram
+    assert exact_median(cgpa + 1e-7) == pytest.approx(expected + 1e-7)
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_exact_median_reuses_full_order(students, descending):
+    cgpa = StudentBatch.from_students(students).cgpa
+    order = np.argsort(-cgpa if descending else cgpa, kind='stable')
+    assert exact_median(cgpa, order) == pytest.approx(baseline.cgpa_statistics(students)['median'])
+
+
+def test_partial_order_falls_back_to_selection(students):
+    cgpa = StudentBatch.from_students(students).cgpa
+    top_k = np.argsort(-cgpa, kind='stable')[:10]
+    assert exact_median(cgpa, top_k) == pytest.approx(baseline.cgpa_statistics(students)['median'])
+    assert kth_smallest(cgpa, [0, len(cgpa) - 1], top_k.tolist()) == [cgpa.min(), cgpa.max()]
+
+
+def test_stats_stream_matches_perform_analysis(students):
+    stream = StatsStream()
+    for start in range(0, len(students), 300):
+        stream.add(StudentBatch.from_students(students[start:start + 300]))
+    check_accumulator(stream.accumulator, students)
+    result = stream.results()
+    expected = StatsService.perform_analysis(StudentBatch.from_students(students), "all")
+    assert result['total_count'] == len(students)
+    assert result['pass_rate'] == pytest.approx(expected['pass_rate'])
+    assert by_faculty(result['faculty_stats']) == by_faculty(expected['faculty_stats'])
+    assert result['percentiles']['exact']
+    assert result['percentiles']['overall'] == pytest.approx(expected['percentiles']['overall'])
+    for faculty, values in expected['percentiles']['by_faculty'].items():
+        assert result['percentiles']['by_faculty'][faculty] == pytest.approx(values)
+
+
+def test_empty_stats_stream():
+    result = StatsStream().results()
+    assert result['total_count'] == 0
+    assert result['percentiles']['exact']
+    assert result['percentiles']['by_faculty'] == {}
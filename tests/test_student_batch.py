@@ -0,0 +1,80 @@
+"""
+StudentBatch: construction, row access and service equivalence with the baseline per-student code
+"""
+
+import pytest
+
+from services.mapreduce_service import MapReduceService
+from services.mergesort_service import MergeSortService
+from services.stats_service import StatsService
+from services.student_batch import StudentBatch
+from tests import baseline
+
+
+def by_faculty(rows):
+    return {row['faculty']: (row['student_count'], pytest.approx(row['average_cgpa'])) for row in rows}
+
+
+def by_grade(rows):
+    return {row['grade']: (row['count'], pytest.approx(row['percentage'])) for row in rows}
+
+
+def test_round_trip_from_students_and_dicts(students):
+    dicts = [record._asdict() for record in students]
+    for batch in (StudentBatch.from_students(students), StudentBatch.from_dicts(dicts)):
+        assert len(batch) == len(students)
+        assert list(batch) == students
+        assert batch.to_dicts() == dicts
+
+
+def test_encode_keeps_first_appearance_order():
+    codes, table = StudentBatch.encode(['b', 'a', 'b', 'c', 'a'])
+    assert table == ['b', 'a', 'c']
+    assert codes.tolist() == [0, 1, 0, 2, 1]
+
+
+def test_concat_merges_string_tables(students):
+    parts = [StudentBatch.from_students(students[start:start + 300]) for start in range(0, len(students), 300)]
+    merged = StudentBatch.concat(parts)
+    assert list(merged) == students
+    assert sorted(merged.faculty_table) == sorted({record.faculty for record in students})
+
+
+def test_take_and_slices(students):
+    batch = StudentBatch.from_students(students)
+    assert list(batch.take([5, 0, 5])) == [students[5], students[0], students[5]]
+    assert list(batch[10:20:3]) == students[10:20:3]
+    assert batch[-1] == students[-1]
+    assert len(batch[:0]) == 0
+
+
+def test_mapreduce_matches_baseline(students):
+    expected = baseline.cgpa_classification(students)
+    batch = StudentBatch.from_students(students)
+    assert MapReduceService.perform_mapreduce(batch)['cgpa_classification'] == expected
+    assert MapReduceService.perform_mapreduce(students[:50])['cgpa_classification'] == \
+        baseline.cgpa_classification(students[:50])
+
+
+def test_sort_matches_baseline(students):
+    expected = baseline.merge_sort(list(students))
+    batch = StudentBatch.from_students(students)
+    assert list(MergeSortService.perform_sort(batch)['sorted_students']) == expected
+    assert MergeSortService.perform_sort(students)['sorted_students'] == expected
+
+
+def test_analysis_matches_baseline(students):
+    result = StatsService.perform_analysis(StudentBatch.from_students(students), "all")
+    assert by_faculty(result['faculty_stats']) == by_faculty(baseline.avg_cgpa_by_faculty(students))
+    assert by_grade(result['grade_distribution']) == by_grade(baseline.grade_distribution(students))
+    assert result['pass_rate'] == pytest.approx(baseline.pass_rate(students))
+    summary = baseline.cgpa_statistics(students)
+    assert result['mean_cgpa'] == pytest.approx(summary['mean'])
+    assert result['std_dev'] == pytest.approx(summary['std_dev'])
+    assert (result['min'], result['max']) == (summary['min'], summary['max'])
+
+
+def test_statistics_match_baseline(students):
+    for cohort in (students, students[:-1]):
+        cgpa = StatsService.calculate_statistics(StudentBatch.from_students(cohort))['statistics']['cgpa']
+        assert cgpa == pytest.approx(baseline.cgpa_statistics(cohort))
@@ -3,8 +3,10 @@ Protocol Comparison Tool
 Compares performance metrics between gRPC and XML-RPC implementations
 """
 
+import argparse
 import json
 import os
+import subprocess
 import sys
 from datetime import datetime
 import matplotlib.pyplot as plt
@@ -55,6 +57,21 @@ class ProtocolComparator:
         print(f"{'Type':<30} {self.grpc_metrics['architecture']:<25} {self.xmlrpc_metrics['architecture']:<25}")
         print(f"{'Workflow':<30} {'Chained Services':<25} {'Individual Calls':<25}")
         
+        # Input cohort (recorded by the clients; older metrics files have none)
+        grpc_dataset = self.grpc_metrics.get('dataset', {})
+        xmlrpc_dataset = self.xmlrpc_metrics.get('dataset', {})
+        print(f"\n{'Dataset':<30} {'gRPC':<25} {'XML-RPC':<25}")
+        print("-" * 80)
+        for label, key in (('File', 'path'), ('Students', 'rows'), ('Generator Seed', 'seed')):
+            grpc_value = grpc_dataset.get(key)
+            xmlrpc_value = xmlrpc_dataset.get(key)
+            if key == 'path':
+                grpc_value = grpc_value and os.path.basename(grpc_value)
+                xmlrpc_value = xmlrpc_value and os.path.basename(xmlrpc_value)
+            print(f"{label:<30} {str(grpc_value):<25} {str(xmlrpc_value):<25}")
+        if grpc_dataset and xmlrpc_dataset and grpc_dataset != xmlrpc_dataset:
+            print("⚠ The protocols were measured on different datasets; times are not comparable")
+        
         # Performance metrics
         print(f"\n{'Metric':<30} {'gRPC':<25} {'XML-RPC':<25}")
         print("-" * 80)
@@ -494,8 +511,52 @@ Speed Comparison:
             print(f"✗ Error generating report: {str(e)}")
 
 
+def run_clients(project_root, results_dir, rows, seed, output_format='csv'):
+    """
+    Generate a seeded cohort and run both clients on it
+
+    The services of both protocols must already be running. The cohort is
+    written to results/ once per (rows, seed, format) and reused afterwards.
+
+    Returns:
+        Tuple of (gRPC metrics file, XML-RPC metrics file) inside results_dir,
+        or None if a client failed
+    """
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from generate_cohort import write_cohort
+    from services.csv_loader import cohort_info
+
+    suffix = '.stcol' if output_format == 'stcol' else '.csv'
+    cohort_path = os.path.join(results_dir, f'cohort_{rows}_seed{seed}{suffix}')
+    if not os.path.exists(cohort_path) or cohort_info(cohort_path)['seed'] != seed:
+        print(f"\nGenerating {rows} students (seed {seed}) into {cohort_path}...")
+        write_cohort(rows, seed, cohort_path, output_format)
+    
+    metrics_files = []
+    for protocol, client in (('grpc', 'grpc_implementation/client/client.py'),
+                             ('xmlrpc', 'xmlrpc_implementation/client/client.py')):
+        metrics_file = f'{protocol}_cohort_{rows}_seed{seed}_performance_metrics.json'
+        env = dict(os.environ, CSV_PATH=cohort_path, OUTPUT_FILE=os.path.join(results_dir, metrics_file))
+        print(f"\nRunning the {protocol} client on {os.path.basename(cohort_path)}...")
+        completed = subprocess.run([sys.executable, os.path.join(project_root, client)], env=env,
+                                   stdout=subprocess.DEVNULL)
+        if completed.returncode != 0 or not os.path.exists(os.path.join(results_dir, metrics_file)):
+            print(f"✗ The {protocol} client failed (are its services running?)")
+            return None
+        metrics_files.append(metrics_file)
+    return tuple(metrics_files)
+
+
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description='Compare gRPC and XML-RPC performance metrics')
+    parser.add_argument('--rows', type=int,
+                        help='Generate a cohort of this many students and run both clients on it first')
+    parser.add_argument('--seed', type=int, default=42, help='Seed of the generated cohort (default: 42)')
+    parser.add_argument('--format', choices=['csv', 'stcol'], default='csv',
+                        help='File format of the generated cohort (default: csv)')
+    args = parser.parse_args()
+    
     print("="*80)
     print("Protocol Performance Comparison Tool")
     print("="*80)
@@ -504,10 +565,23 @@ def main():
     current_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(current_dir)
     results_dir = os.path.join(project_root, 'results')
+    os.makedirs(results_dir, exist_ok=True)
+    sys.path.insert(0, project_root)
     
     # Create comparator
     comparator = ProtocolComparator(results_dir)
     
+    if args.rows:
+        # Both protocols measured on the same generated cohort
+        metrics_files = run_clients(project_root, results_dir, args.rows, args.seed, args.format)
+        if metrics_files and comparator.load_metrics(*metrics_files):
+            name = f'cohort_{args.rows}_seed{args.seed}'
+            comparator.print_summary_comparison()
+            comparator.print_detailed_comparison()
+            comparator.generate_comparison_chart(f'{name}_comparison.png')
+            comparator.generate_report(f'{name}_comparison_report.txt')
+        return
+    
     # Check for available metrics files
     available_files = []
     for file in os.listdir(results_dir):
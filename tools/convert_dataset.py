@@ -0,0 +1,38 @@
+"""
+Dataset Conversion Tool
+Converts a student CSV into the binary columnar dataset format
+
+Usage:
+    python convert_dataset.py [input.csv] [output.stcol]
+"""
+
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.columnar_dataset import convert_csv, open_dataset
+
+
+def main():
+    """Convert the CSV given on the command line (default: data/students.csv)"""
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(project_root, 'data', 'students.csv')
+    output_path = sys.argv[2] if len(sys.argv) > 2 else None
+
+    print(f"Converting {csv_path}...")
+    start = time.time()
+    output_path, rows = convert_csv(csv_path, output_path)
+    elapsed = time.time() - start
+    print(f"✓ Wrote {rows} students to {output_path} "
+          f"({os.path.getsize(output_path) / (1 << 20):.2f} MB) in {elapsed:.2f}s")
+
+    start = time.time()
+    batch = open_dataset(output_path)
+    print(f"✓ Memory-mapped {len(batch)} students in {(time.time() - start) * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,150 @@
+"""
+Synthetic Cohort Generator
+Writes large, reproducible student cohorts for benchmarking (CSV or columnar dataset)
+
+Usage:
+    python generate_cohort.py --rows 1000000 --seed 42 --output ../data/students_1m.csv
+    python generate_cohort.py --rows 100000000 --output ../data/students_100m.stcol
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.columnar_dataset import DATASET_SUFFIX, write_dataset
+from services.csv_loader import COHORT_INFO_SUFFIX
+from services.group_by import cgpa_bucket_codes
+from services.student_batch import GRADE_LETTERS, StudentBatch
+
+
+# Faculty mix: (faculty, share of the cohort, Beta(a, b) shape of CGPA / 4)
+# Shares follow data/students.csv; Medicine skews higher, Engineering wider
+FACULTY_PROFILES = [
+    ('Engineering', 0.28, (7.0, 2.4)),
+    ('Science', 0.26, (7.5, 2.4)),
+    ('Business', 0.26, (8.0, 2.5)),
+    ('Medicine', 0.20, (10.0, 2.2)),
+]
+
+FIRST_NAMES = [
+    'Ahmad', 'Siti', 'Lee', 'Kumar', 'Nurul', 'Tan', 'Muhammad', 'Priya', 'Wong', 'Aishah',
+    'Raj', 'Chen', 'Farah', 'Lim', 'Hafiz', 'Mei', 'Arjun', 'Zainab', 'Ong', 'Kavitha'
+]
+LAST_NAMES = [
+    'Abdullah', 'Ali', 'Wei Ming', 'Shankar', 'Hassan', 'Mei Ling', 'Ismail', 'Devi', 'Kah Hoe',
+    'Rahman', 'Subramaniam', 'Jia Hui', 'Yusof', 'Chong', 'Ibrahim', 'Nair', 'Hui Min', 'Osman'
+]
+
+# Rows generated per chunk; fixed so a seed always yields the same cohort
+GENERATOR_CHUNK_ROWS = 1 << 20
+
+
+def generate_batches(rows, seed=42):
+    """
+    Generate a cohort chunk by chunk
+
+    Each chunk draws from its own generator seeded by (seed, chunk index),
+    so output is identical for a given seed and row count and memory stays
+    bounded by one chunk. Grades follow the university scale of the CGPA.
+
+    Args:
+        rows: Number of students
+        seed: Random seed
+
+    Returns:
+        Generator of StudentBatch
+    """
+    faculties = [faculty for faculty, _, _ in FACULTY_PROFILES]
+    shares = np.array([share for _, share, _ in FACULTY_PROFILES])
+    first_names = np.array(FIRST_NAMES, dtype=object)
+    last_names = np.array(LAST_NAMES, dtype=object)
+    width = max(3, len(str(rows)))
+    for chunk, start in enumerate(range(0, rows, GENERATOR_CHUNK_ROWS)):
+        size = min(GENERATOR_CHUNK_ROWS, rows - start)
+        rng = np.random.default_rng([seed, chunk])
+        faculty_codes = rng.choice(len(faculties), size=size, p=shares / shares.sum()).astype(np.int32)
+        cgpa = np.empty(size)
+        for code, (_, _, (a, b)) in enumerate(FACULTY_PROFILES):
+            members = faculty_codes == code
+            cgpa[members] = 4.0 * rng.beta(a, b, size=int(members.sum()))
+        cgpa = np.round(cgpa, 2)
+        grade_codes = cgpa_bucket_codes(cgpa).astype(np.int32)
+        names = (first_names[rng.integers(len(first_names), size=size)] + ' '
+                 + last_names[rng.integers(len(last_names), size=size)])
+        student_ids = [f"S{index:0{width}d}" for index in range(start + 1, start + size + 1)]
+        yield StudentBatch(student_ids, names.tolist(), cgpa, faculty_codes, faculties, grade_codes, GRADE_LETTERS)
+
+
+def write_csv(batches, path):
+    """Stream batches to a student CSV; returns the number of rows written"""
+    rows = 0
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        file.write('student_id,name,faculty,cgpa,grade\n')
+        for batch in batches:
+            faculties = np.array(batch.faculty_table, dtype=object)[batch.faculty_codes]
+            grades = np.array(batch.grade_table, dtype=object)[batch.grade_codes]
+            file.write(''.join(
+                f"{student_id},{name},{faculty},{cgpa:.2f},{grade}\n"
+                for student_id, name, faculty, cgpa, grade in zip(
+                    batch.student_ids, batch.names, faculties.tolist(), batch.cgpa.tolist(), grades.tolist())
+            ))
+            rows += len(batch)
+    return rows
+
+
+def write_cohort(rows, seed, output, output_format=None):
+    """
+    Generate a cohort into output and record its rows and seed next to it
+    (output + COHORT_INFO_SUFFIX) so benchmark metrics can name the dataset
+
+    Args:
+        rows: Number of students
+        seed: Random seed
+        output: Output path (.csv or .stcol)
+        output_format: 'csv' or 'stcol' (default: from the output suffix)
+
+    Returns:
+        Number of rows written
+    """
+    output_format = output_format or ('stcol' if output.endswith(DATASET_SUFFIX) else 'csv')
+    batches = generate_batches(rows, seed)
+    if output_format == 'stcol':
+        written = write_dataset(batches, output)
+    else:
+        written = write_csv(batches, output)
+    with open(output + COHORT_INFO_SUFFIX, 'w', encoding='utf-8') as file:
+        json.dump({'rows': written, 'seed': seed, 'format': output_format}, file)
+    return written
+
+
+def main():
+    """Generate a cohort from the command line"""
+    parser = argparse.ArgumentParser(description='Generate a synthetic student cohort')
+    parser.add_argument('--rows', type=int, default=1000, help='Number of students (default: 1000)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument('--output', required=True, help='Output path (.csv or .stcol)')
+    parser.add_argument('--format', choices=['csv', 'stcol'],
+                        help='Output format (default: from the output suffix)')
+    args = parser.parse_args()
+
+    output_format = args.format or ('stcol' if args.output.endswith(DATASET_SUFFIX) else 'csv')
+    output_dir = os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"Generating {args.rows} students (seed {args.seed}) as {output_format}...")
+    start = time.time()
+    rows = write_cohort(args.rows, args.seed, args.output, output_format)
+    elapsed = time.time() - start
+    print(f"✓ Wrote {rows} students to {args.output} "
+          f"({os.path.getsize(args.output) / (1 << 20):.2f} MB) in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,6 @@
 XML-RPC Client for Chained Microservices Architecture
 Calls only MapReduce Service, which triggers the entire chain
 """
-from xmlrpc.client import ServerProxy
 import json
 import os
 import sys
@@ -12,6 +11,9 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
+from services.csv_loader import cohort_info, iter_dict_batches
+from xmlrpc_implementation.keepalive_transport import keepalive_proxy, keepalive_transport
+
 
 class ChainedXMLRPCClient:
     """Client for chained XML-RPC microservices"""
@@ -24,12 +26,13 @@ class ChainedXMLRPCClient:
         """
         self.mapreduce_url = mapreduce_url
         self.mapreduce_service = None
+        self.transport = keepalive_transport(mapreduce_url)  # Connection reused from the connection test on
         print(f"[Client] Initialized with MapReduce Service URL: {mapreduce_url}")
     
     def connect(self):
         """Connect to MapReduce Service"""
         try:
-            self.mapreduce_service = ServerProxy(self.mapreduce_url, allow_none=True)
+            self.mapreduce_service = keepalive_proxy(self.mapreduce_url, self.transport)
             # Test connection
             self.mapreduce_service.system.listMethods()
             print(f"[Client] Connected to MapReduce Service at {self.mapreduce_url}")
@@ -41,6 +44,7 @@ class ChainedXMLRPCClient:
         """Disconnect from server"""
         if self.mapreduce_service:
             self.mapreduce_service = None
+            self.transport.close()
             print("[Client] Disconnected from MapReduce Service")
     
     def load_students_from_csv(self, csv_path):
@@ -55,21 +59,8 @@ class ChainedXMLRPCClient:
             print(f"[Client] Loading students from {csv_path}")
             students = []
             
-            with open(csv_path, 'r') as file:
-                lines = file.readlines()
-                
-                # Skip header (student_id,name,faculty,cgpa,grade)
-                for line in lines[1:]:
-                    parts = line.strip().split(',')
-                    if len(parts) >= 5:
-                        student = {
-                            'student_id': parts[0].strip(),
-                            'name': parts[1].strip(),
-                            'faculty': parts[2].strip(),
-                            'cgpa': float(parts[3].strip()),
-                            'grade': parts[4].strip()
-                        }
-                        students.append(student)
+            for chunk in iter_dict_batches(csv_path):
+                students.extend(chunk)
             
             print(f"[Client] Loaded {len(students)} students")
             return students
@@ -78,13 +69,14 @@ class ChainedXMLRPCClient:
             print(f"[Client] Error loading CSV: {str(e)}")
             raise
     
-    def start_workflow(self, students):
+    def start_workflow(self, students, top_k=10):
         """
         Start the microservices workflow by calling MapReduce Service
         MapReduce Service will automatically chain to MergeSort → Statistics
         
         Args:
             students: List of student dictionaries
+            top_k: Number of top students MergeSort returns (0 = full ranking)
         Returns:
             Dictionary containing all service results
         """
@@ -97,7 +89,7 @@ class ChainedXMLRPCClient:
             accumulated_results = {}
             
             workflow_start = time.time()
-            final_results = self.mapreduce_service.process(students, accumulated_results)
+            final_results = self.mapreduce_service.process(students, accumulated_results, top_k)
             workflow_end = time.time()
             
             workflow_time = workflow_end - workflow_start
@@ -125,8 +117,9 @@ def main():
     default_csv = os.path.join(project_root, 'data', 'students.csv')
     default_output = os.path.join(project_root, 'results', 'xmlrpc_performance_metrics.json')
     
-    csv_path = os.getenv('CSV_PATH', default_csv)
+    csv_path = os.getenv('CSV_PATH', default_csv)  # CSV or columnar dataset
     output_file = os.getenv('OUTPUT_FILE', default_output)
+    top_k = int(os.getenv('TOP_K', '10'))  # 0 = return the full ranking
     
     print("\n" + "="*70)
     print("MICROSERVICES CLIENT")
@@ -166,7 +159,7 @@ def main():
         print(f"[Client] Sending request to MapReduce Service ({mapreduce_url})")
         
         # Start workflow (single call to MapReduce Service)
-        workflow_result = client.start_workflow(students)
+        workflow_result = client.start_workflow(students, top_k)
         
         # Extract results
         results = workflow_result['results']
@@ -191,6 +184,12 @@ def main():
         print(f"  CGPA Classification:")
         for grade_range, count in results['mapreduce']['cgpa_classification'].items():
             print(f"    {grade_range}: {count} students")
+        print(f"  Grade Counts:")
+        for grade, count in results['mapreduce'].get('grade_counts', {}).items():
+            print(f"    {grade}: {count} students")
+        print(f"  Faculty Counts:")
+        for faculty, count in results['mapreduce'].get('faculty_counts', {}).items():
+            print(f"    {faculty}: {count} students")
         
         # MergeSort Service Results
         print(f"\n[MergeSort Service] Sort by CGPA (Time: {mergesort_time:.4f}s)")
@@ -198,6 +197,9 @@ def main():
         print(f"  Top 10 students by CGPA:")
         for i, student in enumerate(results['mergesort']['top_10'], 1):
             print(f"    {i}. {student['name']} - CGPA: {student['cgpa']:.2f} ({student['grade']})")
+        print(f"  Top 10 students by Grade:")
+        for i, student in enumerate(results['mergesort'].get('top_10_by_grade', []), 1):
+            print(f"    {i}. {student['name']} - Grade: {student['grade']} (CGPA: {student['cgpa']:.2f})")
         
         # Statistics Service Results
         print(f"\n[Statistics Service] Statistical Analysis (Time: {statistics_time:.4f}s)")
@@ -238,6 +240,15 @@ def main():
                 count = distribution['by_grade'][grade]
                 percentage = (count / total_students * 100) if total_students > 0 else 0.0
                 print(f"    Grade {grade}: {count} students ({percentage:.1f}%)")
+            
+            percentiles = stats.get('percentiles')
+            if percentiles:
+                mode = "exact" if percentiles['exact'] else "sketch"
+                print(f"\n  CGPA Percentiles ({mode}):")
+                rows = [('All students', percentiles['overall'])] + sorted(percentiles['by_faculty'].items())
+                for name, values in rows:
+                    cells = "  ".join(f"{key} {value:.2f}" for key, value in values.items())
+                    print(f"    {name}: {cells}")
         else:
             # Fallback for other structures
             print(f"  Statistics: {stats}")
@@ -263,12 +274,14 @@ def main():
             'protocol': 'XML-RPC',
             'architecture': 'microservices_chained',
             'mapreduce_url': mapreduce_url,
+            'dataset': cohort_info(csv_path, len(students)),
             'workflow_time': workflow_time,
             'mapreduce_time': mapreduce_time,
             'mergesort_time': mergesort_time,
             'statistics_time': statistics_time,
             'total_processing_time': total_processing_time,
             'network_overhead': network_overhead,
+            'connection_pool': client.transport.stats(),
             'summary': {
                 'total_services': 3,
                 'avg_service_time': total_processing_time / 3,
@@ -0,0 +1,265 @@
+"""
+Keep-Alive XML-RPC Transport
+Pooled persistent HTTP/1.1 connections for chain forwarding and the client,
+plus a threaded HTTP/1.1 XML-RPC server that keeps them open
+"""
+
+import http.client
+import os
+import threading
+import time
+import urllib.parse
+from socketserver import ThreadingMixIn
+from xmlrpc.client import Fault, ProtocolError, ServerProxy, Transport
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of persistent HTTP connections to one host
+
+    At most max_size connections exist at a time; callers beyond that wait
+    for a connection to be released. Idle connections are reused most
+    recently used first and dropped after idle_timeout seconds, before the
+    server's own keep-alive timeout can close them under a request.
+    """
+
+    def __init__(self, host, max_size, idle_timeout, connect):
+        """
+        Args:
+            host: host:port to connect to
+            max_size: Maximum open connections
+            idle_timeout: Seconds an idle connection is kept
+            connect: Callable opening a new connection to the host
+        """
+        self.host = host
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.connect = connect
+        self._idle = []
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+        self.waits = 0
+
+    def acquire(self):
+        """Borrow a connection, reusing an idle one when possible"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.waits += 1
+            self._slots.acquire()
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            while self._idle:
+                connection, released_at = self._idle.pop()
+                if now - released_at <= self.idle_timeout:
+                    self.reused += 1
+                    return connection
+                connection.close()
+                self.discarded += 1
+            self.created += 1
+        return self.connect()
+
+    def release(self, connection, reusable):
+        """Return a connection; it is closed unless the response left it reusable"""
+        with self._lock:
+            if reusable:
+                self._idle.append((connection, time.monotonic()))
+            else:
+                connection.close()
+                self.discarded += 1
+        self._slots.release()
+
+    def close(self):
+        """Close every idle connection"""
+        with self._lock:
+            for connection, _ in self._idle:
+                connection.close()
+            self._idle = []
+
+    def stats(self):
+        """Connection reuse counters (XML-RPC / JSON serializable)"""
+        with self._lock:
+            return {
+                'max_connections': self.max_size,
+                'idle_connections': len(self._idle),
+                'requests': self.requests,
+                'connections_created': self.created,
+                'connections_reused': self.reused,
+                'connections_discarded': self.discarded,
+                'waits': self.waits,
+                'reuse_rate': self.reused / self.requests if self.requests else 0.0
+            }
+
+
+class KeepAliveTransport(Transport):
+    """
+    XML-RPC transport over pooled keep-alive connections
+
+    Unlike the stock Transport (one cached connection, not thread-safe),
+    every request borrows a connection from a per-host ConnectionPool and
+    returns it once the response has been read, so one ServerProxy can be
+    shared by all handler threads and no call pays for TCP setup after the
+    first. When the server has closed idle connections, the pool's idle
+    connections are dropped and Transport.request retries once on a new one.
+    Hosts go through get_host_info like the stock transport, so user:pass@
+    credentials are sent as Basic auth; SafeKeepAliveTransport serves https.
+    """
+
+    # URL scheme served by this transport
+    scheme = 'http'
+
+    def __init__(self, max_connections=None, idle_timeout=None, timeout=None):
+        """
+        Args:
+            max_connections: Connections per host (XMLRPC_POOL_SIZE, default: 4)
+            idle_timeout: Seconds an idle connection is kept (XMLRPC_POOL_IDLE_TIMEOUT, default: 30)
+            timeout: Socket timeout in seconds (None = blocking)
+        """
+        super().__init__()
+        self.max_connections = max_connections or int(os.getenv('XMLRPC_POOL_SIZE', '4'))
+        self.idle_timeout = idle_timeout or float(os.getenv('XMLRPC_POOL_IDLE_TIMEOUT', '30'))
+        self.timeout = timeout
+        self.pools = {}
+        self._pools_lock = threading.Lock()
+
+    def new_connection(self, host, x509=None):
+        """Open a connection to host (host:port without credentials)"""
+        return http.client.HTTPConnection(host, timeout=self.timeout)
+
+    def pool(self, host, x509=None):
+        """ConnectionPool for a host, created on first use"""
+        with self._pools_lock:
+            pool = self.pools.get(host)
+            if pool is None:
+                pool = self.pools[host] = ConnectionPool(host, self.max_connections, self.idle_timeout,
+                                                         lambda: self.new_connection(host, x509))
+            return pool
+
+    def single_request(self, host, handler, request_body, verbose=False):
+        # Strip user:pass@ from the host into an Authorization header, like make_connection
+        host, auth_headers, x509 = self.get_host_info(host)
+        pool = self.pool(host, x509)
+        connection = pool.acquire()
+        reusable = False
+        try:
+            headers = self._headers + self._extra_headers + (auth_headers or [])
+            if self.accept_gzip_encoding:
+                connection.putrequest("POST", handler, skip_accept_encoding=True)
+                headers.append(("Accept-Encoding", "gzip"))
+            else:
+                connection.putrequest("POST", handler)
+            headers.append(("Content-Type", "text/xml"))
+            headers.append(("User-Agent", self.user_agent))
+            self.send_headers(connection, headers)
+            self.send_content(connection, request_body)
+
+            response = connection.getresponse()
+            if response.status == 200:
+                self.verbose = verbose
+                try:
+                    result = self.parse_response(response)
+                except Fault:
+                    # The fault body was read completely
+                    reusable = not response.will_close
+                    raise
+                reusable = not response.will_close
+                return result
+
+            response.read()
+            reusable = not response.will_close
+            raise ProtocolError(host + handler, response.status, response.reason, dict(response.getheaders()))
+        except (http.client.RemoteDisconnected, ConnectionError):
+            # The server closed its idle connections; drop ours so the retry in request() connects afresh
+            pool.close()
+            raise
+        finally:
+            pool.release(connection, reusable)
+
+    def close(self):
+        """Close the idle connections of every pool"""
+        with self._pools_lock:
+            for pool in self.pools.values():
+                pool.close()
+
+    def stats(self):
+        """Reuse counters per host"""
+        with self._pools_lock:
+            return {host: pool.stats() for host, pool in self.pools.items()}
+
+
+class SafeKeepAliveTransport(KeepAliveTransport):
+    """KeepAliveTransport over pooled TLS connections, for https URLs"""
+
+    scheme = 'https'
+
+    def __init__(self, context=None, **kwargs):
+        """
+        Args:
+            context: ssl.SSLContext for the connections (None = default verification)
+            **kwargs: KeepAliveTransport arguments
+        """
+        super().__init__(**kwargs)
+        self.context = context
+
+    def new_connection(self, host, x509=None):
+        return http.client.HTTPSConnection(host, timeout=self.timeout, context=self.context, **(x509 or {}))
+
+
+def keepalive_transport(url, **kwargs):
+    """
+    Keep-alive transport for the scheme of an XML-RPC URL
+
+    Raises:
+        ValueError: If the URL is neither http nor https
+    """
+    scheme = urllib.parse.urlsplit(url).scheme
+    for transport_class in (KeepAliveTransport, SafeKeepAliveTransport):
+        if transport_class.scheme == scheme:
+            return transport_class(**kwargs)
+    raise ValueError(f"Unsupported XML-RPC URL scheme: {scheme!r}")
+
+
+def keepalive_proxy(url, transport=None):
+    """
+    ServerProxy over a keep-alive transport (shareable between threads)
+
+    Raises:
+        ValueError: If the transport does not serve the URL's scheme
+    """
+    transport = transport or keepalive_transport(url)
+    scheme = urllib.parse.urlsplit(url).scheme
+    if scheme != transport.scheme:
+        raise ValueError(f"{type(transport).__name__} cannot serve {scheme!r} URLs")
+    return ServerProxy(url, transport=transport, allow_none=True)
+
+
+class KeepAliveRequestHandler(SimpleXMLRPCRequestHandler):
+    """
+    HTTP/1.1 request handler: connections stay open between requests
+    until the client closes them or they sit idle for XMLRPC_KEEPALIVE_TIMEOUT
+    seconds (default: 60)
+    """
+
+    protocol_version = 'HTTP/1.1'
+    timeout = float(os.getenv('XMLRPC_KEEPALIVE_TIMEOUT', '60'))
+
+
+class ThreadingXMLRPCServer(ThreadingMixIn, SimpleXMLRPCServer):
+    """
+    SimpleXMLRPCServer with one thread per connection
+
+    Needed for keep-alive: a persistent connection occupies its handler for
+    its whole lifetime, so a single-threaded server would serve only one
+    pooled connection at a time.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, addr, **kwargs):
+        kwargs.setdefault('requestHandler', KeepAliveRequestHandler)
+        super().__init__(addr, **kwargs)
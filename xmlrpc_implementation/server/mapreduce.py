@@ -2,8 +2,6 @@
 XML-RPC MapReduce Service: CGPA and Grade Count
 Chained Microservices Architecture
 """
-from xmlrpc.server import SimpleXMLRPCServer
-from xmlrpc.client import ServerProxy
 import sys
 import os
 import time
@@ -11,68 +9,118 @@ import time
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
+from services.incremental_aggregates import IncrementalMapReduce
 from services.mapreduce_service import MapReduceService
-
-
-class StudentObject:
-    """Helper class to convert dict to object with attributes"""
-    def __init__(self, student_id, name, cgpa, grade, faculty=None):
-        self.student_id = student_id
-        self.name = name
-        self.cgpa = cgpa
-        self.grade = grade
-        self.faculty = faculty
+from services.mergesort_service import MergeSortService
+from services.result_cache import ResultCache
+from services.student_batch import StudentBatch
+from xmlrpc_implementation.keepalive_transport import ThreadingXMLRPCServer, keepalive_proxy, keepalive_transport
 
 
 class MapReduceServiceHandler:
     """MapReduce Service: CGPA and Grade Count using MapReduce"""
     
+    # Jobs computed together in one scan for the chain
+    CHAIN_OPERATIONS = ("cgpa_count", "grade_count", "faculty_count", "faculty_grade_count")
+    
     def __init__(self, next_service_url):
         self.next_service_url = next_service_url
+        # Persistent keep-alive connections to the next service, shared by all request threads
+        self.transport = keepalive_transport(next_service_url)
+        self._next_service = keepalive_proxy(next_service_url, self.transport)
+        self.cache = ResultCache()
+        self.live = IncrementalMapReduce()
         print(f"[MapReduce Service] Initialized. Next service: {next_service_url}")
     
-    def process(self, students_data, accumulated_results):
+    def cache_stats(self):
+        """Result cache counters"""
+        return self.cache.stats()
+    
+    def transport_stats(self):
+        """Connection reuse counters of the forwarding pool"""
+        return self.transport.stats()
+    
+    def apply_deltas(self, deltas, reset=False):
+        """
+        Apply insert/update/delete deltas to the live cohort
+        Args:
+            deltas: List of {'operation': 'insert'|'update'|'delete', 'student': student dict}
+            reset: Clear the live cohort first
+        Returns:
+            Current CGPA classification, grade, faculty and faculty x grade counts
+        """
+        start_time = time.time()
+        if reset:
+            self.live.reset()
+        applied = self.live.apply_deltas((delta['operation'], delta['student']) for delta in deltas)
+        result = self.live.results()
+        result['processing_time'] = time.time() - start_time
+        print(f"[MapReduce] Applied {applied} deltas ({result['total_count']} students live)")
+        return result
+    
+    def compute(self, students_data):
+        """Run the chain MapReduce jobs and return XML-RPC serializable results"""
+        # Build the columnar batch once for this request
+        students = StudentBatch.from_dicts(students_data)
+        cgpa_result = MapReduceService.perform_mapreduce(students, operations=self.CHAIN_OPERATIONS)
+        
+        print(f"[MapReduce] Results: {cgpa_result['cgpa_classification']}")
+        print(f"[MapReduce] Grade counts: {cgpa_result['grade_counts']}")
+        
+        # Ensure all values are XML-RPC serializable
+        cgpa_classification = {}
+        for k, v in cgpa_result['cgpa_classification'].items():
+            cgpa_classification[str(k)] = int(v)
+        
+        return {
+            'cgpa_classification': cgpa_classification,
+            'grade_counts': cgpa_result['grade_counts'],
+            'faculty_counts': cgpa_result['faculty_counts'],
+            'faculty_grade_counts': cgpa_result['faculty_grade_counts']
+        }
+    
+    def process(self, students_data, accumulated_results, top_k=None):
         """
         Process CGPA classification and forward to next service
         Args:
             students_data: List of student dictionaries
             accumulated_results: Dictionary containing results from previous services
+            top_k: Number of top students MergeSort should return (forwarded)
         Returns:
             Dictionary with accumulated results including this service's output
         """
         try:
             print(f"[MapReduce Service] Processing {len(students_data)} students...")
             
-            # Convert dictionaries to StudentObject instances
-            students = [StudentObject(**student) for student in students_data]
+            # Reject a bad top_k before any stage runs
+            MergeSortService.validate_top_k(top_k)
+            
+            start_time = time.time()
+            
+            # Repeat payloads are served from the content-addressed cache (hashing counts toward the stage time)
+            key = ResultCache.digest('process', students_data)
+            stage_result = self.cache.get(key)
             
             # Perform MapReduce for CGPA classification
             print(f"[MapReduce] CGPA Classification")
-            start_time = time.time()
-            cgpa_result = MapReduceService.perform_mapreduce(students)
+            if stage_result is None:
+                stage_result = self.compute(students_data)
+                self.cache.put(key, stage_result)
+            else:
+                print(f"[MapReduce] Cache hit {self.cache.stats()}")
             processing_time = time.time() - start_time
             
             print(f"[MapReduce] Processed {len(students_data)} students")
-            print(f"[MapReduce] Results: {cgpa_result['cgpa_classification']}")
             print(f"[MapReduce] Processing time: {processing_time:.4f} seconds")
             
-            # Ensure all values are XML-RPC serializable
-            cgpa_classification = {}
-            for k, v in cgpa_result['cgpa_classification'].items():
-                cgpa_classification[str(k)] = int(v)
-            
             # Add this service's results to accumulated results
-            accumulated_results['mapreduce'] = {
-                'cgpa_classification': cgpa_classification,
-                'processing_time': processing_time
-            }
+            accumulated_results['mapreduce'] = dict(stage_result, processing_time=processing_time)
             
             print(f"[MapReduce Service] ✓ CGPA Classification completed in {processing_time:.4f}s")
             print(f"[MapReduce Service] Forwarding to MergeSort Service...")
             
             # Forward to next service in chain
-            next_service = ServerProxy(self.next_service_url, allow_none=True)
-            final_results = next_service.process(students_data, accumulated_results)
+            final_results = self._next_service.process(students_data, accumulated_results, top_k)
             
             return final_results
             
@@ -88,7 +136,7 @@ def main():
     mergesort_url = os.getenv('MERGESORT_URL', 'http://localhost:8003')
     
     # Create server
-    server = SimpleXMLRPCServer((host, port), allow_none=True, logRequests=False)
+    server = ThreadingXMLRPCServer((host, port), allow_none=True, logRequests=False)
     server.register_introspection_functions()
     
     # Register service instance
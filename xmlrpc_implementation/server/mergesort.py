@@ -2,8 +2,6 @@
 XML-RPC MergeSort Service: Sort by CGPA and Grade
 Chained Microservices Architecture
 """
-from xmlrpc.server import SimpleXMLRPCServer
-from xmlrpc.client import ServerProxy
 import sys
 import os
 import time
@@ -12,16 +10,10 @@ import time
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from services.mergesort_service import MergeSortService
-
-
-class StudentObject:
-    """Helper class to convert dict to object with attributes"""
-    def __init__(self, student_id, name, cgpa, grade, faculty=None):
-        self.student_id = student_id
-        self.name = name
-        self.cgpa = cgpa
-        self.grade = grade
-        self.faculty = faculty
+from services.ranking_index import RankingIndex
+from services.result_cache import ResultCache
+from services.student_batch import StudentBatch
+from xmlrpc_implementation.keepalive_transport import ThreadingXMLRPCServer, keepalive_proxy, keepalive_transport
 
 
 class MergeSortServiceHandler:
@@ -29,14 +21,83 @@ class MergeSortServiceHandler:
     
     def __init__(self, next_service_url):
         self.next_service_url = next_service_url
+        # Persistent keep-alive connections to the next service, shared by all request threads
+        self.transport = keepalive_transport(next_service_url)
+        self._next_service = keepalive_proxy(next_service_url, self.transport)
+        self.cache = ResultCache()
+        self.index = RankingIndex()
         print(f"[MergeSort Service] Initialized. Next service: {next_service_url}")
     
-    def process(self, students_data, accumulated_results):
+    # Number of top students returned when the caller does not specify top_k
+    DEFAULT_TOP_K = 10
+    
+    def cache_stats(self):
+        """Result cache counters"""
+        return self.cache.stats()
+    
+    def transport_stats(self):
+        """Connection reuse counters of the forwarding pool"""
+        return self.transport.stats()
+    
+    def apply_deltas(self, deltas, reset=False, top_k=None):
+        """
+        Apply insert/update/delete deltas to the ranking index
+        Args:
+            deltas: List of {'operation': 'insert'|'update'|'delete', 'student': student dict}
+            reset: Clear the index first
+            top_k: Number of top students to return (default 10)
+        Returns:
+            Dictionary with top_students, total_count and processing_time
+        """
+        start_time = time.time()
+        top_k = MergeSortService.validate_top_k(top_k) or self.DEFAULT_TOP_K
+        if reset:
+            self.index.reset()
+        applied = self.index.apply_deltas((delta['operation'], delta['student']) for delta in deltas)
+        result = self.index.results(top_k)
+        result['top_students'] = [record._asdict() for record in result['top_students']]
+        result['processing_time'] = time.time() - start_time
+        print(f"[MergeSort] Applied {applied} deltas ({result['total_count']} students ranked)")
+        return result
+    
+    def rank(self, student_ids):
+        """
+        Current CGPA rank (1-based) of each student in the ranking index
+        Returns:
+            List of {'student_id', 'rank', 'cgpa'} dictionaries
         """
-        Process sort by CGPA and forward to next service
+        ranks = []
+        for student_id in map(str, student_ids):
+            rank, cgpa = self.index.lookup(student_id)
+            ranks.append({'student_id': student_id, 'rank': rank, 'cgpa': cgpa})
+        return ranks
+    
+    def compute(self, students_data, top_k):
+        """Rank students by CGPA and by grade, returning XML-RPC serializable results"""
+        # Build the columnar batch once for this request
+        students = StudentBatch.from_dicts(students_data)
+        sort_result = MergeSortService.perform_multi_sort(students, top_k=top_k or None)
+        sorted_students = sort_result['sorted_by_cgpa']
+        
+        print(f"[MergeSort] Sorted {sort_result['total_count']} students")
+        if sorted_students:
+            print(f"[MergeSort] Top student: {sorted_students[0].name} (CGPA: {sorted_students[0].cgpa:.2f})")
+        
+        # Convert the top 10 of each ranking to dictionaries (same keys as the gRPC client's results)
+        return {
+            'sorted_count': sort_result['total_count'],
+            'top_10': sorted_students[:10].to_dicts(),
+            'top_10_by_grade': sort_result['sorted_by_grade'][:10].to_dicts()
+        }
+    
+    def process(self, students_data, accumulated_results, top_k=None):
+        """
+        Process sort by CGPA and by grade, then forward to next service
         Args:
             students_data: List of student dictionaries
             accumulated_results: Dictionary containing results from previous services
+            top_k: Number of top students to rank (default 10, 0 = full ranking);
+                   the first 10 of each ranking are returned
         Returns:
             Dictionary with accumulated results including this service's output
         """
@@ -44,47 +105,35 @@ class MergeSortServiceHandler:
             print(f"[MergeSort Service] Received from MapReduce Service")
             print(f"[MergeSort Service] Processing {len(students_data)} students...")
             
-            # Convert dictionaries to StudentObject instances
-            students = [StudentObject(**student) for student in students_data]
+            if top_k is None:
+                top_k = self.DEFAULT_TOP_K
             
-            # Perform MergeSort by CGPA
-            print(f"[MergeSort Service] Performing MergeSort by CGPA...")
-            print(f"[MergeSort] Sort by CGPA")
             start_time = time.time()
-            sort_result = MergeSortService.perform_sort(students)
-            sorted_students = sort_result['sorted_students']
+            
+            # Repeat payloads are served from the content-addressed cache (hashing counts toward the stage time)
+            key = ResultCache.digest('process', students_data, top_k)
+            stage_result = self.cache.get(key)
+            
+            # Perform MergeSort by CGPA and by Grade
+            print(f"[MergeSort Service] Performing MergeSort by CGPA and Grade...")
+            print(f"[MergeSort] Sort by CGPA + Grade")
+            if stage_result is None:
+                stage_result = self.compute(students_data, top_k)
+                self.cache.put(key, stage_result)
+            else:
+                print(f"[MergeSort] Cache hit {self.cache.stats()}")
             processing_time = time.time() - start_time
             
-            print(f"[MergeSort] Sorted {len(sorted_students)} students")
-            if sorted_students:
-                print(f"[MergeSort] Top student: {sorted_students[0].name} (CGPA: {sorted_students[0].cgpa:.2f})")
             print(f"[MergeSort] Processing time: {processing_time:.4f} seconds")
             
-            # Convert sorted students to dictionaries (Top 10 for display)
-            sorted_data = [
-                {
-                    'student_id': str(s.student_id),
-                    'name': str(s.name),
-                    'faculty': str(s.faculty) if hasattr(s, 'faculty') and s.faculty else '',
-                    'cgpa': float(s.cgpa),
-                    'grade': str(s.grade)
-                }
-                for s in sorted_students[:10]
-            ]
-            
             # Add MergeSort Service result to accumulated results
-            accumulated_results['mergesort'] = {
-                'sorted_count': len(sorted_students),
-                'top_10': sorted_data,
-                'processing_time': processing_time
-            }
+            accumulated_results['mergesort'] = dict(stage_result, processing_time=processing_time)
             
             print(f"[MergeSort Service] Sort completed in {processing_time:.4f}s")
             print(f"[MergeSort Service] Forwarding to Statistics Service...")
             
             # Forward to next service in chain
-            next_service = ServerProxy(self.next_service_url, allow_none=True)
-            final_results = next_service.process(students_data, accumulated_results)
+            final_results = self._next_service.process(students_data, accumulated_results)
             
             return final_results
             
@@ -100,7 +149,7 @@ def main():
     statistics_url = os.getenv('STATISTICS_URL', 'http://localhost:8005')
     
     # Create server
-    server = SimpleXMLRPCServer((host, port), allow_none=True, logRequests=False)
+    server = ThreadingXMLRPCServer((host, port), allow_none=True, logRequests=False)
     server.register_introspection_functions()
     
     # Register MergeSort Service
@@ -2,7 +2,6 @@
 XML-RPC Statistics Service: Statistical Analysis (Final Service)
 Chained Microservices Architecture
 """
-from xmlrpc.server import SimpleXMLRPCServer
 import sys
 import os
 import time
@@ -10,25 +9,76 @@ import time
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
+from services.incremental_aggregates import IncrementalStats
+from services.quantile_sketch import DEFAULT_PERCENTILES
+from services.result_cache import ResultCache
 from services.stats_service import StatsService
-
-
-class StudentObject:
-    """Helper class to convert dict to object with attributes"""
-    def __init__(self, student_id, name, cgpa, grade, faculty=None):
-        self.student_id = student_id
-        self.name = name
-        self.cgpa = cgpa
-        self.grade = grade
-        self.faculty = faculty
+from services.student_batch import StudentBatch
+from xmlrpc_implementation.keepalive_transport import ThreadingXMLRPCServer
 
 
 class StatisticsServiceHandler:
     """Statistics Service: Statistical Analysis (Terminal Service)"""
     
     def __init__(self):
+        self.cache = ResultCache()
+        self.live = IncrementalStats()
         print(f"[Statistics Service] Initialized (Terminal Service)")
     
+    def cache_stats(self):
+        """Result cache counters"""
+        return self.cache.stats()
+    
+    def apply_deltas(self, deltas, reset=False):
+        """
+        Apply insert/update/delete deltas to the live cohort
+        Args:
+            deltas: List of {'operation': 'insert'|'update'|'delete', 'student': student dict}
+            reset: Clear the live cohort first
+        Returns:
+            Current faculty averages, grade distribution, pass rate, mean, std dev, min and max
+        """
+        start_time = time.time()
+        if reset:
+            self.live.reset()
+        applied = self.live.apply_deltas((delta['operation'], delta['student']) for delta in deltas)
+        result = self.live.results()
+        result['processing_time'] = time.time() - start_time
+        print(f"[Statistics] Applied {applied} deltas ({result['total_count']} students live)")
+        return result
+    
+    def group_by(self, students_data, keys, aggregates=('count', 'mean')):
+        """
+        CGPA breakdown by any combination of faculty, grade and cgpa_bucket
+        Args:
+            students_data: List of student dictionaries
+            keys: List of group keys
+            aggregates: List of aggregates (count, sum, mean, min, max, std)
+        Returns:
+            Dictionary with groups and processing_time
+        """
+        return StatsService.calculate_group_by(StudentBatch.from_dicts(students_data), keys, aggregates)
+    
+    def compute(self, students_data):
+        """Run the statistical analysis and return XML-RPC serializable statistics"""
+        # Build the columnar batch once for this request
+        students = StudentBatch.from_dicts(students_data)
+        # The chain reports CGPA percentiles, so they are requested explicitly
+        result = StatsService.calculate_statistics(students, percentiles=DEFAULT_PERCENTILES)
+        
+        print(f"[Statistics] Mean CGPA: {result['statistics']['cgpa']['mean']:.4f}")
+        
+        # Ensure statistics are XML-RPC serializable
+        stats = result['statistics']
+        serializable_stats = {}
+        for key, value in stats.items():
+            if isinstance(value, dict):
+                # Convert nested dictionaries (e.g., faculty_avg_cgpa)
+                serializable_stats[str(key)] = {str(k): v for k, v in value.items()}
+            else:
+                serializable_stats[str(key)] = value
+        return serializable_stats
+    
     def process(self, students_data, accumulated_results):
         """
         Process statistical analysis and return final results
@@ -42,33 +92,28 @@ class StatisticsServiceHandler:
             print(f"[Statistics Service] Received from MergeSort Service")
             print(f"[Statistics Service] Processing {len(students_data)} students...")
             
-            # Convert dictionaries to StudentObject instances
-            students = [StudentObject(**student) for student in students_data]
+            start_time = time.time()
+            
+            # Repeat payloads are served from the content-addressed cache (hashing counts toward the stage time)
+            key = ResultCache.digest('process', students_data)
+            stage_result = self.cache.get(key)
             
             # Perform Statistical Analysis
             print(f"[Statistics] Comprehensive analysis")
-            start_time = time.time()
-            result = StatsService.calculate_statistics(students)
+            if stage_result is None:
+                stage_result = self.compute(students_data)
+                self.cache.put(key, stage_result)
+            else:
+                print(f"[Statistics] Cache hit {self.cache.stats()}")
             processing_time = time.time() - start_time
             
             print(f"[Statistics] Analyzed {len(students_data)} students")
-            print(f"[Statistics] Mean CGPA: {result['statistics']['cgpa']['mean']:.4f}")
             print(f"[Statistics] Processing time: {processing_time:.4f} seconds")
             
-            # Ensure statistics are XML-RPC serializable
-            stats = result['statistics']
-            serializable_stats = {}
-            for key, value in stats.items():
-                if isinstance(value, dict):
-                    # Convert nested dictionaries (e.g., faculty_avg_cgpa)
-                    serializable_stats[str(key)] = {str(k): v for k, v in value.items()}
-                else:
-                    serializable_stats[str(key)] = value
-            
             # Add this service's result to accumulated results
             accumulated_results['statistics'] = {
                 'operation': 'statistical_analysis',
-                'result': serializable_stats,
+                'result': stage_result,
                 'processing_time': processing_time
             }
             
@@ -91,7 +136,7 @@ def main():
     port = int(os.getenv('STATISTICS_PORT', '8005'))
     
     # Create server
-    server = SimpleXMLRPCServer((host, port), allow_none=True, logRequests=False)
+    server = ThreadingXMLRPCServer((host, port), allow_none=True, logRequests=False)
     server.register_introspection_functions()
     
     # Register service instance